@@ -72,7 +72,9 @@ class Config:
     
     # Report generation
     REPORT_TIMEOUT = 600  # 10 minutes
+    REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 4))  # concurrent report jobs
     REPORT_LEAD_DAYS = 5
+    STATCAST_WORKERS = int(os.environ.get("STATCAST_WORKERS", 2))  # concurrent Savant downloads
     
     # Job queue
     JOB_STATUS_MAX_AGE = 3600  # 1 hour
@@ -101,15 +103,24 @@ class Config:
             dir_path.mkdir(parents=True, exist_ok=True)
     
     @classmethod
-    @lru_cache(maxsize=1)
     def get_settings(cls):
-        """Get cached application settings"""
+        """Get cached application settings, re-read when the settings file changes"""
+        try:
+            mtime_ns = settings_manager.SETTINGS_PATH.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        return cls._load_settings(mtime_ns)
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_settings(mtime_ns):
+        """Parse the settings file; keyed on its mtime so edits from other workers are seen"""
         return settings_manager.load_settings()
     
     @classmethod
     def refresh_settings_cache(cls):
         """Clear settings cache"""
-        cls.get_settings.cache_clear()
+        cls._load_settings.cache_clear()
 
 
 # Set SECRET_KEY as class attribute after class definition to avoid circular import issues
@@ -99,6 +99,12 @@ LEADER_CATEGORY_ABBR = {
     "whip": "WHIP",
 }
 
+# leaderCategory the stats API reports back for request codes it renames
+LEADER_CATEGORY_RESPONSE_NAMES = {
+    "era": "earnedRunAverage",
+    "whip": "walksAndHitsPerInningPitched",
+}
+
 # Report filename pattern for opponent extraction
 REPORT_OPP_PATTERN = re.compile(r"_vs_([A-Za-z0-9]+)", re.IGNORECASE)
 
@@ -106,6 +112,13 @@ REPORT_OPP_PATTERN = re.compile(r"_vs_([A-Za-z0-9]+)", re.IGNORECASE)
 JOURNAL_VISIBILITY_OPTIONS = ("private", "public")
 MAX_JOURNAL_TIMELINE_ENTRIES = 365
 
+# Timezone choices on the profile settings page
+COMMON_TIMEZONES = (
+    "US/Pacific", "US/Mountain", "US/Central", "US/Eastern",
+    "US/Arizona", "US/Hawaii", "Canada/Eastern", "Europe/London",
+    "Europe/Paris", "Asia/Tokyo", "Australia/Sydney"
+)
+
 # Report generation constants
 REPORT_LEAD_DAYS = 5
 
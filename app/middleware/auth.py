@@ -15,9 +15,28 @@ except ImportError:
     PlayerDB = None
 
 
+def get_request_db():
+    """Return the PlayerDB for the current request, opening it on first use.
+
+    The connection is closed by the teardown hook installed in
+    setup_auth_middleware, on success and error paths alike.
+    """
+    db = g.get("_player_db")
+    if db is None:
+        db = g._player_db = PlayerDB()
+    return db
+
+
 def setup_auth_middleware(app):
     """Setup authentication middleware"""
     
+    @app.teardown_appcontext
+    def close_request_db(exc):
+        """Close the per-request PlayerDB, if one was opened"""
+        db = g.pop("_player_db", None)
+        if db is not None:
+            db.close()
+    
     @app.before_request
     def load_authenticated_user():
         """Load authenticated user for request"""
@@ -141,7 +160,7 @@ def ensure_default_admin():
     if not PlayerDB:
         return
     
-    from werkzeug.security import generate_password_hash, check_password_hash
+    from app.utils.passwords import hash_password, verify_password
     import logging
     import time
     
@@ -161,12 +180,12 @@ def ensure_default_admin():
         try:
             db = PlayerDB()
             existing = db.get_user_by_email(default_email)
-            password_hash = generate_password_hash(default_password)
             
+            # Only hash when a write actually needs it (it is the slow part of startup)
             if not existing:
                 db.create_user(
                     email=default_email,
-                    password_hash=password_hash,
+                    password_hash=hash_password(default_password),
                     first_name="Sequence",
                     last_name="Admin",
                     is_admin=True,
@@ -176,8 +195,8 @@ def ensure_default_admin():
             else:
                 if not existing.get("is_admin"):
                     db.set_user_admin(existing["id"], True)
-                if not check_password_hash(existing.get("password_hash", ""), default_password):
-                    db.update_user_password(existing["id"], password_hash)
+                if not verify_password(existing.get("password_hash", ""), default_password):
+                    db.update_user_password(existing["id"], hash_password(default_password))
             db.close()
             break  # Success, exit retry loop
         except Exception as exc:
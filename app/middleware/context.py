@@ -13,7 +13,6 @@ def setup_context_processors(app):
     def attach_settings_to_request():
         """Attach settings to request context"""
         g.app_settings = Config.get_settings()
-        generate_csrf_token()  # Ensure CSRF token exists
     
     @app.context_processor
     def inject_app_settings():
@@ -30,6 +29,7 @@ def setup_context_processors(app):
         return {
             "app_settings": settings,
             "app_theme": theme,
+            # Created on first render, so static and JSON requests never touch the session
             "csrf_token": generate_csrf_token(),
             "current_user": user
         }
@@ -25,6 +25,7 @@ except ImportError:
 from app.config import Config
 from app.middleware.auth import admin_required, login_required
 from app.middleware.csrf import validate_csrf
+from app.utils.request_cache import invalidate_admin_user_rows
 from app.utils.helpers import clean_str
 from app.utils.cron_manager import create_cron_job, remove_cron_job, get_cron_status
 from app.services.schedule_service import collect_series_for_team
@@ -270,6 +271,8 @@ def api_admin_set_role(user_id: int):
 
         db.set_user_admin(user_id, is_admin)
 
+        invalidate_admin_user_rows()
+
         updated = db.get_user_by_id(user_id)
 
         db.close()
@@ -317,6 +320,7 @@ def api_admin_set_active(user_id: int):
             return jsonify({"error": "You cannot deactivate your own account."}), 400
         
         db.set_user_active(user_id, is_active)
+        invalidate_admin_user_rows()
         updated = db.get_user_by_id(user_id)
         db.close()
     except Exception as exc:
@@ -357,6 +361,7 @@ def api_admin_delete_user(user_id: int):
         doc_paths = [Path(doc.get("path") or "") for doc in player_docs if doc.get("path")]
         
         deleted = db.delete_user(user_id)
+        invalidate_admin_user_rows()
         db.close()
         
         # Clean up physical files after database deletion
@@ -1020,7 +1020,7 @@ def api_matchups():
                 if isinstance(play_ids, dict) and play_ids.get('game_date'):
                     game_date = play_ids['game_date']
                 elif 'game_date' in first_pitch:
-                    game_date = str(first_pitch['game_date'])
+                    game_date = str(first_pitch['game_date'])[:10]
                 
                 def clean_dict(d):
                     if isinstance(d, dict):
@@ -1,13 +1,21 @@
 """
 Visuals API routes
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, url_for
 import sys
+import traceback
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import unquote
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 bp = Blueprint('visuals', __name__)
 
 # Import CSV data loader if available
@@ -19,6 +27,348 @@ try:
 except (ImportError, Exception):
     csv_loader = None
 
+# Statcast scraping helpers (src/ is on sys.path from the block above)
+try:
+    from scrape_savant import (
+        batter_statcast_cached, fetch_batter_statcast, fetch_batter_statcast_iter, fetch_pitcher_statcast,
+        lookup_batter_id,
+    )
+except ImportError:
+    batter_statcast_cached = fetch_batter_statcast = fetch_batter_statcast_iter = None
+    fetch_pitcher_statcast = lookup_batter_id = None
+from app.services.statcast_service import submit_batter_statcast_fetch
+
+# Sorted keys match jsonify's output; NumPy scalars/arrays encode natively
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS if orjson else 0
+)
+
+
+def _json_response(payload):
+    """JSON response for the large matrix payloads, via orjson when installed."""
+    if orjson is None:
+        return jsonify(payload)
+    return Response(orjson.dumps(payload, option=_ORJSON_OPTIONS), mimetype='application/json')
+
+
+# Statcast columns read by the batter count/swing/discipline routes. Passing
+# these to fetch_batter_statcast skips decoding the rest of the Savant schema.
+COUNT_PERF_COLS = [
+    'pitch_type', 'balls', 'strikes', 'description', 'events', 'stand',
+    'estimated_woba_using_speedangle', 'woba_value', 'launch_speed',
+    'game_year', 'game_date',
+]
+SWING_MATRIX_COLS = COUNT_PERF_COLS + ['zone', 'plate_x', 'plate_z']
+PLATE_DISCIPLINE_COLS = [
+    'pitch_type', 'description', 'stand', 'zone', 'plate_x', 'plate_z',
+    'game_year', 'game_date',
+]
+
+# Statcast ships these as float64; float32 is ample precision for them and
+# halves the bytes every mask/mean pass has to touch
+_FLOAT32_COLS = (
+    'balls', 'strikes', 'zone', 'plate_x', 'plate_z', 'launch_speed',
+    'estimated_woba_using_speedangle', 'woba_value', 'run_value',
+)
+
+COUNT_ORDER = ['0-0', '1-0', '0-1', '1-1', '2-0', '2-1', '1-2', '2-2', '3-0', '3-1', '3-2', '0-2']
+
+# Maps balls * 3 + strikes to the count's position in COUNT_ORDER
+_COUNT_KEY_TO_CODE = np.empty(12, dtype=np.int8)
+for _code, _count in enumerate(COUNT_ORDER):
+    _balls, _strikes = map(int, _count.split('-'))
+    _COUNT_KEY_TO_CODE[_balls * 3 + _strikes] = _code
+
+# Pitch description vocabularies (lowercase Statcast `description` values)
+_SWING_DESCS = frozenset({
+    'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked',
+    'missed_bunt', 'foul_bunt', 'hit_into_play',
+})
+_WHIFF_DESCS = frozenset({'swinging_strike', 'swinging_strike_blocked', 'missed_bunt'})
+_CONTACT_DESCS = frozenset({'foul', 'foul_tip', 'foul_bunt', 'hit_into_play'})
+_STRIKE_DESCS = frozenset({
+    'called_strike', 'foul', 'foul_tip', 'swinging_strike',
+    'swinging_strike_blocked', 'foul_bunt', 'hit_into_play',
+})
+
+# Bit flags returned by _description_flags
+DESC_SWING = 1
+DESC_WHIFF = 2
+DESC_CONTACT = 4
+DESC_STRIKE = 8
+# Some Statcast sources put the strikeout event in `description`
+DESC_STRIKEOUT = 16
+
+# Plate-appearance outcome vocabularies (lowercase Statcast `events` values)
+_HIT_EVENTS = frozenset({'single', 'double', 'triple', 'home_run'})
+_OUT_EVENTS = frozenset({
+    'strikeout', 'strikeout_double_play', 'field_out', 'force_out',
+    'grounded_into_double_play', 'double_play', 'triple_play',
+    'fielders_choice', 'fielders_choice_out', 'sac_fly', 'sac_fly_double_play',
+    'sac_bunt', 'sac_bunt_double_play', 'bunt_groundout', 'bunt_popout',
+})
+_WALK_EVENTS = frozenset({'walk', 'intent_walk', 'hit_by_pitch'})
+_STRIKEOUT_EVENTS = frozenset({'strikeout', 'strikeout_double_play'})
+
+# Bit flags returned by _event_flags
+EVENT_HIT = 1
+EVENT_OUT = 2
+EVENT_WALK = 4
+EVENT_STRIKEOUT = 8
+EVENT_PA_END = 16
+
+# (vocabulary, flag) pairs; tuples so they can key the lookup-table cache
+_DESCRIPTION_VOCABS = (
+    (_SWING_DESCS, DESC_SWING), (_WHIFF_DESCS, DESC_WHIFF),
+    (_CONTACT_DESCS, DESC_CONTACT), (_STRIKE_DESCS, DESC_STRIKE),
+    (_STRIKEOUT_EVENTS, DESC_STRIKEOUT),
+)
+_EVENT_VOCABS = (
+    (_HIT_EVENTS, EVENT_HIT), (_OUT_EVENTS, EVENT_OUT),
+    (_WALK_EVENTS, EVENT_WALK), (_STRIKEOUT_EVENTS, EVENT_STRIKEOUT),
+)
+
+
+def _vocab_flags(values, vocab_flags, present_flag=0):
+    """Classify a string column into bit flags (int8 array).
+
+    The distinct values are lowercased and classified once, then the result
+    is gathered through the categorical codes, so there is no per-row string
+    work and a single pass yields every flag. ``present_flag`` is set on
+    every non-blank value; missing values get no flags.
+    """
+    cat = values.astype('category')
+    lut = _flag_lut(tuple(cat.cat.categories), vocab_flags, present_flag)
+    return lut[cat.cat.codes.to_numpy()]
+
+
+@lru_cache(maxsize=256)
+def _flag_lut(categories, vocab_flags, present_flag):
+    """Flag lookup table for one set of categories (memoized; Statcast
+    vocabularies are small and repeat across requests)."""
+    labels = pd.Index(categories).astype(str).str.lower()
+    # One extra trailing slot so missing values (code -1) map to no flags
+    lut = np.zeros(len(labels) + 1, dtype=np.int8)
+    for vocab, flag in vocab_flags:
+        lut[:-1][labels.isin(vocab)] |= flag
+    if present_flag:
+        lut[:-1][(labels != '') & (labels != 'nan')] |= present_flag
+    lut.flags.writeable = False
+    return lut
+
+
+def _description_flags(descriptions):
+    """Classify pitch descriptions into DESC_* bit flags (int8 array)."""
+    return _vocab_flags(descriptions, _DESCRIPTION_VOCABS)
+
+
+def _event_flags(events):
+    """Classify Statcast events into EVENT_* bit flags (int8 array).
+
+    Any non-blank event marks the pitch that ended the plate appearance.
+    """
+    return _vocab_flags(events, _EVENT_VOCABS, present_flag=EVENT_PA_END)
+
+
+def _in_zone_mask(df):
+    """Boolean in-zone mask for each pitch.
+
+    Statcast zones 1-9 are in the strike zone. Pitches without a zone fall
+    back to an approximate box from plate_x/plate_z (|x| <= 0.855, 1.5 <= z <= 3.5).
+    """
+    if 'plate_x' in df.columns and 'plate_z' in df.columns:
+        px = df['plate_x'].to_numpy(dtype=float, na_value=np.nan)
+        pz = df['plate_z'].to_numpy(dtype=float, na_value=np.nan)
+        in_box = (np.abs(px) <= 0.855) & (pz >= 1.5) & (pz <= 3.5)
+    else:
+        in_box = np.zeros(len(df), dtype=bool)
+    if 'zone' not in df.columns:
+        return in_box
+    zone = df['zone'].to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(zone), in_box, (zone >= 1) & (zone <= 9))
+
+
+def _zone_numbers(df):
+    """Strike-zone square 1-9 for every pitch (NaN when it has none).
+
+    Pitches without a Statcast zone are placed on the 3x3 grid from
+    plate_x/plate_z; Statcast zones outside 1-9 are dropped.
+    """
+    missing = np.full(len(df), np.nan)
+    zone = df['zone'].to_numpy(dtype=float, na_value=np.nan) if 'zone' in df.columns else missing
+    estimated = missing
+    if 'plate_x' in df.columns and 'plate_z' in df.columns:
+        x = df['plate_x'].to_numpy(dtype=float, na_value=np.nan)
+        z = df['plate_z'].to_numpy(dtype=float, na_value=np.nan)
+        col = np.digitize(x, [-0.285, 0.285])
+        row = 2 - np.digitize(z, [2.17, 2.83])
+        estimated = np.where(np.isnan(x) | np.isnan(z), np.nan, row * 3 + col + 1)
+    listed = np.where((zone >= 1) & (zone <= 9), np.trunc(zone), np.nan)
+    return np.where(np.isnan(zone), estimated, listed)
+
+
+def _batter_hand(df, default='R'):
+    """Most common ``stand`` value in the frame, or ``default``.
+
+    Counts categorical codes with np.bincount instead of Series.mode(),
+    which sorts; ties still resolve to the first hand alphabetically.
+    """
+    if 'stand' not in df.columns:
+        return default
+    stand = df['stand'].astype('category')
+    codes = stand.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    if codes.size == 0:
+        return default
+    return str(stand.cat.categories[np.bincount(codes).argmax()])
+
+
+def _parse_season_arg():
+    """``season`` query arg as an int, or None if missing or not a plausible year."""
+    raw = request.args.get('season', '').strip()
+    if len(raw) != 4 or not raw.isdigit():
+        return None
+    season = int(raw)
+    return season if 1900 <= season <= datetime.now().year + 1 else None
+
+
+def _sorted_range(values, low, high):
+    """Row slice with ``low <= values <= high`` if values is sorted either way, else None."""
+    if values.is_monotonic_increasing:
+        return slice(values.searchsorted(low, 'left'), values.searchsorted(high, 'right'))
+    if values.is_monotonic_decreasing:
+        # Search the ascending view and map the positions back
+        ascending = values.iloc[::-1]
+        n = len(values)
+        return slice(n - ascending.searchsorted(high, 'right'), n - ascending.searchsorted(low, 'left'))
+    return None
+
+
+def _filter_to_season(df, season):
+    """Keep only the rows for ``season`` using game_year, else game_date.
+
+    fetch_batter_statcast stores game_date as datetime64, so the date
+    fallback is a plain comparison with no string parsing. Statcast returns
+    rows newest first, so a column sorted in either direction is sliced with
+    searchsorted instead of building a boolean mask.
+    """
+    if 'game_year' in df.columns:
+        years = df['game_year']
+        if not pd.api.types.is_integer_dtype(years):
+            years = pd.to_numeric(years, errors='coerce')
+        season = int(season)
+        rows = _sorted_range(years, season, season)
+        return df[years == season] if rows is None else df.iloc[rows]
+    if 'game_date' in df.columns:
+        dates = df['game_date']
+        season_start = pd.Timestamp(f"{season}-03-01")
+        season_end = pd.Timestamp(f"{season}-11-30")
+        rows = _sorted_range(dates, season_start, season_end) if pd.api.types.is_datetime64_dtype(dates) else None
+        if rows is None:
+            return df[(dates >= season_start) & (dates <= season_end)]
+        return df.iloc[rows]
+    return df
+
+
+def _statcast_download_pending(batter_id, start_date, end_date):
+    """202 response for a batter range that still has to be downloaded, else None.
+
+    The download runs on the statcast pool instead of this worker thread; the
+    client polls ``status_url`` and repeats its request once the job completes.
+    """
+    if batter_statcast_cached is None or batter_statcast_cached(batter_id, start_date, end_date):
+        return None
+    job_id = submit_batter_statcast_fetch(batter_id, start_date, end_date)
+    return jsonify({
+        "status": "pending",
+        "job_id": job_id,
+        "status_url": url_for('reports.status', job_id=job_id),
+    }), 202
+
+
+# Run expectancy by count (simplified - approximate values)
+RUN_EXPECTANCY_BY_COUNT = {
+    '0-0': 0.475, '1-0': 0.525, '0-1': 0.260,
+    '2-0': 0.575, '1-1': 0.350, '0-2': 0.100,
+    '3-0': 0.625, '2-1': 0.425, '1-2': 0.175,
+    '3-1': 0.550, '2-2': 0.275, '3-2': 0.300
+}
+
+# Same table as an array indexed [balls, strikes] for vectorized lookups
+RUN_EXPECTANCY = np.full((4, 3), 0.35)
+for _count, _re in RUN_EXPECTANCY_BY_COUNT.items():
+    _balls, _strikes = map(int, _count.split('-'))
+    RUN_EXPECTANCY[_balls, _strikes] = _re
+
+# Pitch outcome kinds used for run values
+_RV_OTHER, _RV_IN_PLAY, _RV_BALL, _RV_STRIKE, _RV_FOUL = range(5)
+_HIT_WORDS = ('single', 'double', 'triple', 'home_run')
+
+# Run value of a pitch not put in play, indexed [balls, strikes, outcome kind]
+_COUNT_RUN_VALUE = np.zeros((4, 3, 5))
+for _balls in range(4):
+    for _strikes in range(3):
+        _base = RUN_EXPECTANCY[_balls, _strikes]
+        _COUNT_RUN_VALUE[_balls, _strikes, _RV_BALL] = RUN_EXPECTANCY[min(_balls + 1, 3), _strikes] - _base
+        _COUNT_RUN_VALUE[_balls, _strikes, _RV_STRIKE] = RUN_EXPECTANCY[_balls, min(_strikes + 1, 2)] - _base
+        # A foul with two strikes leaves the count unchanged
+        if _strikes < 2:
+            _COUNT_RUN_VALUE[_balls, _strikes, _RV_FOUL] = _COUNT_RUN_VALUE[_balls, _strikes, _RV_STRIKE]
+
+
+def _pitch_run_values(df):
+    """Approximate run value of every pitch.
+
+    Balls, strikes and fouls are valued by the change in count run
+    expectancy; balls in play by their (x)wOBA relative to the count.
+    """
+    balls = df['balls'].fillna(0).clip(0, 3).to_numpy().astype(np.int8)
+    strikes = df['strikes'].fillna(0).clip(0, 2).to_numpy().astype(np.int8)
+
+    # Classify the distinct descriptions once, then gather by code
+    cat = df['description'].astype('category')
+    labels = cat.cat.categories.astype(str).str.lower()
+    kinds = np.full(len(labels) + 1, _RV_OTHER, dtype=np.int8)
+    in_play_guess = np.zeros(len(labels) + 1)
+    for i, label in enumerate(labels):
+        if 'hit_into_play' in label:
+            kinds[i] = _RV_IN_PLAY
+            in_play_guess[i] = 0.1 if any(word in label for word in _HIT_WORDS) else -0.05
+        elif 'ball' in label:
+            kinds[i] = _RV_BALL
+        elif 'called_strike' in label or 'swinging_strike' in label:
+            kinds[i] = _RV_STRIKE
+        elif 'foul' in label:
+            kinds[i] = _RV_FOUL
+    codes = cat.cat.codes.to_numpy()
+    kind = kinds[codes]
+
+    # Balls, strikes and fouls: one gather from the precomputed table
+    run_value = _COUNT_RUN_VALUE[balls, strikes, kind]
+
+    # Balls in play: actual wOBA, else expected wOBA, else a flat hit/out guess
+    in_play = np.flatnonzero(kind == _RV_IN_PLAY)
+    if in_play.size:
+        base_re = RUN_EXPECTANCY[balls[in_play], strikes[in_play]]
+        value = in_play_guess[codes[in_play]]
+        for col in ('estimated_woba_using_speedangle', 'woba_value'):
+            if col in df.columns:
+                observed = df[col].to_numpy(dtype=float, na_value=np.nan)[in_play]
+                value = np.where(np.isnan(observed), value, observed - base_re)
+        run_value[in_play] = value
+    return run_value
+
+
+def _downcast_statcast(df, int_cols=()):
+    """Shrink Statcast numeric columns before the analytic passes.
+
+    ``int_cols`` must already be NaN-free (e.g. after a dropna) and are cast
+    to int8; the remaining known numeric columns become float32.
+    """
+    casts = {col: 'float32' for col in _FLOAT32_COLS if col in df.columns}
+    casts.update({col: 'int8' for col in int_cols if col in df.columns})
+    return df.astype(casts) if casts else df
+
 
 @bp.route('/visuals/heatmap', methods=['GET'])
 def api_visuals_heatmap():
@@ -35,12 +385,7 @@ def api_visuals_heatmap():
         if not metric:
             return jsonify({"error": "Metric is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
+        season = _parse_season_arg()
         
         team = request.args.get('team', '').strip() or None
         position = request.args.get('position', '').strip() or None
@@ -48,18 +393,10 @@ def api_visuals_heatmap():
         pitcher_hand = request.args.get('pitcher_hand', '').strip() or None
         pitch_type = request.args.get('pitch_type', '').strip() or None
         
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_batter_statcast, fetch_pitcher_statcast, lookup_batter_id
-        from datetime import datetime, timedelta
-        import pandas as pd
-        import numpy as np
-        
         # Get player data filtered by criteria
         try:
             players = csv_loader.get_all_players_summary()
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return jsonify({"error": f"Error loading player data: {str(e)}"}), 500
         
@@ -153,6 +490,9 @@ def api_visuals_heatmap():
         # If not confirmed as pitcher or no pitcher data, try batter data
         if statcast_df is None or statcast_df.empty:
             try:
+                pending = _statcast_download_pending(player_id, start_date, end_date)
+                if pending is not None:
+                    return pending
                 statcast_df = fetch_batter_statcast(player_id, start_date, end_date)
                 if statcast_df is not None and not statcast_df.empty:
                     is_pitcher_confirmed = False
@@ -575,12 +915,7 @@ def api_visuals_heatmap():
         values = [cell['value'] for cell in grid_data if cell['value'] is not None]
         
         # Determine batter handedness from statcast data
-        batter_hand = 'R'  # Default to right-handed
-        if 'stand' in statcast_df.columns:
-            stand_values = statcast_df['stand'].dropna()
-            if len(stand_values) > 0:
-                # Use the most common value
-                batter_hand = str(stand_values.mode().iloc[0]) if len(stand_values.mode()) > 0 else 'R'
+        batter_hand = _batter_hand(statcast_df)
         
         heatmap_data = {
             'player': actual_player_name,
@@ -609,7 +944,6 @@ def api_visuals_heatmap():
         
         return jsonify(heatmap_data)
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -680,12 +1014,7 @@ def api_visuals_spraychart():
         if not player_name:
             return jsonify({"error": "Player name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
+        season = _parse_season_arg()
         
         # Filter options
         event_type = request.args.get('event_type', '').strip() or None  # e.g., 'single', 'double', 'home_run'
@@ -694,18 +1023,10 @@ def api_visuals_spraychart():
         min_launch_angle = request.args.get('min_launch_angle', type=float)
         max_launch_angle = request.args.get('max_launch_angle', type=float)
         
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_batter_statcast, fetch_pitcher_statcast, lookup_batter_id
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
-        
         # Get player data
         try:
             players = csv_loader.get_all_players_summary()
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return jsonify({"error": f"Error loading player data: {str(e)}"}), 500
         
@@ -775,6 +1096,9 @@ def api_visuals_spraychart():
         # If pitcher lookup failed or returned no batted ball data, try as batter
         if statcast_df is None or (statcast_df is not None and statcast_df.empty):
             try:
+                pending = _statcast_download_pending(player_id, start_date, end_date)
+                if pending is not None:
+                    return pending
                 batter_df = fetch_batter_statcast(player_id, start_date, end_date)
                 if batter_df is not None and not batter_df.empty:
                     # Check if there are any batted balls in the batter data
@@ -943,7 +1267,6 @@ def api_visuals_spraychart():
             'summary': summary
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -958,22 +1281,12 @@ def api_visuals_barrel_quality_contact():
         if not player_name:
             return jsonify({"error": "Player name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
-        
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
+        season = _parse_season_arg()
         
         # Get player data
         try:
             players = csv_loader.get_all_players_summary()
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return jsonify({"error": f"Error loading player data: {str(e)}"}), 500
         
@@ -1022,6 +1335,10 @@ def api_visuals_barrel_quality_contact():
             end_date = f"{current_year}-11-30"
             filter_by_season = False
         
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
+        if pending is not None:
+            return pending
+        
         # Fetch statcast data
         try:
             statcast_df = fetch_batter_statcast(batter_id, start_date, end_date)
@@ -1190,7 +1507,6 @@ def api_visuals_barrel_quality_contact():
         })
         
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": f"Error generating barrel analysis: {str(e)}"}), 500
 
@@ -1206,12 +1522,7 @@ def api_visuals_pitchplots():
         if not pitcher_name:
             return jsonify({"error": "Pitcher name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
+        season = _parse_season_arg()
         
         # Filter options
         pitch_type = request.args.get('pitch_type', '').strip() or None
@@ -1225,17 +1536,9 @@ def api_visuals_pitchplots():
         max_vb = request.args.get('max_vb', type=float)
         normalize_arm_side = request.args.get('normalize_arm_side', '0') == '1'
         
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_pitcher_statcast
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
-        
         # Create lookup function for pitcher ID (similar to batter lookup)
         def lookup_pitcher_id(name: str) -> int:
             """Look up MLBAM ID for a pitcher by name"""
-            from scrape_savant import lookup_batter_id
             # The lookup_batter_id function works for both batters and pitchers
             return lookup_batter_id(name)
         
@@ -1566,7 +1869,6 @@ def api_visuals_pitchplots():
             }
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -1581,21 +1883,11 @@ def api_visuals_pitch_mix_analysis():
         if not pitcher_name:
             return jsonify({"error": "Pitcher name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
-        
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_pitcher_statcast
+        season = _parse_season_arg()
         
         # Create lookup function for pitcher ID
         def lookup_pitcher_id(name: str) -> int:
             """Look up MLBAM ID for a pitcher by name"""
-            from scrape_savant import lookup_batter_id
             return lookup_batter_id(name)
         
         # Get pitcher ID
@@ -1718,16 +2010,19 @@ def api_visuals_pitch_mix_analysis():
             df['stand'] = 'R'
         
         # Calculate effectiveness metrics
-        desc = df['description'].astype(str).str.lower()
-        df['is_strike'] = desc.isin(['called_strike', 'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 'foul_bunt', 'hit_into_play'])
-        df['is_swing'] = desc.isin(['foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 'missed_bunt', 'foul_bunt', 'hit_into_play'])
-        df['is_whiff'] = desc.isin(['swinging_strike', 'swinging_strike_blocked', 'missed_bunt'])
+        desc_flags = _description_flags(df['description'])
+        df['is_strike'] = (desc_flags & DESC_STRIKE) != 0
+        df['is_swing'] = (desc_flags & DESC_SWING) != 0
+        df['is_whiff'] = (desc_flags & DESC_WHIFF) != 0
         
         # Determine if pitch is in zone
         if 'zone' in df.columns:
-            df['is_zone'] = df['zone'].between(1, 9, inclusive='both')
+            zone = df['zone'].to_numpy(dtype=float, na_value=np.nan)
+            df['is_zone'] = (zone >= 1) & (zone <= 9)
         elif 'plate_x' in df.columns and 'plate_z' in df.columns:
-            df['is_zone'] = (df['plate_x'].between(-0.85, 0.85, inclusive='both') & df['plate_z'].between(1.5, 3.5, inclusive='both'))
+            px = df['plate_x'].to_numpy(dtype=float, na_value=np.nan)
+            pz = df['plate_z'].to_numpy(dtype=float, na_value=np.nan)
+            df['is_zone'] = (np.abs(px) <= 0.85) & (pz >= 1.5) & (pz <= 3.5)
         else:
             df['is_zone'] = False
         
@@ -1872,7 +2167,6 @@ def api_visuals_pitch_mix_analysis():
             }
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -1888,27 +2182,14 @@ def api_visuals_pitch_arsenal_effectiveness():
         if not pitcher_name:
             return jsonify({"error": "Pitcher name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
+        season = _parse_season_arg()
         
         batter_hand = request.args.get('batter_hand', '').strip() or None
         count_filter = request.args.get('count_filter', '').strip() or None
         
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_pitcher_statcast
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
-        
         # Create lookup function for pitcher ID
         def lookup_pitcher_id(name: str) -> int:
             """Look up MLBAM ID for a pitcher by name"""
-            from scrape_savant import lookup_batter_id
             return lookup_batter_id(name)
         
         # Get pitcher ID
@@ -2014,16 +2295,10 @@ def api_visuals_pitch_arsenal_effectiveness():
             df['run_value'] = 0.0
         
         # Calculate whiff rates
-        desc = df['description'].astype(str).str.lower()
-        df['is_strike'] = desc.isin([
-            'called_strike', 'foul', 'foul_tip', 'swinging_strike', 
-            'swinging_strike_blocked', 'foul_bunt', 'hit_into_play'
-        ])
-        df['is_whiff'] = desc.isin(['swinging_strike', 'swinging_strike_blocked', 'missed_bunt'])
-        df['is_swing'] = desc.isin([
-            'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 
-            'missed_bunt', 'foul_bunt', 'hit_into_play'
-        ])
+        desc_flags = _description_flags(df['description'])
+        df['is_strike'] = (desc_flags & DESC_STRIKE) != 0
+        df['is_whiff'] = (desc_flags & DESC_WHIFF) != 0
+        df['is_swing'] = (desc_flags & DESC_SWING) != 0
         
         # Calculate ground ball rates (launch angle < 10 degrees)
         if 'launch_angle' in df.columns:
@@ -2035,7 +2310,7 @@ def api_visuals_pitch_arsenal_effectiveness():
         
         # Calculate strikeouts on 2-strike counts
         df['is_two_strike'] = df['strikes'] == 2
-        df['is_strikeout'] = desc.isin(['strikeout', 'strikeout_double_play'])
+        df['is_strikeout'] = (desc_flags & DESC_STRIKEOUT) != 0
         
         # Helper function to create zone heatmap data
         def create_zone_heatmap(group_df, metric_col, min_samples=5):
@@ -2086,8 +2361,8 @@ def api_visuals_pitch_arsenal_effectiveness():
             
             return {'zones': zones}
         
-        # Get unique pitch types
-        pitch_types = df['pitch_type'].unique().tolist()
+        # Split once on the categorical codes instead of masking per pitch type
+        df['pitch_type'] = df['pitch_type'].astype('category')
         
         # Calculate heatmaps for each metric
         run_value_heatmaps = {}
@@ -2095,9 +2370,11 @@ def api_visuals_pitch_arsenal_effectiveness():
         ground_ball_heatmaps = {}
         putaway_data = {}
         summary = {}
+        pitch_types = []
         
-        for pitch_type in pitch_types:
-            pitch_df = df[df['pitch_type'] == pitch_type]
+        for pitch_type, pitch_df in df.groupby('pitch_type', observed=True, sort=False):
+            pitch_type = str(pitch_type)
+            pitch_types.append(pitch_type)
             
             if len(pitch_df) < 10:  # Skip if too few pitches
                 continue
@@ -2185,7 +2462,6 @@ def api_visuals_pitch_arsenal_effectiveness():
             'summary': summary
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -2203,23 +2479,10 @@ def api_visuals_velocity_trends():
         
         player_type = request.args.get('player_type', 'pitcher').strip().lower()
         view_type = request.args.get('view_type', 'career').strip().lower()
-        season = request.args.get('season', '').strip() or None
+        season = _parse_season_arg()
         game_date = request.args.get('game_date', '').strip() or None
         pitch_type = request.args.get('pitch_type', '').strip() or None
         
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
-        
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_pitcher_statcast, fetch_batter_statcast, lookup_batter_id
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
-        
         # Get player ID
         try:
             player_id = lookup_batter_id(player_name)
@@ -2245,6 +2508,11 @@ def api_visuals_velocity_trends():
             filter_by_season = True
             season = current_year
         
+        if player_type != 'pitcher':
+            pending = _statcast_download_pending(player_id, start_date, end_date)
+            if pending is not None:
+                return pending
+        
         # Fetch statcast data
         try:
             if player_type == 'pitcher':
@@ -2435,7 +2703,6 @@ def api_visuals_velocity_trends():
             'trends': trends
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -2451,19 +2718,7 @@ def api_visuals_zone_contact_rates():
         if not batter_name:
             return jsonify({"error": "Batter name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
-        
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
+        season = _parse_season_arg()
         
         # Get batter ID
         try:
@@ -2482,6 +2737,10 @@ def api_visuals_zone_contact_rates():
             end_date = f"{current_year}-11-30"
             filter_by_season = False
         
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
+        if pending is not None:
+            return pending
+        
         # Fetch statcast data
         try:
             df = fetch_batter_statcast(batter_id, start_date, end_date)
@@ -2554,21 +2813,14 @@ def api_visuals_zone_contact_rates():
             }), 200
         
         # Calculate swing and contact indicators
-        desc = df['description'].astype(str).str.lower()
-        df['is_swing'] = desc.isin([
-            'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 
-            'missed_bunt', 'foul_bunt', 'hit_into_play'
-        ])
+        desc_flags = _description_flags(df['description'])
+        df['is_swing'] = (desc_flags & DESC_SWING) != 0
         
         # Contact made (swing that resulted in contact, not a whiff)
-        df['is_contact'] = desc.isin([
-            'foul', 'foul_tip', 'foul_bunt', 'hit_into_play'
-        ])
+        df['is_contact'] = (desc_flags & DESC_CONTACT) != 0
         
         # Whiff (swing and miss)
-        df['is_whiff'] = desc.isin([
-            'swinging_strike', 'swinging_strike_blocked', 'missed_bunt'
-        ])
+        df['is_whiff'] = (desc_flags & DESC_WHIFF) != 0
         
         # Quality of contact metrics
         df['is_hard_hit'] = False
@@ -2684,11 +2936,7 @@ def api_visuals_zone_contact_rates():
             }), 200
         
         # Get batter handedness
-        batter_hand = 'R'  # Default
-        if 'stand' in df.columns:
-            stand_values = df['stand'].dropna()
-            if len(stand_values) > 0:
-                batter_hand = str(stand_values.mode().iloc[0]) if len(stand_values.mode()) > 0 else 'R'
+        batter_hand = _batter_hand(df)
         
         return jsonify({
             'batter': batter_name,
@@ -2701,7 +2949,6 @@ def api_visuals_zone_contact_rates():
             'z_range': [float(z_min), float(z_max)]
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -2717,24 +2964,12 @@ def api_visuals_expected_stats_comparison():
         if not batter_name:
             return jsonify({"error": "Player name is required"}), 400
         
-        season = request.args.get('season', '').strip() or None
-        if season:
-            try:
-                season = int(season)
-            except ValueError:
-                season = None
+        season = _parse_season_arg()
         
         pitch_type = request.args.get('pitch_type', '').strip() or None
         pitcher_hand = request.args.get('pitcher_hand', '').strip() or None
         count = request.args.get('count', '').strip() or None
         
-        # Import statcast functions
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
-        from datetime import datetime
-        import pandas as pd
-        import numpy as np
-        
         # Get batter ID
         try:
             batter_id = lookup_batter_id(batter_name)
@@ -2751,6 +2986,10 @@ def api_visuals_expected_stats_comparison():
             start_date = f"{current_year - 3}-03-01"
             end_date = f"{current_year}-11-30"
         
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
+        if pending is not None:
+            return pending
+        
         # Fetch statcast data
         df = fetch_batter_statcast(batter_id, start_date, end_date)
         
@@ -2787,7 +3026,6 @@ def api_visuals_expected_stats_comparison():
         return jsonify(stats_result)
         
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
@@ -2814,31 +3052,8 @@ def api_visuals_count_performance():
 
         
 
-        season = request.args.get('season', '').strip() or None
-
-        if season:
-
-            try:
-
-                season = int(season)
-
-            except ValueError:
-
-                season = None
-
-        
-
-        # Import statcast functions
+        season = _parse_season_arg()
 
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
-
-        from datetime import datetime
-
-        import pandas as pd
-
-        import numpy as np
 
         
 
@@ -2876,11 +3091,19 @@ def api_visuals_count_performance():
 
         
 
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
+
+        if pending is not None:
+
+            return pending
+
+        
+
         # Fetch statcast data
 
         try:
 
-            df = fetch_batter_statcast(batter_id, start_date, end_date)
+            df = fetch_batter_statcast(batter_id, start_date, end_date, columns=COUNT_PERF_COLS)
 
         except Exception as e:
 
@@ -2906,69 +3129,7 @@ def api_visuals_count_performance():
 
         if filter_by_season:
 
-            year_column = None
-
-            for col_name in ['game_year', 'year', 'Year', 'season']:
-
-                if col_name in df.columns:
-
-                    year_column = col_name
-
-                    break
-
-            
-
-            if year_column:
-
-                if not pd.api.types.is_integer_dtype(df[year_column]):
-
-                    df[year_column] = pd.to_numeric(df[year_column], errors='coerce')
-
-                df = df[
-
-                    (df[year_column].notna()) & 
-
-                    (df[year_column] == int(season))
-
-                ]
-
-            else:
-
-                date_column = None
-
-                for col_name in ['game_date', 'gameDate', 'date', 'Date', 'game_day']:
-
-                    if col_name in df.columns:
-
-                        date_column = col_name
-
-                        break
-
-                
-
-                if date_column:
-
-                    if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
-
-                        df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-
-                    
-
-                    season_start = pd.to_datetime(f"{season}-03-01")
-
-                    season_end = pd.to_datetime(f"{season}-11-30")
-
-                    
-
-                    df = df[df[date_column].notna()]
-
-                    df = df[
-
-                        (df[date_column] >= season_start) & 
-
-                        (df[date_column] <= season_end)
-
-                    ]
+            df = _filter_to_season(df, season)
 
             
 
@@ -3002,77 +3163,74 @@ def api_visuals_count_performance():
 
             }), 200
 
+
+        df = _downcast_statcast(df, int_cols=('balls', 'strikes'))
+
         
 
-        # Create count column
+        # Create count column from an integer balls*3+strikes key
 
-        df['count'] = df['balls'].astype(int).astype(str) + '-' + df['strikes'].astype(int).astype(str)
+        balls = df['balls'].to_numpy()
 
-        
+        strikes = df['strikes'].to_numpy()
 
-        # Define count order
+        valid = (balls >= 0) & (balls <= 3) & (strikes >= 0) & (strikes <= 2)
 
-        COUNT_ORDER = ['0-0', '1-0', '0-1', '1-1', '2-0', '2-1', '1-2', '2-2', '3-0', '3-1', '3-2', '0-2']
+        df = df[valid]
 
-        df = df[df['count'].isin(COUNT_ORDER)]
+        df['count'] = pd.Categorical.from_codes(
 
-        
+            _COUNT_KEY_TO_CODE[balls[valid] * 3 + strikes[valid]],
 
-        # Calculate outcome metrics
+            categories=COUNT_ORDER
 
-        desc = df['description'].astype(str).str.lower()
+        )
 
         
 
+        # Calculate outcome metrics
+
         # Use events column if available (this is the actual at-bat outcome)
 
         # Otherwise fall back to description
 
         if 'events' in df.columns:
 
-            events = df['events'].astype(str).str.lower()
+            event_flags = _event_flags(df['events'])
 
             # Hits from events
 
-            df['is_hit'] = events.isin(['single', 'double', 'triple', 'home_run'])
+            df['is_hit'] = (event_flags & EVENT_HIT) != 0
 
             # Outs from events (field outs, strikeouts, etc.)
 
-            df['is_out'] = events.isin([
-
-                'strikeout', 'strikeout_double_play', 'field_out', 'force_out', 
-
-                'grounded_into_double_play', 'double_play', 'triple_play',
-
-                'fielders_choice', 'fielders_choice_out', 'sac_fly', 'sac_fly_double_play',
-
-                'sac_bunt', 'sac_bunt_double_play', 'bunt_groundout', 'bunt_popout'
-
-            ])
+            df['is_out'] = (event_flags & EVENT_OUT) != 0
 
             # Walks from events
 
-            df['is_walk'] = events.isin(['walk', 'intent_walk', 'hit_by_pitch'])
+            df['is_walk'] = (event_flags & EVENT_WALK) != 0
 
             # Strikeouts from events
 
-            df['is_strikeout'] = events.isin(['strikeout', 'strikeout_double_play'])
+            df['is_strikeout'] = (event_flags & EVENT_STRIKEOUT) != 0
 
-            # PA ending indicator
+            # PA ending indicator: any non-blank event
 
-            df['is_pa_ending'] = events.notna() & (events != 'nan') & (events != '')
+            df['is_pa_ending'] = (event_flags & EVENT_PA_END) != 0
 
         else:
 
             # Fallback to description if events column not available
 
-            df['is_hit'] = desc.isin(['single', 'double', 'triple', 'home_run'])
+            desc = df['description'].astype(str).str.lower()
+
+            df['is_hit'] = desc.isin(_HIT_EVENTS)
 
             df['is_out'] = desc.isin(['strikeout', 'strikeout_double_play', 'field_out', 'force_out', 'grounded_into_double_play', 'double_play', 'triple_play'])
 
-            df['is_walk'] = desc.isin(['walk', 'intent_walk', 'hit_by_pitch'])
+            df['is_walk'] = desc.isin(_WALK_EVENTS)
 
-            df['is_strikeout'] = desc.isin(['strikeout', 'strikeout_double_play'])
+            df['is_strikeout'] = desc.isin(_STRIKEOUT_EVENTS)
 
             df['is_pa_ending'] = (
 
@@ -3084,67 +3242,45 @@ def api_visuals_count_performance():
 
         
 
-        # Swing and whiff rates (these are pitch-level, so use description)
-
-        df['is_swing'] = desc.isin(['foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 'missed_bunt', 'foul_bunt', 'hit_into_play'])
-
-        df['is_whiff'] = desc.isin(['swinging_strike', 'swinging_strike_blocked', 'missed_bunt'])
-
-        
-
-        # Helper function to calculate metrics for a count
-
-        def calculate_count_metrics(count_df):
-
-            total_pitches = len(count_df)
-
-            if total_pitches == 0:
-
-                return {}
-
-            
-
-            # For at-bat outcomes (hits, outs, walks), only count pitches where at-bat ended
+        # At-bat outcomes only count on the pitch that ended the PA; fold that in once
 
-            # (i.e., where events is not null, or is_pa_ending is true)
+        pa_mask = df['is_pa_ending'].to_numpy()
 
-            if 'events' in count_df.columns:
+        for col in ('is_hit', 'is_out', 'is_walk', 'is_strikeout'):
 
-                # Filter to only pitches where events occurred (at-bat ending pitches)
+            df[col] = df[col].to_numpy() & pa_mask
 
-                pa_df = count_df[count_df['events'].notna() & (count_df['events'].astype(str) != 'nan') & (count_df['events'].astype(str) != '')]
-
-            else:
+        
 
-                # Fallback: use is_pa_ending flag
+        # Swing and whiff rates (these are pitch-level, so use description)
 
-                pa_df = count_df[count_df['is_pa_ending']]
+        desc_flags = _description_flags(df['description'])
 
-            
+        df['is_swing'] = (desc_flags & DESC_SWING) != 0
 
-            # Plate appearances ending at this count
+        df['is_whiff'] = (desc_flags & DESC_WHIFF) != 0
 
-            pa_ending = len(pa_df)
+        
 
-            
+        # Helper function to turn per-count totals into rate metrics
 
-            # Hits, walks, strikeouts (from at-bat ending pitches only)
+        def build_count_metrics(totals, xwoba, avg_ev, hard_hit_rate, pitch_type_counts):
 
-            hits = pa_df['is_hit'].sum() if len(pa_df) > 0 else 0
+            total_pitches = int(totals['total_pitches'])
 
-            walks = pa_df['is_walk'].sum() if len(pa_df) > 0 else 0
+            pa_ending = int(totals['pa_ending'])
 
-            strikeouts = pa_df['is_strikeout'].sum() if len(pa_df) > 0 else 0
+            hits = int(totals['hits'])
 
-            outs = pa_df['is_out'].sum() if len(pa_df) > 0 else 0
+            walks = int(totals['walks'])
 
-            
+            strikeouts = int(totals['strikeouts'])
 
-            # Swing and whiff rates
+            outs = int(totals['outs'])
 
-            swings = count_df['is_swing'].sum()
+            swings = int(totals['swings'])
 
-            whiffs = count_df['is_whiff'].sum()
+            whiffs = int(totals['whiffs'])
 
             
 
@@ -3152,19 +3288,9 @@ def api_visuals_count_performance():
 
             # At-bats = hits + outs (excludes walks, hit-by-pitch, sacrifices)
 
-            # We need to make sure we're only counting actual at-bats
-
             at_bats = hits + outs
 
-            # Only calculate if we have actual at-bats
-
-            if at_bats > 0:
-
-                batting_avg = float(hits / at_bats)
-
-            else:
-
-                batting_avg = None
+            batting_avg = float(hits / at_bats) if at_bats > 0 else None
 
             
 
@@ -3198,117 +3324,145 @@ def api_visuals_count_performance():
 
             
 
-            # xwOBA if available
-
-            xwoba = None
+            # Pitch types seen
 
-            if 'estimated_woba_using_speedangle' in count_df.columns:
+            pitch_types = {}
 
-                xwoba_values = count_df['estimated_woba_using_speedangle'].dropna()
+            total_seen = int(pitch_type_counts.sum())
 
-                if len(xwoba_values) > 0:
+            for pt, count in pitch_type_counts.items():
 
-                    xwoba = float(xwoba_values.mean())
+                if pd.notna(pt) and count > 0:
 
-            elif 'woba_value' in count_df.columns:
+                    pitch_types[str(pt)] = {
 
-                woba_values = count_df['woba_value'].dropna()
+                        'count': int(count),
 
-                if len(woba_values) > 0:
+                        'percentage': float(count / total_seen * 100) if total_seen > 0 else 0.0
 
-                    xwoba = float(woba_values.mean())
+                    }
 
             
 
-            # Average exit velocity
+            return {
 
-            avg_ev = None
+                'total_pitches': total_pitches,
 
-            if 'launch_speed' in count_df.columns:
+                'pa_ending': pa_ending,
 
-                ev_values = count_df['launch_speed'].dropna()
+                'hits': hits,
 
-                if len(ev_values) > 0:
+                'walks': walks,
 
-                    avg_ev = float(ev_values.mean())
+                'strikeouts': strikeouts,
 
-            
+                'outs': outs,
 
-            # Hard hit rate (95+ mph)
+                'at_bats': at_bats,
 
-            hard_hit_rate = None
+                'batting_avg': batting_avg,
 
-            if 'launch_speed' in count_df.columns:
+                'obp': obp,
 
-                ev_values = count_df['launch_speed'].dropna()
+                'k_rate': k_rate,
 
-                hard_hits = (ev_values >= 95).sum()
+                'bb_rate': bb_rate,
 
-                hard_hit_rate = (hard_hits / len(ev_values) * 100) if len(ev_values) > 0 else None
+                'swing_rate': swing_rate,
 
-            
+                'whiff_rate': whiff_rate,
 
-            # Pitch types seen
+                'xwoba': xwoba,
 
-            pitch_types = {}
+                'avg_ev': avg_ev,
 
-            if 'pitch_type' in count_df.columns:
+                'hard_hit_rate': hard_hit_rate,
 
-                pitch_type_counts = count_df['pitch_type'].value_counts()
+                'pitch_types_seen': pitch_types
 
-                total_seen = pitch_type_counts.sum()
+            }
 
-                for pt, count in pitch_type_counts.items():
+        
 
-                    if pd.notna(pt):
+        def mean_or_none(value_sum, value_n):
 
-                        pitch_types[str(pt)] = {
+            return float(value_sum / value_n) if value_n > 0 else None
 
-                            'count': int(count),
+        
 
-                            'percentage': float(count / total_seen * 100) if total_seen > 0 else 0.0
+        # Per-count totals in a single groupby pass
 
-                        }
+        flag_totals = {
 
-            
+            'pa_ending': 'is_pa_ending',
 
-            return {
+            'hits': 'is_hit',
 
-                'total_pitches': total_pitches,
+            'walks': 'is_walk',
 
-                'pa_ending': int(pa_ending),
+            'strikeouts': 'is_strikeout',
 
-                'hits': int(hits),
+            'outs': 'is_out',
 
-                'walks': int(walks),
+            'swings': 'is_swing',
 
-                'strikeouts': int(strikeouts),
+            'whiffs': 'is_whiff',
 
-                'outs': int(outs),
+        }
 
-                'at_bats': int(at_bats),
+        agg_spec = {name: (col, 'sum') for name, col in flag_totals.items()}
 
-                'batting_avg': batting_avg,
+        agg_spec['total_pitches'] = ('is_swing', 'size')
 
-                'obp': obp,
+        
 
-                'k_rate': k_rate,
+        # xwOBA if available, falling back to wOBA
 
-                'bb_rate': bb_rate,
+        value_col = None
 
-                'swing_rate': swing_rate,
+        if 'estimated_woba_using_speedangle' in df.columns:
 
-                'whiff_rate': whiff_rate,
+            value_col = 'estimated_woba_using_speedangle'
 
-                'xwoba': xwoba,
+        elif 'woba_value' in df.columns:
 
-                'avg_ev': avg_ev,
+            value_col = 'woba_value'
 
-                'hard_hit_rate': hard_hit_rate,
+        if value_col is not None:
 
-                'pitch_types_seen': pitch_types
+            agg_spec['xwoba_sum'] = (value_col, 'sum')
 
-            }
+            agg_spec['xwoba_n'] = (value_col, 'count')
+
+        
+
+        # Exit velocity and hard hits (95+ mph)
+
+        has_ev = 'launch_speed' in df.columns
+
+        if has_ev:
+
+            df['is_hard_hit'] = df['launch_speed'] >= 95
+
+            agg_spec['ev_sum'] = ('launch_speed', 'sum')
+
+            agg_spec['ev_n'] = ('launch_speed', 'count')
+
+            agg_spec['hard_hits'] = ('is_hard_hit', 'sum')
+
+        
+
+        totals_by_count = df.groupby('count', observed=True).agg(**agg_spec)
+
+        
+
+        has_pitch_type = 'pitch_type' in df.columns
+
+        if has_pitch_type:
+
+            # Categorical keys keep the (count, pitch_type) groupby on integer codes
+
+            pitch_type_by_count = df.groupby(['count', df['pitch_type'].astype('category')], observed=True).size()
 
         
 
@@ -3318,33 +3472,71 @@ def api_visuals_count_performance():
 
         for count in COUNT_ORDER:
 
-            count_df = df[df['count'] == count]
+            if count not in totals_by_count.index:
+
+                continue
 
-            if len(count_df) == 0:
+            totals = totals_by_count.loc[count]
+
+            if totals['total_pitches'] == 0:
 
                 continue
 
-            count_data[count] = calculate_count_metrics(count_df)
+            xwoba = mean_or_none(totals['xwoba_sum'], totals['xwoba_n']) if value_col else None
+
+            avg_ev = mean_or_none(totals['ev_sum'], totals['ev_n']) if has_ev else None
+
+            hard_hit_rate = mean_or_none(totals['hard_hits'], totals['ev_n']) if has_ev else None
+
+            if hard_hit_rate is not None:
+
+                hard_hit_rate *= 100
+
+            if has_pitch_type and count in pitch_type_by_count.index.get_level_values(0):
+
+                pt_counts = pitch_type_by_count.loc[count].sort_values(ascending=False)
+
+            else:
+
+                pt_counts = pd.Series(dtype='int64')
+
+            count_data[count] = build_count_metrics(totals, xwoba, avg_ev, hard_hit_rate, pt_counts)
 
         
 
         # Get batter handedness
 
-        batter_hand = 'R'  # Default
+        batter_hand = _batter_hand(df)
 
-        if 'stand' in df.columns:
+        
 
-            stand_values = df['stand'].dropna()
+        # Overall stats: column sums of the per-count totals, no second scan of df
 
-            if len(stand_values) > 0:
+        overall_totals = totals_by_count.sum()
 
-                batter_hand = str(stand_values.mode().iloc[0]) if len(stand_values.mode()) > 0 else 'R'
+        overall_xwoba = mean_or_none(overall_totals['xwoba_sum'], overall_totals['xwoba_n']) if value_col else None
 
-        
+        overall_ev = mean_or_none(overall_totals['ev_sum'], overall_totals['ev_n']) if has_ev else None
+
+        overall_hard_hit_rate = mean_or_none(overall_totals['hard_hits'], overall_totals['ev_n']) if has_ev else None
+
+        if overall_hard_hit_rate is not None:
+
+            overall_hard_hit_rate *= 100
+
+        if has_pitch_type:
+
+            overall_pt_counts = pitch_type_by_count.groupby(level='pitch_type', observed=True).sum()
+
+            overall_pt_counts = overall_pt_counts.sort_values(ascending=False)
 
-        # Overall stats
+        else:
+
+            overall_pt_counts = pd.Series(dtype='int64')
 
-        overall_metrics = calculate_count_metrics(df)
+        overall_metrics = build_count_metrics(overall_totals, overall_xwoba, overall_ev,
+
+                                              overall_hard_hit_rate, overall_pt_counts)
 
         
 
@@ -3366,8 +3558,6 @@ def api_visuals_count_performance():
 
     except Exception as e:
 
-        import traceback
-
         traceback.print_exc()
 
         return jsonify({"error": str(e)}), 500
@@ -3395,35 +3585,12 @@ def api_visuals_swing_decision_matrix():
 
         
 
-        season = request.args.get('season', '').strip() or None
+        season = _parse_season_arg()
 
-        if season:
 
-            try:
+        
 
-                season = int(season)
-
-            except ValueError:
-
-                season = None
-
-        
-
-        count = request.args.get('count', '').strip() or None
-
-        
-
-        # Import statcast functions
-
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
-
-        from datetime import datetime
-
-        import pandas as pd
-
-        import numpy as np
+        count = request.args.get('count', '').strip() or None
 
         
 
@@ -3461,11 +3628,19 @@ def api_visuals_swing_decision_matrix():
 
         
 
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
+
+        if pending is not None:
+
+            return pending
+
+        
+
         # Fetch statcast data
 
         try:
 
-            df = fetch_batter_statcast(batter_id, start_date, end_date)
+            df = fetch_batter_statcast(batter_id, start_date, end_date, columns=SWING_MATRIX_COLS)
 
         except Exception as e:
 
@@ -3491,69 +3666,7 @@ def api_visuals_swing_decision_matrix():
 
         if filter_by_season:
 
-            year_column = None
-
-            for col_name in ['game_year', 'year', 'Year', 'season']:
-
-                if col_name in df.columns:
-
-                    year_column = col_name
-
-                    break
-
-            
-
-            if year_column:
-
-                if not pd.api.types.is_integer_dtype(df[year_column]):
-
-                    df[year_column] = pd.to_numeric(df[year_column], errors='coerce')
-
-                df = df[
-
-                    (df[year_column].notna()) & 
-
-                    (df[year_column] == int(season))
-
-                ]
-
-            else:
-
-                date_column = None
-
-                for col_name in ['game_date', 'gameDate', 'date', 'Date', 'game_day']:
-
-                    if col_name in df.columns:
-
-                        date_column = col_name
-
-                        break
-
-                
-
-                if date_column:
-
-                    if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
-
-                        df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-
-                    
-
-                    season_start = pd.to_datetime(f"{season}-03-01")
-
-                    season_end = pd.to_datetime(f"{season}-11-30")
-
-                    
-
-                    df = df[df[date_column].notna()]
-
-                    df = df[
-
-                        (df[date_column] >= season_start) & 
-
-                        (df[date_column] <= season_end)
-
-                    ]
+            df = _filter_to_season(df, season)
 
             
 
@@ -3599,19 +3712,16 @@ def api_visuals_swing_decision_matrix():
 
             }), 200
 
-        
 
-        # Calculate swing, contact, and zone indicators
+        df = _downcast_statcast(df)
 
-        desc = df['description'].astype(str).str.lower()
-
-        df['is_swing'] = desc.isin([
+        
 
-            'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 
+        # Calculate swing, contact, and zone indicators
 
-            'missed_bunt', 'foul_bunt', 'hit_into_play'
+        desc_flags = _description_flags(df['description'])
 
-        ])
+        df['is_swing'] = (desc_flags & DESC_SWING) != 0
 
         
 
@@ -3619,49 +3729,13 @@ def api_visuals_swing_decision_matrix():
 
         
 
-        df['is_contact'] = desc.isin([
-
-            'foul', 'foul_tip', 'foul_bunt', 'hit_into_play'
-
-        ])
+        df['is_contact'] = (desc_flags & DESC_CONTACT) != 0
 
         
 
         # Determine strike zone
 
-        df['is_in_zone'] = False
-
-        if 'zone' in df.columns:
-
-            df['is_in_zone'] = df['zone'].between(1, 9, inclusive='both')
-
-            if 'plate_x' in df.columns and 'plate_z' in df.columns:
-
-                zone_na_mask = df['zone'].isna()
-
-                if zone_na_mask.any():
-
-                    df.loc[zone_na_mask, 'is_in_zone'] = (
-
-                        (df.loc[zone_na_mask, 'plate_x'].abs() <= 0.855) &
-
-                        (df.loc[zone_na_mask, 'plate_z'] >= 1.5) &
-
-                        (df.loc[zone_na_mask, 'plate_z'] <= 3.5)
-
-                    )
-
-        elif 'plate_x' in df.columns and 'plate_z' in df.columns:
-
-            df['is_in_zone'] = (
-
-                (df['plate_x'].abs() <= 0.855) &
-
-                (df['plate_z'] >= 1.5) &
-
-                (df['plate_z'] <= 3.5)
-
-            )
+        df['is_in_zone'] = _in_zone_mask(df)
 
         
 
@@ -3671,79 +3745,9 @@ def api_visuals_swing_decision_matrix():
 
         
 
-        # Assign zone numbers (1-9) based on plate_x and plate_z
-
-        def assign_zone(row):
-
-            if pd.isna(row.get('zone')):
-
-                # Estimate zone from plate_x and plate_z
-
-                if 'plate_x' not in row or 'plate_z' not in row:
-
-                    return None
-
-                if pd.isna(row['plate_x']) or pd.isna(row['plate_z']):
-
-                    return None
-
-                
-
-                x = row['plate_x']
-
-                z = row['plate_z']
-
-                
-
-                # Zone boundaries (approximate)
-
-                # Horizontal: -0.855 to 0.855 (3 zones)
-
-                # Vertical: 1.5 to 3.5 (3 zones)
-
-                if x < -0.285:  # Left column
-
-                    col = 0
-
-                elif x < 0.285:  # Middle column
-
-                    col = 1
-
-                else:  # Right column
-
-                    col = 2
-
-                
-
-                if z < 2.17:  # Bottom row
+        # Assign zone numbers (1-9), estimating from plate_x/plate_z when zone is missing
 
-                    row_num = 2
-
-                elif z < 2.83:  # Middle row
-
-                    row_num = 1
-
-                else:  # Top row
-
-                    row_num = 0
-
-                
-
-                return row_num * 3 + col + 1
-
-            else:
-
-                zone_val = row['zone']
-
-                if pd.isna(zone_val) or zone_val < 1 or zone_val > 9:
-
-                    return None
-
-                return int(zone_val)
-
-        
-
-        df['zone_num'] = df.apply(assign_zone, axis=1)
+        df['zone_num'] = _zone_numbers(df)
 
         df = df[df['zone_num'].notna()]
 
@@ -3763,263 +3767,115 @@ def api_visuals_swing_decision_matrix():
 
         
 
-        # Run expectancy matrix (simplified - approximate values)
-
-        # Based on count situation
-
-        run_expectancy = {
-
-            '0-0': 0.475, '1-0': 0.525, '0-1': 0.260,
-
-            '2-0': 0.575, '1-1': 0.350, '0-2': 0.100,
-
-            '3-0': 0.625, '2-1': 0.425, '1-2': 0.175,
-
-            '3-1': 0.550, '2-2': 0.275, '3-2': 0.300
-
-        }
-
-        
-
         # Calculate run values for each pitch
 
-        def calculate_run_value(row):
-
-            # Get count
-
-            b = int(row.get('balls', 0)) if pd.notna(row.get('balls')) else 0
-
-            s = int(row.get('strikes', 0)) if pd.notna(row.get('strikes')) else 0
-
-            count_str = f"{b}-{s}"
-
-            
-
-            base_re = run_expectancy.get(count_str, 0.35)
-
-            
-
-            # Calculate outcome value
-
-            outcome = row['description'].lower()
-
-            
-
-            # Simplified run values by outcome
-
-            if 'hit_into_play' in outcome:
-
-                # Calculate from wOBA or estimate
-
-                if 'woba_value' in row and pd.notna(row['woba_value']):
-
-                    rv = float(row['woba_value']) - base_re
-
-                elif 'estimated_woba_using_speedangle' in row and pd.notna(row['estimated_woba_using_speedangle']):
-
-                    rv = float(row['estimated_woba_using_speedangle']) - base_re
-
-                else:
-
-                    # Estimate based on outcome
-
-                    if 'single' in outcome or 'double' in outcome or 'triple' in outcome or 'home_run' in outcome:
-
-                        rv = 0.1  # Positive value for hits
-
-                    else:
-
-                        rv = -0.05  # Out
-
-                return rv
-
-            elif 'ball' in outcome:
-
-                # Walk increases run expectancy
-
-                next_b = min(3, b + 1)
-
-                if next_b == 4:
-
-                    rv = 0.3  # Walk
-
-                else:
-
-                    next_count = f"{next_b}-{s}"
-
-                    next_re = run_expectancy.get(next_count, 0.35)
-
-                    rv = next_re - base_re
-
-                return rv
-
-            elif 'called_strike' in outcome:
-
-                # Strike reduces run expectancy
-
-                next_s = min(2, s + 1)
-
-                if next_s == 3:
-
-                    rv = -0.25  # Strikeout
-
-                else:
-
-                    next_count = f"{b}-{next_s}"
-
-                    next_re = run_expectancy.get(next_count, 0.35)
-
-                    rv = next_re - base_re
-
-                return rv
-
-            elif 'swinging_strike' in outcome:
-
-                next_s = min(2, s + 1)
-
-                if next_s == 3:
-
-                    rv = -0.25  # Strikeout
-
-                else:
-
-                    next_count = f"{b}-{next_s}"
-
-                    next_re = run_expectancy.get(next_count, 0.35)
-
-                    rv = next_re - base_re
-
-                return rv
-
-            elif 'foul' in outcome:
-
-                # Foul ball with 2 strikes has no effect, otherwise reduces RE slightly
-
-                if s == 2:
-
-                    rv = 0.0  # No change
-
-                else:
-
-                    next_s = min(2, s + 1)
-
-                    next_count = f"{b}-{next_s}"
-
-                    next_re = run_expectancy.get(next_count, 0.35)
-
-                    rv = next_re - base_re
-
-                return rv
-
-            else:
-
-                return 0.0
+        df['run_value'] = _pitch_run_values(df)
 
         
 
-        df['run_value'] = df.apply(calculate_run_value, axis=1)
+        # Calculate metrics by zone in one groupby; swing/take run values are
 
-        
+        # masked to NaN so the group means skip the other decision
 
-        # Calculate metrics by zone
+        zone_stats = pd.DataFrame({
 
-        zone_data = []
+            'zone_num': df['zone_num'],
 
-        for zone_num in range(1, 10):
+            'is_swing': df['is_swing'],
 
-            zone_df = df[df['zone_num'] == zone_num]
+            'is_take': df['is_take'],
 
-            
+            'is_chase': df['is_chase'],
 
-            if len(zone_df) == 0:
+            'is_in_zone': df['is_in_zone'],
 
-                continue
+            'run_value': df['run_value'],
 
-            
+            'swing_rv': df['run_value'].where(df['is_swing']),
 
-            total_pitches = len(zone_df)
+            'take_rv': df['run_value'].where(df['is_take']),
 
-            swings = zone_df['is_swing'].sum()
+        }).groupby('zone_num').agg(
 
-            takes = zone_df['is_take'].sum()
+            total_pitches=('is_swing', 'size'),
 
-            chases = zone_df['is_chase'].sum()
+            swings=('is_swing', 'sum'),
 
-            in_zone = zone_df['is_in_zone'].sum()
+            takes=('is_take', 'sum'),
 
-            
+            chases=('is_chase', 'sum'),
 
-            swing_rate = (swings / total_pitches * 100) if total_pitches > 0 else 0.0
+            in_zone=('is_in_zone', 'sum'),
 
-            chase_rate = (chases / total_pitches * 100) if total_pitches > 0 else 0.0
+            run_value=('run_value', 'mean'),
 
-            
+            swing_rv=('swing_rv', 'mean'),
 
-            # Calculate average run value for swings and takes in this zone
+            take_rv=('take_rv', 'mean'),
 
-            swing_rv = zone_df[zone_df['is_swing']]['run_value'].mean() if swings > 0 else 0.0
+        )
 
-            take_rv = zone_df[zone_df['is_take']]['run_value'].mean() if takes > 0 else 0.0
+        zone_totals = zone_stats['total_pitches'].to_numpy()
 
-            
+        zone_swings = zone_stats['swings'].to_numpy()
 
-            # Optimal decision: swing if swing_rv > take_rv
+        zone_takes = zone_stats['takes'].to_numpy()
 
-            is_optimal_swing = swing_rv > take_rv if (swings > 0 and takes > 0) else (swing_rv > 0 if swings > 0 else True)
+        swing_rv = np.where(zone_swings > 0, zone_stats['swing_rv'].to_numpy(), 0.0)
 
-            
+        take_rv = np.where(zone_takes > 0, zone_stats['take_rv'].to_numpy(), 0.0)
 
-            # Overall run value (weighted average)
+        # Optimal decision: swing if swing_rv > take_rv
 
-            overall_rv = zone_df['run_value'].mean()
+        is_optimal_swing = np.where(
 
-            
+            (zone_swings > 0) & (zone_takes > 0), swing_rv > take_rv,
 
-            # Decision quality: how often batter makes optimal decision
+            np.where(zone_swings > 0, swing_rv > 0, True)
 
-            optimal_decisions = 0
+        )
 
-            if is_optimal_swing:
+        # Decision quality: how often batter makes optimal decision
 
-                optimal_decisions = swings
+        optimal_decisions = np.where(is_optimal_swing, zone_swings, zone_takes)
 
-            else:
+        swing_rates = zone_swings / zone_totals * 100
 
-                optimal_decisions = takes
+        chase_rates = zone_stats['chases'].to_numpy() / zone_totals * 100
 
-            
+        decision_quality = optimal_decisions / zone_totals * 100
 
-            decision_quality = (optimal_decisions / total_pitches * 100) if total_pitches > 0 else 0.0
+        zone_data = []
 
-            
+        for i, (zone_num, row) in enumerate(zone_stats.iterrows()):
 
             zone_data.append({
 
                 'zone': int(zone_num),
 
-                'total_pitches': int(total_pitches),
+                'total_pitches': int(row['total_pitches']),
 
-                'swings': int(swings),
+                'swings': int(row['swings']),
 
-                'takes': int(takes),
+                'takes': int(row['takes']),
 
-                'chases': int(chases),
+                'chases': int(row['chases']),
 
-                'in_zone': int(in_zone),
+                'in_zone': int(row['in_zone']),
 
-                'swing_rate': round(swing_rate, 1),
+                'swing_rate': round(float(swing_rates[i]), 1),
 
-                'chase_rate': round(chase_rate, 1),
+                'chase_rate': round(float(chase_rates[i]), 1),
 
-                'run_value': round(overall_rv, 4),
+                'run_value': round(float(row['run_value']), 4),
 
-                'swing_run_value': round(swing_rv, 4),
+                'swing_run_value': round(float(swing_rv[i]), 4),
 
-                'take_run_value': round(take_rv, 4),
+                'take_run_value': round(float(take_rv[i]), 4),
 
-                'is_optimal_swing': bool(is_optimal_swing),
+                'is_optimal_swing': bool(is_optimal_swing[i]),
 
-                'decision_quality': round(decision_quality, 1)
+                'decision_quality': round(float(decision_quality[i]), 1)
 
             })
 
@@ -4057,17 +3913,7 @@ def api_visuals_swing_decision_matrix():
 
         # Calculate optimal decision rate
 
-        optimal_decisions_total = 0
-
-        for zd in zone_data:
-
-            if zd['is_optimal_swing']:
-
-                optimal_decisions_total += zd['swings']
-
-            else:
-
-                optimal_decisions_total += zd['takes']
+        optimal_decisions_total = int(optimal_decisions.sum())
 
         
 
@@ -4103,19 +3949,11 @@ def api_visuals_swing_decision_matrix():
 
         # Get batter handedness
 
-        batter_hand = 'R'
-
-        if 'stand' in df.columns:
-
-            stand_values = df['stand'].dropna()
-
-            if len(stand_values) > 0:
-
-                batter_hand = str(stand_values.mode().iloc[0]) if len(stand_values.mode()) > 0 else 'R'
+        batter_hand = _batter_hand(df)
 
         
 
-        return jsonify({
+        return _json_response({
 
             'batter': batter_name,
 
@@ -4149,8 +3987,6 @@ def api_visuals_swing_decision_matrix():
 
     except Exception as e:
 
-        import traceback
-
         traceback.print_exc()
 
         return jsonify({"error": str(e)}), 500
@@ -4178,31 +4014,8 @@ def api_visuals_plate_discipline_matrix():
 
         
 
-        season = request.args.get('season', '').strip() or None
-
-        if season:
-
-            try:
-
-                season = int(season)
+        season = _parse_season_arg()
 
-            except ValueError:
-
-                season = None
-
-        
-
-        # Import statcast functions
-
-        sys.path.insert(0, str(Config.ROOT_DIR / "src"))
-
-        from scrape_savant import fetch_batter_statcast, lookup_batter_id
-
-        from datetime import datetime
-
-        import pandas as pd
-
-        import numpy as np
 
         
 
@@ -4240,99 +4053,53 @@ def api_visuals_plate_discipline_matrix():
 
         
 
-        # Fetch statcast data
+        pending = _statcast_download_pending(batter_id, start_date, end_date)
 
-        try:
+        if pending is not None:
 
-            df = fetch_batter_statcast(batter_id, start_date, end_date)
-
-        except Exception as e:
-
-            return jsonify({"error": f"Error fetching statcast data: {str(e)}"}), 500
+            return pending
 
         
 
-        if df is None or df.empty:
+        # Fetch statcast data. A single season is loaded whole; the full
 
-            return jsonify({
+        # 2008-present history is streamed in chunks and reduced to running totals.
 
-                "error": f"No statcast data found for {batter_name}",
-
-                "batter": batter_name,
-
-                "data": {}
-
-            }), 200
-
-        
-
-        # Filter by season if specified
-
-        if filter_by_season:
-
-            year_column = None
-
-            for col_name in ['game_year', 'year', 'Year', 'season']:
-
-                if col_name in df.columns:
-
-                    year_column = col_name
-
-                    break
-
-            
-
-            if year_column:
-
-                if not pd.api.types.is_integer_dtype(df[year_column]):
-
-                    df[year_column] = pd.to_numeric(df[year_column], errors='coerce')
-
-                df = df[
-
-                    (df[year_column].notna()) & 
+        try:
 
-                    (df[year_column] == int(season))
+            if filter_by_season:
 
-                ]
+                df = fetch_batter_statcast(batter_id, start_date, end_date, columns=PLATE_DISCIPLINE_COLS)
 
             else:
 
-                date_column = None
-
-                for col_name in ['game_date', 'gameDate', 'date', 'Date', 'game_day']:
-
-                    if col_name in df.columns:
-
-                        date_column = col_name
+                chunks = fetch_batter_statcast_iter(batter_id, start_date, end_date, columns=PLATE_DISCIPLINE_COLS)
 
-                        break
-
-                
+        except Exception as e:
 
-                if date_column:
+            return jsonify({"error": f"Error fetching statcast data: {str(e)}"}), 500
 
-                    if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+        
 
-                        df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+        # Filter by season if specified
 
-                    
+        if filter_by_season:
 
-                    season_start = pd.to_datetime(f"{season}-03-01")
+            if df is None or df.empty:
 
-                    season_end = pd.to_datetime(f"{season}-11-30")
+                return jsonify({
 
-                    
+                    "error": f"No statcast data found for {batter_name}",
 
-                    df = df[df[date_column].notna()]
+                    "batter": batter_name,
 
-                    df = df[
+                    "data": {}
 
-                        (df[date_column] >= season_start) & 
+                }), 200
 
-                        (df[date_column] <= season_end)
+            
 
-                    ]
+            df = _filter_to_season(df, season)
 
             
 
@@ -4348,113 +4115,117 @@ def api_visuals_plate_discipline_matrix():
 
                 }), 200
 
+            chunks = [df]
+
         
 
-        # Filter out rows without necessary data
+        # Running totals per (pitch type, in/out of zone). Pitch types are numbered
 
-        df = df.dropna(subset=['pitch_type'])
+        # in first-seen order so each chunk reduces with np.bincount on
 
-        if df.empty:
+        # pitch_type_code * 2 + out_of_zone.
 
-            return jsonify({
+        pitch_type_index = {}
 
-                "error": "No valid pitch data available",
+        partials = []
 
-                "batter": batter_name,
+        stand_counts = {}
 
-                "data": {}
+        total_rows = 0
 
-            }), 200
+        total_pitches = 0
 
-        
+        for chunk in chunks:
 
-        # Calculate swing, contact, and zone indicators
+            total_rows += len(chunk)
 
-        desc = df['description'].astype(str).str.lower()
+            
 
-        df['is_swing'] = desc.isin([
+            # Filter out rows without necessary data
 
-            'foul', 'foul_tip', 'swinging_strike', 'swinging_strike_blocked', 
+            chunk = chunk.dropna(subset=['pitch_type'])
 
-            'missed_bunt', 'foul_bunt', 'hit_into_play'
+            if chunk.empty:
 
-        ])
+                continue
 
-        
+            chunk = _downcast_statcast(chunk)
 
-        # Contact made (swing that resulted in contact, not a whiff)
+            total_pitches += len(chunk)
 
-        df['is_contact'] = desc.isin([
+            
 
-            'foul', 'foul_tip', 'foul_bunt', 'hit_into_play'
+            # Calculate swing, contact, and zone indicators
 
-        ])
+            desc_flags = _description_flags(chunk['description'])
 
-        
+            is_swing = (desc_flags & DESC_SWING) != 0
 
-        # Determine if pitch is in zone (zone 1-9 are in zone, 11-14 are outside, NaN needs plate_x/plate_z check)
+            
 
-        df['is_in_zone'] = False
+            # Contact made (swing that resulted in contact, not a whiff)
 
-        if 'zone' in df.columns:
+            is_contact = (desc_flags & DESC_CONTACT) != 0
 
-            # Zone 1-9 are in the strike zone
+            
 
-            df['is_in_zone'] = df['zone'].between(1, 9, inclusive='both')
+            # Zones 1-9 are in the strike zone; pitches without a zone use the plate_x/plate_z box
 
-            # For pitches without zone data, try to infer from plate_x and plate_z
+            is_in_zone = _in_zone_mask(chunk)
 
-            # Standard strike zone: plate_x: -0.855 to 0.855, plate_z: ~1.5 to ~3.5 (varies by batter)
+            
 
-            if 'plate_x' in df.columns and 'plate_z' in df.columns:
+            # Chase = swing on pitch outside the zone
 
-                zone_na_mask = df['zone'].isna()
+            is_chase = is_swing & ~is_in_zone
 
-                if zone_na_mask.any():
+            
 
-                    # Approximate zone boundaries (can be refined)
+            codes, uniques = pd.factorize(chunk['pitch_type'])
 
-                    df.loc[zone_na_mask, 'is_in_zone'] = (
+            remap = np.array([pitch_type_index.setdefault(pt, len(pitch_type_index)) for pt in uniques])
 
-                        (df.loc[zone_na_mask, 'plate_x'].abs() <= 0.855) &
+            key = remap[codes] * 2 + (~is_in_zone).astype(np.intp)
 
-                        (df.loc[zone_na_mask, 'plate_z'] >= 1.5) &
+            size = 2 * len(pitch_type_index)
 
-                        (df.loc[zone_na_mask, 'plate_z'] <= 3.5)
+            partials.append(np.stack([
 
-                    )
+                np.bincount(key, minlength=size),
 
-        elif 'plate_x' in df.columns and 'plate_z' in df.columns:
+                np.bincount(key, weights=is_swing, minlength=size),
 
-            # Fallback: estimate zone from plate_x and plate_z
+                np.bincount(key, weights=is_chase, minlength=size),
 
-            df['is_in_zone'] = (
+                np.bincount(key, weights=is_contact, minlength=size),
 
-                (df['plate_x'].abs() <= 0.855) &
+            ]).astype(np.int64))
 
-                (df['plate_z'] >= 1.5) &
+            
 
-                (df['plate_z'] <= 3.5)
+            # Handedness tally from the categorical codes (usually one or two hands)
 
-            )
+            if 'stand' in chunk.columns:
 
-        
+                stand = chunk['stand'].astype('category')
 
-        # Chase = swing on pitch outside the zone
+                stand_codes = stand.cat.codes.to_numpy()
 
-        df['is_chase'] = df['is_swing'] & ~df['is_in_zone']
+                hand_counts = np.bincount(stand_codes[stand_codes >= 0], minlength=len(stand.cat.categories))
 
-        
+                for hand, n in zip(stand.cat.categories, hand_counts):
 
-        # Get pitch types
+                    if n:
 
-        pitch_types = df['pitch_type'].dropna().unique()
+                        stand_counts[hand] = stand_counts.get(hand, 0) + int(n)
 
-        if len(pitch_types) == 0:
+        
+
+        if total_rows == 0:
 
             return jsonify({
 
-                "error": "No pitch type data available",
+                "error": f"No statcast data found for {batter_name}",
 
                 "batter": batter_name,
 
@@ -4464,85 +4235,79 @@ def api_visuals_plate_discipline_matrix():
 
         
 
-        # Define location zones (simplified: In Zone vs Out of Zone)
+        if total_pitches == 0:
 
-        # Could expand to 9-zone grid later
+            return jsonify({
 
-        location_zones = ['In Zone', 'Out of Zone']
+                "error": "No valid pitch data available",
 
-        
+                "batter": batter_name,
 
-        # Calculate metrics by pitch type and location
+                "data": {}
 
-        matrix_data = []
+            }), 200
 
         
 
-        for pitch_type in pitch_types:
-
-            df_pitch = df[df['pitch_type'] == pitch_type]
-
-            
-
-            for zone_type in location_zones:
+        pitch_types = list(pitch_type_index)
 
-                if zone_type == 'In Zone':
+        totals = np.zeros((4, 2 * len(pitch_types)), dtype=np.int64)
 
-                    df_zone = df_pitch[df_pitch['is_in_zone']]
+        for partial in partials:
 
-                else:
+            totals[:, :partial.shape[1]] += partial
 
-                    df_zone = df_pitch[~df_pitch['is_in_zone']]
+        
 
-                
+        # Define location zones (simplified: In Zone vs Out of Zone)
 
-                if len(df_zone) == 0:
+        # Could expand to 9-zone grid later
 
-                    continue
+        location_zones = ['In Zone', 'Out of Zone']
 
-                
+        
 
-                total_pitches = len(df_zone)
+        # Pitch types keep first-seen order and In Zone comes before Out of Zone
 
-                swings = df_zone['is_swing'].sum()
+        agg = pd.DataFrame({
 
-                chases = df_zone['is_chase'].sum()
+            'pitch_type': np.repeat([str(pt) for pt in pitch_types], 2),
 
-                contacts = df_zone['is_contact'].sum()
+            'location': np.tile(location_zones, len(pitch_types)),
 
-                
+            'total_pitches': totals[0],
 
-                # Calculate rates
+            'swings': totals[1],
 
-                swing_rate = (swings / total_pitches * 100) if total_pitches > 0 else 0.0
+            'chases': totals[2],
 
-                chase_rate = (chases / total_pitches * 100) if total_pitches > 0 else 0.0
+            'contacts': totals[3],
 
-                contact_rate = (contacts / swings * 100) if swings > 0 else None
+        })
 
-                
+        agg = agg[agg['total_pitches'] > 0]
 
-                matrix_data.append({
+        
 
-                    'pitch_type': str(pitch_type),
+        # Calculate rates
 
-                    'location': zone_type,
+        agg['swing_rate'] = (agg['swings'] / agg['total_pitches'] * 100).round(1)
 
-                    'total_pitches': int(total_pitches),
+        agg['chase_rate'] = (agg['chases'] / agg['total_pitches'] * 100).round(1)
 
-                    'swings': int(swings),
+        contact_rate = (agg['contacts'] / agg['swings'].where(agg['swings'] > 0) * 100).round(1)
 
-                    'chases': int(chases),
+        agg['contact_rate'] = contact_rate.astype(object).where(agg['swings'] > 0, None)
 
-                    'contacts': int(contacts),
+        
 
-                    'swing_rate': round(swing_rate, 1),
+        matrix_data = agg[[
 
-                    'chase_rate': round(chase_rate, 1),
+            'pitch_type', 'location', 'total_pitches', 'swings', 'chases', 'contacts',
 
-                    'contact_rate': round(contact_rate, 1) if contact_rate is not None else None
+            'swing_rate', 'chase_rate', 'contact_rate'
 
-                })
+        ]].to_dict('records')
 
         
 
@@ -4560,21 +4325,17 @@ def api_visuals_plate_discipline_matrix():
 
         
 
-        # Get batter handedness
+        # Get batter handedness (ties go to the alphabetically first hand)
 
         batter_hand = 'R'  # Default
 
-        if 'stand' in df.columns:
+        if stand_counts:
 
-            stand_values = df['stand'].dropna()
-
-            if len(stand_values) > 0:
-
-                batter_hand = str(stand_values.mode().iloc[0]) if len(stand_values.mode()) > 0 else 'R'
+            batter_hand = str(max(sorted(stand_counts), key=stand_counts.get))
 
         
 
-        return jsonify({
+        return _json_response({
 
             'batter': batter_name,
 
@@ -4582,7 +4343,7 @@ def api_visuals_plate_discipline_matrix():
 
             'season': season,
 
-            'total_pitches': len(df),
+            'total_pitches': total_pitches,
 
             'matrix': matrix_data,
 
@@ -4594,8 +4355,6 @@ def api_visuals_plate_discipline_matrix():
 
     except Exception as e:
 
-        import traceback
-
         traceback.print_exc()
 
         return jsonify({"error": str(e)}), 500
@@ -4605,7 +4364,6 @@ def api_visuals_plate_discipline_matrix():
 def api_pitcher_seasons(pitcher_name):
     """Get available seasons for a specific pitcher"""
     try:
-        from urllib.parse import unquote
         pitcher_name = unquote(pitcher_name)
         
         # Use CSV seasons endpoint logic
@@ -4631,7 +4389,6 @@ def api_pitcher_seasons(pitcher_name):
                 pass
         
         # Fallback: return common seasons
-        from datetime import datetime
         current_year = datetime.now().year
         seasons = [str(year) for year in range(2015, current_year + 1)]
         
@@ -2,14 +2,23 @@
 Authentication routes
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, abort
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.middleware.auth import get_request_db
 from app.middleware.csrf import validate_csrf, generate_csrf_token
 from app.utils.validators import validate_auth_form_fields
 from app.utils.helpers import clean_str, get_safe_redirect
+from app.utils.passwords import hash_password, verify_password, needs_rehash
+from app.utils.request_cache import invalidate_admin_user_rows
+from app.services.email_service import EmailService
 import sys
+import logging
+import queue
+import secrets
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 try:
@@ -18,11 +27,33 @@ except ImportError:
     PlayerDB = None
 
 bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
 
-# Rate limiting for resend verification (3 requests per hour per email)
-_resend_verification_attempts = defaultdict(list)
+class InviteCodeUnavailable(Exception):
+    """Raised inside the register transaction when the invite was redeemed concurrently"""
+
+# Password-hash upgrades are written here after sign-in; login never waits on them
+_REHASH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rehash")
+
+def _rehash_password(user_id: int, password: str) -> None:
+    """Store a current hash for user_id; failures are logged, never raised"""
+    try:
+        db = PlayerDB()
+        try:
+            db.update_user_password(user_id, hash_password(password))
+        finally:
+            db.close()
+    except Exception as exc:
+        logger.warning(f"Password rehash failed for user {user_id}: {exc}")
+
+# Rate limiting for resend verification (3 requests per hour per email).
+# Emails are kept in least-recently-seen order and the table is capped, so
+# a flood of distinct addresses cannot grow it without bound.
+_resend_verification_attempts: "OrderedDict[str, deque]" = OrderedDict()
+_resend_verification_lock = threading.Lock()
 _RESEND_VERIFICATION_LIMIT = 3
 _RESEND_VERIFICATION_WINDOW = timedelta(hours=1)
+_RESEND_VERIFICATION_MAX_EMAILS = 10_000
 
 def _check_resend_rate_limit(email: str) -> tuple[bool, str]:
     """Check if email has exceeded rate limit for resend verification.
@@ -30,24 +61,47 @@ def _check_resend_rate_limit(email: str) -> tuple[bool, str]:
     now = datetime.now()
     email_lower = email.lower()
     
-    # Clean old attempts outside the window
-    _resend_verification_attempts[email_lower] = [
-        attempt_time for attempt_time in _resend_verification_attempts[email_lower]
-        if now - attempt_time < _RESEND_VERIFICATION_WINDOW
-    ]
-    
-    # Check if limit exceeded
-    if len(_resend_verification_attempts[email_lower]) >= _RESEND_VERIFICATION_LIMIT:
-        oldest_attempt = min(_resend_verification_attempts[email_lower])
-        time_until_reset = _RESEND_VERIFICATION_WINDOW - (now - oldest_attempt)
-        minutes_left = int(time_until_reset.total_seconds() / 60) + 1
-        return False, f"Too many verification email requests. Please wait {minutes_left} minute(s) before requesting again."
-    
-    # Record this attempt
-    _resend_verification_attempts[email_lower].append(now)
+    with _resend_verification_lock:
+        attempts = _resend_verification_attempts.get(email_lower)
+        if attempts is None:
+            attempts = _resend_verification_attempts[email_lower] = deque()
+        else:
+            _resend_verification_attempts.move_to_end(email_lower)
+        
+        # Clean old attempts outside the window (oldest first)
+        while attempts and now - attempts[0] >= _RESEND_VERIFICATION_WINDOW:
+            attempts.popleft()
+        
+        # Check if limit exceeded
+        if len(attempts) >= _RESEND_VERIFICATION_LIMIT:
+            time_until_reset = _RESEND_VERIFICATION_WINDOW - (now - attempts[0])
+            minutes_left = int(time_until_reset.total_seconds() / 60) + 1
+            return False, f"Too many verification email requests. Please wait {minutes_left} minute(s) before requesting again."
+        
+        # Record this attempt
+        attempts.append(now)
+        
+        # Forget the least recently seen emails once the table is full
+        while len(_resend_verification_attempts) > _RESEND_VERIFICATION_MAX_EMAILS:
+            _resend_verification_attempts.popitem(last=False)
     return True, ""
 
 
+# Expired/used verification tokens are purged at most once an hour per worker
+# instead of on every verification request
+_TOKEN_CLEANUP_INTERVAL = timedelta(hours=1)
+_last_token_cleanup: Optional[datetime] = None
+
+def _cleanup_expired_tokens(db) -> None:
+    """Delete expired verification tokens if the last purge is older than the interval."""
+    global _last_token_cleanup
+    now = datetime.now()
+    if _last_token_cleanup is not None and now - _last_token_cleanup < _TOKEN_CLEANUP_INTERVAL:
+        return
+    _last_token_cleanup = now
+    db.delete_expired_tokens()
+
+
 @bp.route('/login', methods=['GET', 'POST'])
 def login():
     """User login"""
@@ -73,9 +127,6 @@ def login():
     try:
         # Use threading timeout for cross-platform compatibility
         # This prevents the login from hanging indefinitely if database connection times out
-        import threading
-        import queue
-        
         result_queue = queue.Queue()
         error_queue = queue.Queue()
         
@@ -96,8 +147,6 @@ def login():
         
         if db_thread.is_alive():
             # Thread is still running, operation timed out
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Login timeout for email: {email}")
             flash("Database connection timed out. Please try again in a moment.", "error")
             return redirect(url_for('auth.login'))
@@ -112,7 +161,8 @@ def login():
         else:
             user = result_queue.get()
         
-        if not user or not check_password_hash(user.get("password_hash", ""), password):
+        stored_hash = user.get("password_hash", "") if user else ""
+        if not user or not verify_password(stored_hash, password):
             flash("Invalid email or password.", "error")
             return redirect(url_for('auth.login', next=request.form.get('next')))
         
@@ -129,7 +179,12 @@ def login():
                 flash("Please verify your email address before signing in. Check your inbox for the verification link.", "warning")
                 return redirect(url_for('auth.verify_email_pending', email=email))
         
-        # Set session
+        # Upgrade legacy (werkzeug) or outdated argon2 hashes now that we have the
+        # plaintext. The hash and write run on _REHASH_EXECUTOR; sign-in does not wait
+        if needs_rehash(stored_hash):
+            _REHASH_EXECUTOR.submit(_rehash_password, user['id'], password)
+        
+        # Set session (rotate the CSRF token on privilege change)
         session.pop('csrf_token', None)
         session['user_id'] = user['id']
         session['first_name'] = user.get('first_name', '')
@@ -145,8 +200,6 @@ def login():
             return redirect(get_safe_redirect("home"))
     
     except Exception as exc:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Login error: {exc}", exc_info=True)
         # Check if it's a connection/timeout error
         error_msg = str(exc).lower()
@@ -191,52 +244,53 @@ def register():
         return redirect(url_for('auth.register'))
     
     try:
-        db = PlayerDB()
-        
-        # Check if invite code is valid
-        invite = db.get_invite_code(invite_code)
-        if not invite:
-            flash("Invalid invite code. Please check and try again.", "error")
-            db.close()
-            return redirect(url_for('auth.register', next=request.form.get('next')))
-        
-        if not invite.get("is_active") or invite.get("used_at"):
-            flash("This invite code has already been used or is no longer active.", "error")
-            db.close()
-            return redirect(url_for('auth.register', next=request.form.get('next')))
-        
-        existing = db.get_user_by_email(email)
-        if existing:
-            flash("An account with that email already exists. Please sign in.", "error")
-            db.close()
-            return redirect(url_for('auth.login'))
-        
-        # Check if email is from sequencebiolab.com domain - auto-admin
-        # Security: Use exact domain match (email is already lowercased)
-        ADMIN_DOMAIN = '@sequencebiolab.com'
-        is_admin = email.endswith(ADMIN_DOMAIN) and email.count('@') == 1
-        
-        # Auto-verify email for admin accounts since they're trusted
-        email_verified = is_admin
-        
-        password_hash = generate_password_hash(password)
-        user_id = db.create_user(email, password_hash, first_name, last_name, is_admin=is_admin, email_verified=email_verified)
+        db = get_request_db()
+        
+        # Hash before taking the write lock; it is the slow step
+        password_hash = hash_password(password)
+        
+        # Invite check, user creation and invite redemption commit together, so a
+        # code can't be redeemed twice and a failure leaves no half-created account
+        with db.transaction():
+            # Check if invite code is valid
+            invite = db.get_invite_code(invite_code)
+            if not invite:
+                flash("Invalid invite code. Please check and try again.", "error")
+                return redirect(url_for('auth.register', next=request.form.get('next')))
+            
+            if not invite.get("is_active") or invite.get("used_at"):
+                flash("This invite code has already been used or is no longer active.", "error")
+                return redirect(url_for('auth.register', next=request.form.get('next')))
+            
+            existing = db.get_user_by_email(email)
+            if existing:
+                flash("An account with that email already exists. Please sign in.", "error")
+                return redirect(url_for('auth.login'))
+            
+            # Check if email is from sequencebiolab.com domain - auto-admin
+            # Security: Use exact domain match (email is already lowercased)
+            ADMIN_DOMAIN = '@sequencebiolab.com'
+            is_admin = email.endswith(ADMIN_DOMAIN) and email.count('@') == 1
+            
+            # Auto-verify email for admin accounts since they're trusted
+            email_verified = is_admin
+            
+            user_id = db.create_user(email, password_hash, first_name, last_name, is_admin=is_admin, email_verified=email_verified)
+            
+            # Mark invite code as used; a concurrent sign-up may have redeemed it
+            # since the check above, in which case the whole block rolls back
+            if not db.use_invite_code(invite_code, user_id):
+                raise InviteCodeUnavailable(invite_code)
+            
+            # Generate verification token (only needed for non-admin accounts)
+            verification_token = secrets.token_urlsafe(32)
+            db.create_verification_token(user_id, verification_token, expires_in_hours=24)
+        invalidate_admin_user_rows()
         
         # Log admin account creation for audit purposes
         if is_admin:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.info(f"Admin account auto-created: {email} (user_id: {user_id})")
         
-        # Mark invite code as used
-        db.use_invite_code(invite_code, user_id)
-        
-        # Generate verification token (only needed for non-admin accounts)
-        import secrets
-        from app.services.email_service import EmailService
-        verification_token = secrets.token_urlsafe(32)
-        db.create_verification_token(user_id, verification_token, expires_in_hours=24)
-        
         # Send verification email (skip for admin accounts)
         base_url = request.host_url.rstrip('/')
         email_sent = True
@@ -248,8 +302,7 @@ def register():
                 base_url
             )
         
-        db.delete_expired_tokens()  # Cleanup old tokens
-        db.close()
+        _cleanup_expired_tokens(db)
         
         # Redirect based on account type
         if is_admin:
@@ -261,9 +314,10 @@ def register():
             flash("Account created! However, we couldn't send the verification email. Please use the resend button below or contact support.", "warning")
         return redirect(url_for('auth.verify_email_pending', email=email))
     
+    except InviteCodeUnavailable:
+        flash("This invite code has already been used or is no longer active.", "error")
+        return redirect(url_for('auth.register', next=request.form.get('next')))
     except Exception as exc:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Registration error: {exc}", exc_info=True)
         flash(f"Could not create account: {exc}", "error")
         return redirect(url_for('auth.register'))
@@ -277,8 +331,8 @@ def logout():
     
     for key in ("user_id", "first_name", "last_name", "is_admin"):
         session.pop(key, None)
+    # Drop the token; the next rendered form issues a fresh one
     session.pop('csrf_token', None)
-    generate_csrf_token()
     
     flash("You have been logged out.", "info")
     return redirect(url_for('pages.home'))
@@ -298,12 +352,11 @@ def verify_email():
         return redirect(url_for('auth.login'))
     
     try:
-        db = PlayerDB()
+        db = get_request_db()
         token_record = db.get_verification_token(token)
         
         if not token_record:
             flash("Invalid or expired verification link. Please request a new one.", "error")
-            db.close()
             return redirect(url_for('auth.login'))
         
         user_id = token_record['user_id']
@@ -311,15 +364,13 @@ def verify_email():
         # Mark email as verified
         db.mark_email_verified(user_id)
         db.mark_token_used(token_record['id'])
-        db.delete_expired_tokens()  # Cleanup
-        db.close()
+        invalidate_admin_user_rows()
+        _cleanup_expired_tokens(db)
         
         flash("Email verified successfully! You can now sign in.", "success")
         return redirect(url_for('auth.login'))
         
     except Exception as exc:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Email verification error: {exc}", exc_info=True)
         flash("An error occurred during verification. Please try again.", "error")
         return redirect(url_for('auth.login'))
@@ -328,7 +379,6 @@ def verify_email():
 @bp.route('/verify-email-pending', methods=['GET'])
 def verify_email_pending():
     """Show pending verification page"""
-    from app.middleware.csrf import generate_csrf_token
     email = request.args.get('email', '')
     return render_template('verify_email_pending.html', email=email, csrf_token=generate_csrf_token())
 
@@ -357,22 +407,18 @@ def resend_verification():
         return redirect(url_for('auth.verify_email_pending', email=email))
     
     try:
-        db = PlayerDB()
+        db = get_request_db()
         user = db.get_user_by_email(email)
         
         if not user:
             flash("No account found with that email.", "error")
-            db.close()
             return redirect(url_for('auth.verify_email_pending', email=email))
         
         if user.get('email_verified'):
             flash("This email is already verified. You can sign in.", "info")
-            db.close()
             return redirect(url_for('auth.login'))
         
         # Generate new token
-        import secrets
-        from app.services.email_service import EmailService
         verification_token = secrets.token_urlsafe(32)
         db.create_verification_token(user['id'], verification_token, expires_in_hours=24)
         
@@ -385,8 +431,7 @@ def resend_verification():
             base_url
         )
         
-        db.delete_expired_tokens()  # Cleanup
-        db.close()
+        _cleanup_expired_tokens(db)
         
         if email_sent:
             flash("Verification email sent! Please check your inbox.", "success")
@@ -395,8 +440,6 @@ def resend_verification():
         return redirect(url_for('auth.verify_email_pending', email=email))
         
     except Exception as exc:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Resend verification error: {exc}", exc_info=True)
         flash("An error occurred. Please try again.", "error")
         return redirect(url_for('auth.verify_email_pending', email=email))
@@ -1,18 +1,23 @@
 """
 Page routes
 """
-from flask import Blueprint, render_template, request, session, g, redirect, url_for
-from datetime import datetime, timedelta
-from urllib.parse import quote_plus
-from typing import Optional, List, Dict, Any
+from flask import Blueprint, current_app, render_template, request, session, g, redirect, url_for
+from datetime import datetime, timedelta, date
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from urllib.parse import urlencode
+from functools import lru_cache, partial
+from typing import Optional, List, Dict, Any, NamedTuple
 from pathlib import Path
 import sys
 
-from app.middleware.auth import login_required, admin_required
+from app.middleware.auth import login_required, admin_required, get_request_db
 from app.config import Config
 from app.services.page_service import (
     build_player_home_context,
     load_full_season_schedule,
+    load_season_months,
     purge_concluded_series_documents,
     schedule_auto_reports,
     collect_recent_reports,
@@ -25,25 +30,38 @@ from app.services.analytics_service import (
     collect_standings_data
 )
 from app.services.schedule_service import team_abbr_from_id
+from app.services.live_scores_service import get_games_for_date
+from app.services.box_score_service import get_box_score
 from app.services.player_service import determine_user_team
 from app.utils.helpers import sanitize_filename_component, clean_str
+from app.utils.request_cache import get_admin_user_rows, get_admin_users_by_id, invalidate_admin_user_rows
 from app.utils.formatters import (
     normalize_journal_visibility,
     prepare_journal_timeline,
     augment_journal_entry,
-    format_journal_date
+    find_timeline_entry,
+    format_journal_date,
+    format_timestamp_human
+)
+from app.middleware.csrf import validate_csrf
+from app.constants import (
+    DIVISION_OPTIONS,
+    LEAGUE_OPTIONS,
+    JOURNAL_VISIBILITY_OPTIONS,
+    MAX_JOURNAL_TIMELINE_ENTRIES,
+    COMMON_TIMEZONES
 )
-from app.middleware.csrf import generate_csrf_token, validate_csrf
-from app.constants import DIVISION_OPTIONS, LEAGUE_OPTIONS, JOURNAL_VISIBILITY_OPTIONS, MAX_JOURNAL_TIMELINE_ENTRIES
-from app.config import Config
 from flask import flash, abort
-from werkzeug.security import check_password_hash, generate_password_hash
+from app.utils.passwords import hash_password, verify_password
 from werkzeug.utils import secure_filename
 import json
+import logging
+import re
 import uuid
 from app.utils.validators import detect_image_type
 
 bp = Blueprint('pages', __name__)
+logger = logging.getLogger(__name__)
 
 # Import PlayerDB if available
 try:
@@ -52,55 +70,162 @@ try:
 except ImportError:
     PlayerDB = None
 
+# ciso8601 is an optional C parser for the schedule loops; fromisoformat is the fallback
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    _parse_iso_datetime = datetime.fromisoformat
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+# Embedded app URLs; {query} is an urlencode()d query string
+MOCAP_ADMIN_URL = "https://cooper-710.github.io/motion-webapp/?{query}"
+MOCAP_PLAYER_URL = "https://motion-webapp.pages.dev/?{query}&lock=1"
+PITCHVIZ_URL = "https://cooper-710.github.io/NEWPV-main_with_orbit/?{query}"
+
+# Journal entry dates must be zero-padded YYYY-MM-DD
+ISO_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Avatar uploads are copied to disk in chunks of this size
+AVATAR_COPY_CHUNK_SIZE = 64 * 1024
+
+# Replaced avatars are deleted off the request thread
+_AVATAR_CLEANUP_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="avatar-cleanup")
+
+# Free-text fields on the profile settings "basic-info" form
+PROFILE_TEXT_FIELDS = ("first_name", "last_name", "pronouns", "job_title", "phone", "timezone", "bio")
+
+# journaling.html defaults shared by the player and admin views, which
+# copy it and override what differs
+JOURNAL_BASE_CONTEXT = {
+    "journal_visibility_options": JOURNAL_VISIBILITY_OPTIONS,
+    "entry_errors": (),
+    "just_saved": False,
+    "is_admin_view": False,
+}
+
+
+def _remove_old_avatar(path: Path) -> None:
+    """Best-effort delete of a replaced avatar file."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        logger.warning(f"Warning: unable to remove old avatar {path}: {exc}")
+
+
+def _format_user_label(record: Optional[Dict[str, Any]]) -> str:
+    """Display name for the admin user selectors."""
+    if not record:
+        return "Unknown User"
+    first = (record.get("first_name") or "").strip()
+    last = (record.get("last_name") or "").strip()
+    full_name = f"{first} {last}".strip()
+    if full_name:
+        return full_name
+    email = (record.get("email") or "").strip()
+    if email:
+        return email
+    return f"User #{record.get('id')}"
+
+
+class UserOption(NamedTuple):
+    """One entry in an admin user selector."""
+    id: int
+    label: str
+
+
+def _user_options(rows: List[Dict[str, Any]]) -> List[UserOption]:
+    """Selector options for user rows, in row order."""
+    return [UserOption(row["id"], _format_user_label(row)) for row in rows]
+
+
+def _group_games_into_series(raw_games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group games into series (consecutive games against the same opponent, no gap over a day)."""
+    series_groups = []
+    current_series = None
+    last_opponent_id = None
+    last_day = None
+    
+    # Parse each game's date once and sort on that prepared key. The raw
+    # date string breaks ties so doubleheaders keep their time order.
+    dated_games = []
+    for game in raw_games:
+        date_str = game.get("game_date") or game.get("game_date_iso") or game.get("date")
+        if not date_str:
+            continue
+            
+        try:
+            if isinstance(date_str, str):
+                game_date = date.fromisoformat(date_str[:10])
+            else:
+                game_date = date_str if isinstance(date_str, date) else datetime.combine(date_str, datetime.min.time()).date()
+        except Exception:
+            continue
+        
+        # Day number, so the gap check is an int subtraction rather than a timedelta
+        day = game_date.toordinal()
+        dated_games.append(((day, date_str if isinstance(date_str, str) else ""), game_date, game))
+    
+    dated_games.sort(key=itemgetter(0))
+    
+    for (day, _), game_date, game in dated_games:
+        opponent_id = game.get("opponent_id")
+        
+        # Start new series if opponent changes or gap > 1 day
+        if (last_opponent_id is not None and 
+            (opponent_id != last_opponent_id or 
+             (last_day is not None and day - last_day > 1))):
+            if current_series:
+                series_groups.append(current_series)
+            current_series = None
+        
+        if not current_series:
+            current_series = {
+                "opponent_id": opponent_id,
+                "opponent_name": game.get("opponent_name") or game.get("opponent"),
+                "opponent_abbr": game.get("opponent_abbr"),
+                "games": [],
+                "start_date": game_date,
+                "end_date": game_date,
+            }
+        
+        current_series["games"].append(game)
+        if game_date > current_series["end_date"]:
+            current_series["end_date"] = game_date
+        last_opponent_id = opponent_id
+        last_day = day
+    
+    if current_series:
+        series_groups.append(current_series)
+    
+    # Games were walked in date order, so series are already sorted by start date
+    return series_groups
+
 
 @bp.route('/')
 def home():
     """Landing/home page"""
     viewer_user = getattr(g, "user", None)
     target_user = viewer_user
-    admin_user_options: List[Dict[str, Any]] = []
+    admin_user_options: List[UserOption] = []
     requested_user_id = request.args.get("user_id", type=int)
 
-    def _format_user_label(record: Optional[Dict[str, Any]]) -> str:
-        if not record:
-            return "Unknown User"
-        first = (record.get("first_name") or "").strip()
-        last = (record.get("last_name") or "").strip()
-        full_name = f"{first} {last}".strip()
-        if full_name:
-            return full_name
-        email = (record.get("email") or "").strip()
-        if email:
-            return email
-        return f"User #{record.get('id')}"
-
     if session.get("is_admin") and PlayerDB:
         user_rows: List[Dict[str, Any]] = []
-        db = None
         try:
-            db = PlayerDB()
-            user_rows = db.list_users()
+            user_rows = get_admin_user_rows()
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning fetching users for admin home selector: {exc}")
-        finally:
-            try:
-                if db:
-                    db.close()
-            except Exception:
-                pass
 
-        admin_user_options = [
-            {"id": row["id"], "label": _format_user_label(row)}
-            for row in user_rows
-        ]
+        admin_user_options = _user_options(user_rows)
 
-        if requested_user_id:
-            for row in user_rows:
-                if row["id"] == requested_user_id:
-                    target_user = row
-                    break
+        if requested_user_id and user_rows:
+            target_user = get_admin_users_by_id().get(requested_user_id, target_user)
 
     context = build_player_home_context(target_user)
     context["admin_user_options"] = admin_user_options
@@ -118,49 +243,20 @@ def schedule():
         return redirect(url_for('auth.login'))
     
     target_user = viewer_user
-    admin_user_options: List[Dict[str, Any]] = []
+    admin_user_options: List[UserOption] = []
     requested_user_id = request.args.get("user_id", type=int)
     
-    def _format_user_label(record: Optional[Dict[str, Any]]) -> str:
-        if not record:
-            return "Unknown User"
-        first = (record.get("first_name") or "").strip()
-        last = (record.get("last_name") or "").strip()
-        full_name = f"{first} {last}".strip()
-        if full_name:
-            return full_name
-        email = (record.get("email") or "").strip()
-        if email:
-            return email
-        return f"User #{record.get('id')}"
-    
     if session.get("is_admin") and PlayerDB:
         user_rows: List[Dict[str, Any]] = []
-        db = None
         try:
-            db = PlayerDB()
-            user_rows = db.list_users()
+            user_rows = get_admin_user_rows()
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning fetching users for admin schedule selector: {exc}")
-        finally:
-            try:
-                if db:
-                    db.close()
-            except Exception:
-                pass
         
-        admin_user_options = [
-            {"id": row["id"], "label": _format_user_label(row)}
-            for row in user_rows
-        ]
+        admin_user_options = _user_options(user_rows)
         
-        if requested_user_id:
-            for row in user_rows:
-                if row["id"] == requested_user_id:
-                    target_user = row
-                    break
+        if requested_user_id and user_rows:
+            target_user = get_admin_users_by_id().get(requested_user_id, target_user)
     
     # Get month/year from query params, default to current month
     month = request.args.get('month', type=int)
@@ -171,12 +267,15 @@ def schedule():
         month = now.month
         year = now.year
     
+    # Previous/next month via a month index (year * 12 + month - 1)
+    prev_year, prev_month = divmod(year * 12 + month - 2, 12)
+    next_year, next_month = divmod(year * 12 + month, 12)
+    prev_month += 1
+    next_month += 1
+    
     # Calculate date range for the month
-    start_date = datetime(year, month, 1).date()
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1).date() - timedelta(days=1)
-    else:
-        end_date = datetime(year, month + 1, 1).date() - timedelta(days=1)
+    start_date = date(year, month, 1)
+    end_date = date(next_year, next_month, 1) - timedelta(days=1)
     
     # Load games for this month using target_user (selected user for admin)
     games = load_full_season_schedule(
@@ -191,78 +290,54 @@ def schedule():
         game_date = game.get("game_date")
         if game_date:
             try:
-                dt = datetime.fromisoformat(game_date)
-                date_key = dt.strftime("%Y-%m-%d")
-                if date_key not in games_by_date:
-                    games_by_date[date_key] = {
+                dt = _parse_iso_datetime(game_date)
+                # game_date is ISO text, so its first 10 chars are the YYYY-MM-DD key
+                date_key = game_date[:10]
+                day_entry = games_by_date.get(date_key)
+                if day_entry is None:
+                    day_entry = games_by_date[date_key] = {
                         "date_obj": dt,
                         "day_name": dt.strftime("%A"),
                         "date_formatted": dt.strftime("%B %d, %Y"),
                         "games": []
                     }
                 
-                # Format game time if available
-                formatted_game = dict(game)
+                # Format game time if available (load_full_season_schedule returns fresh dicts)
                 if game.get("game_datetime"):
                     try:
-                        game_dt = datetime.fromisoformat(game["game_datetime"].replace('Z', '+00:00'))
-                        formatted_game["time_formatted"] = game_dt.strftime("%I:%M %p")
+                        game_dt = _parse_iso_datetime(game["game_datetime"])
+                        # Same as strftime("%I:%M %p") without the per-game strftime call
+                        game["time_formatted"] = (
+                            f"{(game_dt.hour - 1) % 12 + 1:02}:{game_dt.minute:02} "
+                            f"{'AM' if game_dt.hour < 12 else 'PM'}"
+                        )
                     except Exception:
-                        formatted_game["time_formatted"] = "TBD"
+                        game["time_formatted"] = "TBD"
                 else:
-                    formatted_game["time_formatted"] = "TBD"
+                    game["time_formatted"] = "TBD"
                 
-                games_by_date[date_key]["games"].append(formatted_game)
+                day_entry["games"].append(game)
             except Exception:
                 continue
     
-    # Calculate previous/next month
-    if month == 1:
-        prev_month = 12
-        prev_year = year - 1
-    else:
-        prev_month = month - 1
-        prev_year = year
-    
-    if month == 12:
-        next_month = 1
-        next_year = year + 1
-    else:
-        next_month = month + 1
-        next_year = year
-    
     # Get all months with games for quick navigation
-    all_games = load_full_season_schedule(target_user)
-    months_with_games = set()
-    for game in all_games:
-        game_date = game.get("game_date")
-        if game_date:
-            try:
-                dt = datetime.fromisoformat(game_date)
-                months_with_games.add((dt.year, dt.month))
-            except Exception:
-                continue
+    months_with_games = load_season_months(target_user)
     
     # Add current month if no games found (so user can still navigate)
     months_with_games.add((year, month))
     
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    
     return render_template(
         'schedule.html',
         games_by_date=games_by_date,
         current_month=month,
         current_year=year,
-        month_name=month_names[month - 1],
+        month_name=MONTH_NAMES[month - 1],
         prev_month=prev_month,
         prev_year=prev_year,
         next_month=next_month,
         next_year=next_year,
         months_with_games=months_with_games,
-        month_names=month_names,
+        month_names=MONTH_NAMES,
         admin_user_options=admin_user_options,
         selected_user_id=(target_user.get("id") if target_user else None)
     )
@@ -276,7 +351,6 @@ def live_scores():
     if not viewer_user:
         return redirect(url_for('auth.login'))
     
-    from app.services.live_scores_service import get_games_for_date
     
     # Get date from query parameter, default to today
     date_str = request.args.get('date')
@@ -292,8 +366,6 @@ def live_scores():
     try:
         games = get_games_for_date(target_date)
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"Error fetching live scores: {e}")
         games = []
     
@@ -335,8 +407,6 @@ def box_score(game_pk):
     if not viewer_user:
         return redirect(url_for('auth.login'))
     
-    from app.services.box_score_service import get_box_score
-    from app.services.schedule_service import team_abbr_from_id
     
     try:
         box_score_data = get_box_score(game_pk)
@@ -352,18 +422,17 @@ def box_score(game_pk):
         box_score_data['away_abbr'] = away_abbr
         box_score_data['home_abbr'] = home_abbr
         
-        # Format inning scores
-        innings_list = []
-        away_innings = []
-        home_innings = []
-        
-        innings_data = box_score_data.get('innings', [])
-        
-        # Sort innings by number
-        sorted_innings = sorted(innings_data, key=lambda x: x.get('num', 0))
+        # Format inning scores: one slot per inning, at least 9 (more for extra innings)
+        innings_data = [
+            inning for inning in box_score_data.get('innings', [])
+            if isinstance(inning.get('num'), int) and inning['num'] > 0
+        ]
+        max_inning = max([9] + [inning['num'] for inning in innings_data])
+        innings_list = list(range(1, max_inning + 1))
+        away_innings = [0] * max_inning
+        home_innings = [0] * max_inning
         
-        for inning in sorted_innings:
-            inning_num = inning.get('num', 0)
+        for inning in innings_data:
             away_runs = inning.get('away', {}).get('runs', 0) or 0
             home_runs = inning.get('home', {}).get('runs', 0) or 0
             
@@ -375,27 +444,8 @@ def box_score(game_pk):
                 away_runs = 0
                 home_runs = 0
             
-            away_innings.append(away_runs if away_runs > 0 else 0)
-            home_innings.append(home_runs if home_runs > 0 else 0)
-            innings_list.append(inning_num)
-        
-        # Ensure we show at least 9 innings (or more for extra innings)
-        max_inning = max(innings_list) if innings_list else 9
-        if max_inning < 9:
-            max_inning = 9
-        
-        # Fill in missing innings with 0's
-        for i in range(1, max_inning + 1):
-            if i not in innings_list:
-                innings_list.append(i)
-                away_innings.append(0)
-                home_innings.append(0)
-        
-        # Sort again to ensure proper order
-        sorted_data = sorted(zip(innings_list, away_innings, home_innings), key=lambda x: x[0])
-        innings_list = [x[0] for x in sorted_data]
-        away_innings = [x[1] for x in sorted_data]
-        home_innings = [x[2] for x in sorted_data]
+            away_innings[inning['num'] - 1] = away_runs if away_runs > 0 else 0
+            home_innings[inning['num'] - 1] = home_runs if home_runs > 0 else 0
         
         box_score_data['innings_list'] = innings_list
         box_score_data['away_innings'] = away_innings
@@ -404,8 +454,6 @@ def box_score(game_pk):
         return render_template('box_score.html', **box_score_data)
         
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error loading box score: {e}")
         flash("Error loading box score. Please try again.", "error")
         return redirect(url_for('pages.live_scores'))
@@ -417,49 +465,20 @@ def gameday():
     """Daily hub for schedule, reports, notes, and standings."""
     viewer_user = getattr(g, "user", None)
     target_user = viewer_user
-    admin_user_options: List[Dict[str, Any]] = []
+    admin_user_options: List[UserOption] = []
     requested_user_id = request.args.get("user_id", type=int)
 
-    def _format_user_label(record: Optional[Dict[str, Any]]) -> str:
-        if not record:
-            return "Unknown User"
-        first = (record.get("first_name") or "").strip()
-        last = (record.get("last_name") or "").strip()
-        full_name = f"{first} {last}".strip()
-        if full_name:
-            return full_name
-        email = (record.get("email") or "").strip()
-        if email:
-            return email
-        return f"User #{record.get('id')}"
-
     if session.get("is_admin") and PlayerDB:
         user_rows: List[Dict[str, Any]] = []
-        db = None
         try:
-            db = PlayerDB()
-            user_rows = db.list_users()
+            user_rows = get_admin_user_rows()
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning fetching users for admin gameday selector: {exc}")
-        finally:
-            try:
-                if db:
-                    db.close()
-            except Exception:
-                pass
 
-        admin_user_options = [
-            {"id": row["id"], "label": _format_user_label(row)}
-            for row in user_rows
-        ]
+        admin_user_options = _user_options(user_rows)
 
-        if requested_user_id:
-            for row in user_rows:
-                if row["id"] == requested_user_id:
-                    target_user = row
-                    break
+        if requested_user_id and user_rows:
+            target_user = get_admin_users_by_id().get(requested_user_id, target_user)
 
         if target_user is None and viewer_user is not None:
             target_user = viewer_user
@@ -478,8 +497,7 @@ def gameday():
     
     # Always load full season schedule (365 days) to support date filtering and series display
     raw_games = None
-    from datetime import date as date_type
-    today = date_type.today()
+    today = date.today()
     end_date = today + timedelta(days=365)
     
     try:
@@ -489,70 +507,15 @@ def gameday():
             end_date=end_date.isoformat()
         )
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"Warning loading games from load_full_season_schedule: {e}")
         raw_games = []
     
     # Group games into series and format for display
     upcoming_games = []
+    series_groups = []
     if raw_games and len(raw_games) > 0:
         # Format the games and group into series
-        from datetime import date as date_type
-        today = date_type.today()
-        
-        # Group games into series (consecutive games against same opponent)
-        series_groups = []
-        current_series = None
-        last_opponent_id = None
-        last_game_date = None
-        
-        # Sort games by date first
-        sorted_games = sorted(raw_games, key=lambda g: g.get("game_date", ""))
-        
-        for game in sorted_games:
-            date_str = game.get("game_date") or game.get("game_date_iso") or game.get("date")
-            if not date_str:
-                continue
-                
-            try:
-                if isinstance(date_str, str):
-                    game_date = datetime.fromisoformat(date_str.split('T')[0] if 'T' in date_str else date_str).date()
-                else:
-                    game_date = date_str if isinstance(date_str, date_type) else datetime.combine(date_str, datetime.min.time()).date()
-            except Exception:
-                continue
-            
-            opponent_id = game.get("opponent_id")
-            
-            # Start new series if opponent changes or gap > 1 day
-            if (last_opponent_id is not None and 
-                (opponent_id != last_opponent_id or 
-                 (last_game_date and (game_date - last_game_date).days > 1))):
-                if current_series:
-                    series_groups.append(current_series)
-                current_series = None
-            
-            if not current_series:
-                current_series = {
-                    "opponent_id": opponent_id,
-                    "opponent_name": game.get("opponent_name") or game.get("opponent"),
-                    "opponent_abbr": game.get("opponent_abbr"),
-                    "games": [],
-                    "start_date": game_date,
-                    "end_date": game_date,
-                }
-            
-            current_series["games"].append(game)
-            current_series["end_date"] = max(current_series["end_date"], game_date)
-            last_opponent_id = opponent_id
-            last_game_date = game_date
-        
-        if current_series:
-            series_groups.append(current_series)
-        
-        # Sort series by start date
-        series_groups.sort(key=lambda s: s["start_date"])
+        series_groups = _group_games_into_series(raw_games)
         
         # Find the next upcoming series (first future series) to mark as "current" if no actual current series
         next_upcoming_series_key = None
@@ -600,7 +563,7 @@ def gameday():
             display_time = "TBD"
             if game_time:
                 try:
-                    display_time = datetime.fromisoformat(game_time.replace("Z", "+00:00")).astimezone().strftime("%I:%M %p %Z")
+                    display_time = _parse_iso_datetime(game_time).astimezone().strftime("%I:%M %p %Z")
                 except Exception:
                     display_time = "TBD"
             
@@ -648,21 +611,17 @@ def gameday():
             f"{target_user['first_name']} {target_user['last_name']}"
         ).lower().replace(" ", "_")
 
+    # Filter to the player's reports before building any URLs
     recent_reports = []
     for report in collect_recent_reports(limit=25):
         filename = report.get("filename") or ""
         if player_slug and player_slug not in filename.lower():
             continue
         try:
-            recent_reports.append({
-                **report,
-                "url": url_for("reports.download_report_file", filename=filename)
-            })
+            url = url_for("reports.download_report_file", filename=filename)
         except Exception:
-            recent_reports.append({
-                **report,
-                "url": f"/reports/files/{filename}"
-            })
+            url = f"/reports/files/{filename}"
+        recent_reports.append({**report, "url": url})
 
     upcoming_games = attach_reports_to_games(upcoming_games, recent_reports)
     league_leader_groups = collect_league_leaders()
@@ -670,33 +629,22 @@ def gameday():
     player_documents = []
     document_log = []
     if PlayerDB and target_user and target_user.get("id"):
-        db = None
         try:
-            db = PlayerDB()
-            user_docs = db.list_player_documents(target_user.get("id"))
+            user_docs, events = get_request_db().get_user_doc_bundle(target_user["id"], event_limit=20)
             player_documents = [format_player_document(doc) for doc in user_docs]
-            events = db.list_player_document_events(player_id=target_user.get("id"), limit=20)
             document_log = [
                 {
                     "filename": evt.get("filename"),
                     "action": evt.get("action"),
                     "performed_by": evt.get("performed_by"),
                     "timestamp": evt.get("timestamp"),
-                    "timestamp_human": datetime.fromtimestamp(evt["timestamp"]).strftime("%b %d, %Y %I:%M %p")
+                    "timestamp_human": format_timestamp_human(evt["timestamp"])
                     if evt.get("timestamp") else None,
                 }
                 for evt in events
             ]
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning fetching player documents: {exc}")
-        finally:
-            try:
-                if db:
-                    db.close()
-            except Exception:
-                pass
 
     standings_view = request.args.get('standings_view', 'division').lower()
     if standings_view not in {"division", "wildcard"}:
@@ -732,128 +680,49 @@ def gameday():
     requested_tab = None  # Will be "past", "current", or "future" if a date was requested
     if requested_date:
         try:
-            from datetime import date as date_type
-            today = date_type.today()
-            filter_date = datetime.fromisoformat(requested_date).date()
-            
-            # Load full season schedule to check what series are actually displayed
-            # (The displayed series are: one past, one current, one upcoming)
-            full_schedule_games = load_full_season_schedule(
-                target_user,
-                start_date=today.isoformat(),
-                end_date=(today + timedelta(days=365)).isoformat()
-            )
+            filter_date = date.fromisoformat(requested_date[:10])
             
-            if full_schedule_games:
-                # Group into series to find which ones are displayed
-                all_series_groups = []
-                current_series = None
-                last_opponent_id = None
-                last_game_date = None
-                
-                sorted_games = sorted(full_schedule_games, key=lambda g: g.get("game_date", ""))
-                for game in sorted_games:
-                    date_str = game.get("game_date") or game.get("game_date_iso") or game.get("date")
-                    if not date_str:
-                        continue
-                    try:
-                        if isinstance(date_str, str):
-                            game_date = datetime.fromisoformat(date_str.split('T')[0] if 'T' in date_str else date_str).date()
-                        else:
-                            game_date = date_str if isinstance(date_str, date_type) else datetime.combine(date_str, datetime.min.time()).date()
-                    except Exception:
-                        continue
-                    
-                    opponent_id = game.get("opponent_id")
-                    if (last_opponent_id is not None and 
-                        (opponent_id != last_opponent_id or 
-                         (last_game_date and (game_date - last_game_date).days > 1))):
-                        if current_series:
-                            all_series_groups.append(current_series)
-                        current_series = None
-                    
-                    if not current_series:
-                        current_series = {
-                            "opponent_id": opponent_id,
-                            "start_date": game_date,
-                            "end_date": game_date,
-                        }
-                    current_series["end_date"] = max(current_series["end_date"], game_date)
-                    last_opponent_id = opponent_id
-                    last_game_date = game_date
-                
-                if current_series:
-                    all_series_groups.append(current_series)
-                
-                # Find displayed series (one past, one current, one upcoming)
-                past_series = []
-                current_series_list = []
-                upcoming_series_list = []
-                
-                for series in all_series_groups:
-                    series_start = series["start_date"]
-                    series_end = series["end_date"]
-                    if series_end < today:
-                        past_series.append(series)
-                    elif series_start <= today <= series_end:
-                        current_series_list.append(series)
-                    else:
-                        upcoming_series_list.append(series)
+            # Reuse the series grouped for the hub above (same 365-day window)
+            if series_groups:
+                # series_groups is sorted by start date, so everything after the
+                # bisect point is upcoming and the rest is past or current
+                split = bisect_right([s["start_date"] for s in series_groups], today)
+                upcoming_series_list = series_groups[split:]
+                current_series_list = [s for s in series_groups[:split] if s["end_date"] >= today]
+                # Most recent first
+                past_series = [s for s in reversed(series_groups[:split]) if s["end_date"] < today]
                 
-                past_series.sort(key=lambda s: s["start_date"], reverse=True)
-                upcoming_series_list.sort(key=lambda s: s["start_date"])
-                
-                # Get the latest date from displayed series (matching gameday hub logic)
+                # Series shown on the hub, each with the tab it appears under
+                # (matching gameday hub logic: with no current series, the
+                # first upcoming one is shown as "current")
                 displayed_series = []
                 if past_series:
-                    displayed_series.append(past_series[0])
+                    displayed_series.append(("past", past_series[0]))
                 if current_series_list:
-                    displayed_series.append(current_series_list[0])
+                    displayed_series.append(("current", current_series_list[0]))
                     if upcoming_series_list:
-                        displayed_series.append(upcoming_series_list[0])
+                        displayed_series.append(("future", upcoming_series_list[0]))
                 elif upcoming_series_list:
-                    displayed_series.append(upcoming_series_list[0])
+                    displayed_series.append(("current", upcoming_series_list[0]))
                     if len(upcoming_series_list) > 1:
-                        displayed_series.append(upcoming_series_list[1])
+                        displayed_series.append(("future", upcoming_series_list[1]))
                 
-                # Check if requested date is in any displayed series and determine which tab
+                # Check if requested date is in any displayed series and switch to its tab
                 date_in_displayed = False
-                for series in displayed_series:
+                for tab, series in displayed_series:
                     if series["start_date"] <= filter_date <= series["end_date"]:
                         date_in_displayed = True
-                        # Determine which tab this series belongs to by comparing series identifiers
-                        # (opponent_id and start_date) since object identity won't work
-                        series_key = (series["opponent_id"], series["start_date"])
-                        
-                        # Check past series
-                        if past_series and (past_series[0]["opponent_id"], past_series[0]["start_date"]) == series_key:
-                            requested_tab = "past"
-                        # Check current series
-                        elif current_series_list and (current_series_list[0]["opponent_id"], current_series_list[0]["start_date"]) == series_key:
-                            requested_tab = "current"
-                        # Check upcoming series
-                        elif upcoming_series_list:
-                            # Check first upcoming (which might be shown as "current" if no actual current)
-                            if (upcoming_series_list[0]["opponent_id"], upcoming_series_list[0]["start_date"]) == series_key:
-                                # If there's no current series, first upcoming is shown as "current"
-                                if not current_series_list:
-                                    requested_tab = "current"
-                                else:
-                                    requested_tab = "future"
-                            # Check second upcoming if it exists
-                            elif len(upcoming_series_list) > 1 and (upcoming_series_list[1]["opponent_id"], upcoming_series_list[1]["start_date"]) == series_key:
-                                requested_tab = "future"
+                        requested_tab = tab
                         break
                 
                 # If date is not in displayed series and is after the latest displayed series, show note
                 if not date_in_displayed and displayed_series:
-                    latest_displayed_date = max(s["end_date"] for s in displayed_series)
+                    # Added past -> current -> future, so the last one ends latest
+                    latest_displayed_date = displayed_series[-1][1]["end_date"]
                     if filter_date > latest_displayed_date:
                         show_date_redirect_note = True
                         requested_tab = None  # Don't switch tabs if showing note
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Error checking date redirect note: {e}")
             pass  # If date parsing fails, don't show note
 
@@ -879,17 +748,52 @@ def gameday():
     )
 
 
-# Simple template-only routes that don't need helper functions
-@bp.route('/scouting-report')
-def scouting_report():
-    """Scouting report generator page"""
-    return render_template('scouting_report.html')
+# Simple template-only routes that don't need helper functions:
+# (rule, endpoint, template, decorator or None)
+_SIMPLE_PAGES = (
+    ('/scouting-report', 'scouting_report', 'scouting_report.html', None),
+    ('/pitchers-report', 'pitchers_report', 'pitchers_report.html', None),
+    ('/admin', 'admin_dashboard', 'admin.html', admin_required),
+    ('/admin/data-refresh', 'data_refresh', 'data_refresh.html', admin_required),
+    ('/player-database', 'player_database', 'player_database.html', None),
+    ('/visuals', 'visuals', 'visuals.html', None),
+    ('/heatmaps', 'heatmaps', 'heatmaps.html', None),
+    ('/spraychart', 'spraychart', 'spraychart.html', None),
+    ('/timeline', 'timeline', 'timeline.html', None),
+    ('/pitchplots', 'pitchplots', 'pitchplots.html', None),
+    ('/velocity_trends', 'velocity_trends', 'velocity_trends.html', None),
+    ('/pitch-mix-analysis', 'pitch_mix_analysis', 'pitch_mix_analysis.html', None),
+    ('/count-performance', 'count_performance', 'count_performance.html', None),
+    ('/zone-contact-rates', 'zone_contact_rates', 'zone_contact_rates.html', None),
+    ('/plate-discipline-matrix', 'plate_discipline_matrix', 'plate_discipline_matrix.html', None),
+    ('/expected-stats-comparison', 'expected_stats_comparison', 'expected_stats_comparison.html', None),
+    ('/pitch-tunnel', 'pitch_tunnel', 'pitch_tunnel.html', None),
+    ('/barrel-quality-contact', 'barrel_quality_contact', 'barrel_quality_contact.html', None),
+    ('/swing-decision-matrix', 'swing_decision_matrix', 'swing_decision_matrix.html', None),
+    ('/pitch-arsenal-effectiveness', 'pitch_arsenal_effectiveness', 'pitch_arsenal_effectiveness.html', None),
+    ('/game-analysis', 'game_analysis', 'game_analysis.html', None),
+    ('/reports-library', 'reports_library', 'reports_library.html', None),
+    ('/nutrition', 'nutrition', 'nutrition.html', login_required),
+)
+
+
+@lru_cache(maxsize=64)
+def _simple_page_template(jinja_env, template):
+    """Compiled template for a fixed page, looked up once per app."""
+    return jinja_env.get_template(template)
+
 
+def _render_static(template, **context):
+    # The HTML itself is per-session (nav user, CSRF token, flashes), so only
+    # the template lookup is memoized; auto-reload keeps edits live in debug
+    if current_app.jinja_env.auto_reload:
+        return render_template(template, **context)
+    return render_template(_simple_page_template(current_app.jinja_env, template), **context)
 
-@bp.route('/pitchers-report')
-def pitchers_report():
-    """Pitcher's reports page"""
-    return render_template('pitchers_report.html')
+
+for _rule, _endpoint, _template, _guard in _SIMPLE_PAGES:
+    _view = partial(_render_static, _template)
+    bp.add_url_rule(_rule, endpoint=_endpoint, view_func=_guard(_view) if _guard else _view)
 
 
 @bp.route('/mocap')
@@ -898,30 +802,24 @@ def mocap():
     """Mocap analysis page"""
     is_admin = session.get('is_admin', False)
     
-    if is_admin:
-        base_url = "https://cooper-710.github.io/motion-webapp"
-        mode = "admin"
-    else:
-        base_url = "https://motion-webapp.pages.dev"
-        mode = "player"
-    
     player_name = request.args.get('player')
     if not player_name:
-        user = getattr(g, "user", None)
-        if user and user.get('first_name') and user.get('last_name'):
-            player_name = f"{user['first_name']} {user['last_name']}"
-        elif session.get('first_name') and session.get('last_name'):
-            player_name = f"{session['first_name']} {session['last_name']}"
-        else:
-            player_name = "Pete Alonso"
+        # Signed-in user's name, else the name stored in the session
+        user = getattr(g, "user", None) or {}
+        first_name, last_name = user.get('first_name'), user.get('last_name')
+        if not (first_name and last_name):
+            first_name, last_name = session.get('first_name'), session.get('last_name')
+        player_name = f"{first_name} {last_name}" if first_name and last_name else "Pete Alonso"
     
-    encoded_player_name = quote_plus(player_name)
     session_date = request.args.get('session', '2025-08-27')
     
-    if is_admin:
-        motion_app_url = f"{base_url}/?mode={mode}&player={encoded_player_name}&session={session_date}"
-    else:
-        motion_app_url = f"{base_url}/?mode={mode}&player={encoded_player_name}&session={session_date}&lock=1"
+    query = urlencode({
+        "mode": "admin" if is_admin else "player",
+        "player": player_name,
+        "session": session_date
+    })
+    # Players get the locked deployment
+    motion_app_url = (MOCAP_ADMIN_URL if is_admin else MOCAP_PLAYER_URL).format(query=query)
     
     return render_template('mocap.html', motion_app_url=motion_app_url)
 
@@ -929,14 +827,14 @@ def mocap():
 @bp.route('/pitchviz')
 def pitchviz():
     """PitchViz visualization page"""
-    base_url = "https://cooper-710.github.io/NEWPV-main_with_orbit/"
-    team = request.args.get('team', 'ARI')
-    pitcher = request.args.get('pitcher', 'Backhus, Kyle')
-    view = request.args.get('view', 'catcher')
-    trail = request.args.get('trail', '0')
-    orbit = request.args.get('orbit', '1')
-    encoded_pitcher = quote_plus(pitcher)
-    pitchviz_url = f"{base_url}?team={team}&pitcher={encoded_pitcher}&view={view}&trail={trail}&orbit={orbit}"
+    query = urlencode({
+        "team": request.args.get('team', 'ARI'),
+        "pitcher": request.args.get('pitcher', 'Backhus, Kyle'),
+        "view": request.args.get('view', 'catcher'),
+        "trail": request.args.get('trail', '0'),
+        "orbit": request.args.get('orbit', '1')
+    })
+    pitchviz_url = PITCHVIZ_URL.format(query=query)
     return render_template('pitchviz.html', pitchviz_url=pitchviz_url)
 
 
@@ -948,122 +846,12 @@ def contractviz():
     return render_template('contractviz.html', contractviz_url=contractviz_url)
 
 
-@bp.route('/admin')
-@admin_required
-def admin_dashboard():
-    """Render the admin control center."""
-    return render_template('admin.html')
-
-
-@bp.route('/admin/data-refresh')
-@admin_required
-def data_refresh():
-    """Render the data refresh page."""
-    return render_template('data_refresh.html')
-
-
-@bp.route('/player-database')
-def player_database():
-    """Player database page"""
-    return render_template('player_database.html')
-
-
 @bp.route('/player/<player_id>')
 def player_profile(player_id):
     """Player profile page"""
     return render_template('player_profile.html', player_id=player_id)
 
 
-@bp.route('/visuals')
-def visuals():
-    """Visuals page"""
-    return render_template('visuals.html')
-
-
-@bp.route('/heatmaps')
-def heatmaps():
-    """Heatmaps visualization page"""
-    return render_template('heatmaps.html')
-
-
-@bp.route('/spraychart')
-def spraychart():
-    """Spray chart visualization page"""
-    return render_template('spraychart.html')
-
-
-@bp.route('/timeline')
-def timeline():
-    """Performance Timeline visualization page"""
-    return render_template('timeline.html')
-
-
-@bp.route('/pitchplots')
-def pitchplots():
-    """Pitch Plots visualization page"""
-    return render_template('pitchplots.html')
-
-
-@bp.route('/velocity_trends')
-def velocity_trends():
-    """Velocity Trends visualization page"""
-    return render_template('velocity_trends.html')
-
-
-@bp.route('/pitch-mix-analysis')
-def pitch_mix_analysis():
-    """Pitch Mix Analysis visualization page"""
-    return render_template('pitch_mix_analysis.html')
-
-
-@bp.route('/count-performance')
-def count_performance():
-    """Count Performance Breakdown visualization page"""
-    return render_template('count_performance.html')
-
-
-@bp.route('/zone-contact-rates')
-def zone_contact_rates():
-    """Zone Contact Rates visualization page"""
-    return render_template('zone_contact_rates.html')
-
-
-@bp.route('/plate-discipline-matrix')
-def plate_discipline_matrix():
-    """Plate Discipline Matrix visualization page"""
-    return render_template('plate_discipline_matrix.html')
-
-
-@bp.route('/expected-stats-comparison')
-def expected_stats_comparison():
-    """Expected Stats Comparison visualization page"""
-    return render_template('expected_stats_comparison.html')
-
-
-@bp.route('/pitch-tunnel')
-def pitch_tunnel():
-    """Pitch Tunnel Analysis visualization page"""
-    return render_template('pitch_tunnel.html')
-
-
-@bp.route('/barrel-quality-contact')
-def barrel_quality_contact():
-    """Barrel Rate & Quality of Contact visualization page"""
-    return render_template('barrel_quality_contact.html')
-
-
-@bp.route('/swing-decision-matrix')
-def swing_decision_matrix():
-    """Swing Decision Matrix visualization page"""
-    return render_template('swing_decision_matrix.html')
-
-
-@bp.route('/pitch-arsenal-effectiveness')
-def pitch_arsenal_effectiveness():
-    """Pitch Arsenal Effectiveness visualization page"""
-    return render_template('pitch_arsenal_effectiveness.html')
-
-
 @bp.route('/matchups')
 @login_required
 def matchups():
@@ -1077,7 +865,6 @@ def matchups():
     last_name = (viewer_user.get("last_name") or "").strip()
     player_name = f"{first_name} {last_name}".strip() if first_name or last_name else None
     
-    from datetime import datetime
     current_year = datetime.now().year
     
     return render_template(
@@ -1088,18 +875,6 @@ def matchups():
     )
 
 
-@bp.route('/game-analysis')
-def game_analysis():
-    """Game analysis page"""
-    return render_template('game_analysis.html')
-
-
-@bp.route('/reports-library')
-def reports_library():
-    """Reports library page"""
-    return render_template('reports_library.html')
-
-
 @bp.route('/workouts')
 @login_required
 def workouts():
@@ -1108,19 +883,13 @@ def workouts():
     current_user_id = viewer_user.get("id") if viewer_user else None
     workout_document = None
     if PlayerDB and current_user_id:
-        db = None
         try:
-            db = PlayerDB()
+            db = get_request_db()
             latest = db.get_latest_player_document_by_category(current_user_id, Config.WORKOUT_CATEGORY)
             if latest:
                 workout_document = format_player_document(latest)
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning: unable to load workout document: {exc}")
-        finally:
-            if db:
-                db.close()
 
     first_name = (viewer_user or {}).get("first_name") or ""
     last_name = (viewer_user or {}).get("last_name") or ""
@@ -1132,12 +901,10 @@ def workouts():
     if is_admin:
         workout_document = None
 
-    from app.middleware.csrf import generate_csrf_token
 
     return render_template(
         'workouts.html',
         workout_document=workout_document,
-        csrf_token=generate_csrf_token(),
         workout_category=Config.WORKOUT_CATEGORY,
         initial_player_id=initial_player_id,
         initial_player_label=initial_player_label if initial_player_id else "",
@@ -1146,13 +913,6 @@ def workouts():
     )
 
 
-@bp.route('/nutrition')
-@login_required
-def nutrition():
-    """Nutrition placeholder page"""
-    return render_template('nutrition.html')
-
-
 @bp.route('/journaling', methods=['GET', 'POST'])
 @login_required
 def journaling():
@@ -1161,16 +921,16 @@ def journaling():
     if not viewer_user:
         abort(403)
 
-    today_iso = datetime.now().strftime("%Y-%m-%d")
-    selected_visibility = normalize_journal_visibility(
-        request.values.get("visibility") if request.method == "GET" else request.form.get("visibility"),
-        default="private",
-    )
-    selected_date_raw = request.values.get("date") if request.method == "GET" else request.form.get("entry_date")
-    if not selected_date_raw:
-        selected_date_raw = today_iso
-    # Check if we should reset the form (after saving)
-    should_reset_form = request.values.get("reset") == "1"
+    today_iso = date.today().isoformat()
+    # GET selects from the query string, POST from the submitted form
+    if request.method == "GET":
+        params, date_field = request.args, "date"
+    else:
+        params, date_field = request.form, "entry_date"
+    selected_visibility = normalize_journal_visibility(params.get("visibility"), default="private")
+    selected_date_raw = params.get(date_field) or today_iso
+    # Check if we should reset the form (after saving); only the post-save redirect sets it
+    should_reset_form = request.args.get("reset") == "1"
 
     entry_errors: List[str] = []
     just_saved = False
@@ -1187,8 +947,12 @@ def journaling():
         if not entry_date:
             entry_errors.append("Entry date is required.")
 
+        # The regex rejects other ISO forms fromisoformat accepts (e.g. 20261015);
+        # fromisoformat then rejects impossible dates such as 2026-02-30
         try:
-            datetime.strptime(entry_date, "%Y-%m-%d")
+            if not ISO_DATE_RE.fullmatch(entry_date):
+                raise ValueError(entry_date)
+            date.fromisoformat(entry_date)
         except ValueError:
             entry_errors.append("Entry date must be in YYYY-MM-DD format.")
 
@@ -1196,9 +960,8 @@ def journaling():
             entry_errors.append("Database is unavailable. Please try again later.")
 
         if not entry_errors and PlayerDB:
-            db = None
             try:
-                db = PlayerDB()
+                db = get_request_db()
                 db.upsert_journal_entry(
                     user_id=viewer_user["id"],
                     entry_date=entry_date,
@@ -1220,13 +983,8 @@ def journaling():
             except ValueError as exc:
                 entry_errors.append(str(exc))
             except Exception as exc:
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(f"Warning: failed to save journal entry: {exc}")
                 entry_errors.append("An unexpected error occurred while saving.")
-            finally:
-                if db:
-                    db.close()
 
         selected_date_raw = entry_date or selected_date_raw
         selected_visibility = visibility_choice
@@ -1235,59 +993,49 @@ def journaling():
     current_entry: Optional[Dict[str, Any]] = None
 
     if PlayerDB:
-        db = None
         try:
-            db = PlayerDB()
+            db = get_request_db()
             entries = db.list_journal_entries(
                 user_id=viewer_user["id"],
                 limit=MAX_JOURNAL_TIMELINE_ENTRIES,
             )
             timeline_entries = prepare_journal_timeline(entries)
 
-            # Ensure the selected date corresponds to an existing entry if possible
-            # But skip this if we're resetting the form after save
+            # Don't select or load an entry if we're resetting the form (after saving)
             if not should_reset_form:
-                known_dates = {item["date"] for item in timeline_entries}
-                if selected_date_raw not in known_dates and timeline_entries:
+                # Ensure the selected date corresponds to an existing entry if possible
+                if timeline_entries and not any(item["date"] == selected_date_raw for item in timeline_entries):
                     selected_date_raw = timeline_entries[0]["date"]
 
-            # Don't load entry if we're resetting the form (after saving)
-            if should_reset_form:
-                current_entry = None
-            else:
-                current_entry = db.get_journal_entry(
-                    user_id=viewer_user["id"],
-                    entry_date=selected_date_raw,
-                    visibility=selected_visibility,
-                )
-                current_entry = augment_journal_entry(current_entry)
+                # Usually already in the timeline; query only for entries it doesn't hold
+                current_entry = find_timeline_entry(timeline_entries, selected_date_raw, selected_visibility)
+                if current_entry is None:
+                    current_entry = augment_journal_entry(db.get_journal_entry(
+                        user_id=viewer_user["id"],
+                        entry_date=selected_date_raw,
+                        visibility=selected_visibility,
+                    ))
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning: unable to load journal entries: {exc}")
             timeline_entries = []
             current_entry = None
-        finally:
-            if db:
-                db.close()
     else:
         flash("Journal features are temporarily unavailable.", "warning")
 
-    return render_template(
-        'journaling.html',
+    context = dict(
+        JOURNAL_BASE_CONTEXT,
         selected_date=selected_date_raw,
         selected_visibility=selected_visibility,
         entry=current_entry,
         timeline_entries=timeline_entries,
         entry_errors=entry_errors,
         just_saved=just_saved,
-        journal_visibility_options=JOURNAL_VISIBILITY_OPTIONS,
         today=today_iso,
         today_display=format_journal_date(today_iso),
-        is_admin_view=False,
         target_user=viewer_user,
         selected_date_display=format_journal_date(selected_date_raw),
     )
+    return render_template('journaling.html', **context)
 
 
 @bp.route('/journaling/admin')
@@ -1298,33 +1046,25 @@ def journaling_admin():
         abort(403)
 
     viewer_user = getattr(g, "user", None)
-    today_iso = datetime.now().strftime("%Y-%m-%d")
+    today_iso = date.today().isoformat()
     selected_user_id = request.args.get("user_id", type=int)
     selected_date_raw = request.args.get("date")
 
-    user_options: List[Dict[str, Any]] = []
+    user_options: List[UserOption] = []
     target_user: Optional[Dict[str, Any]] = None
     timeline_entries: List[Dict[str, Any]] = []
     current_entry: Optional[Dict[str, Any]] = None
 
-    def _format_user_label(record: Dict[str, Any]) -> str:
-        first = (record.get("first_name") or "").strip()
-        last = (record.get("last_name") or "").strip()
-        if first or last:
-            return f"{first} {last}".strip()
-        return (record.get("email") or f"User #{record.get('id')}").strip()
-
     if PlayerDB:
-        db = None
         try:
-            db = PlayerDB()
-            user_records = db.list_users()
-            user_options = [
-                {"id": record["id"], "label": _format_user_label(record)}
-                for record in user_records
-            ]
+            db = get_request_db()
+            user_records = get_admin_user_rows()
+            user_options = _user_options(user_records)
             if selected_user_id:
-                target_user = db.get_user_by_id(selected_user_id)
+                target_user = next((record for record in user_records if record["id"] == selected_user_id), None)
+                # The cached rows can predate a user created in another worker
+                if target_user is None:
+                    target_user = db.get_user_by_id(selected_user_id)
             if not target_user and user_records:
                 target_user = user_records[0]
 
@@ -1335,40 +1075,26 @@ def journaling_admin():
                     limit=MAX_JOURNAL_TIMELINE_ENTRIES,
                 )
                 timeline_entries = prepare_journal_timeline(entries)
-                known_dates = {item["date"] for item in timeline_entries}
-                if not selected_date_raw and timeline_entries:
+                if timeline_entries and not any(item["date"] == selected_date_raw for item in timeline_entries):
                     selected_date_raw = timeline_entries[0]["date"]
-                elif selected_date_raw not in known_dates:
-                    selected_date_raw = timeline_entries[0]["date"] if timeline_entries else selected_date_raw
 
+                # The selected date is always one of the fetched public entries
+                # (or there are none), so take it from the timeline instead of re-querying
                 if selected_date_raw:
-                    current_entry = db.get_journal_entry(
-                        user_id=target_user["id"],
-                        entry_date=selected_date_raw,
-                        visibility="public",
-                    )
-                    current_entry = augment_journal_entry(current_entry)
+                    current_entry = find_timeline_entry(timeline_entries, selected_date_raw, "public")
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning: admin journal view error: {exc}")
             timeline_entries = []
             current_entry = None
-        finally:
-            if db:
-                db.close()
     else:
         flash("Journal features are temporarily unavailable.", "warning")
 
-    return render_template(
-        'journaling.html',
+    context = dict(
+        JOURNAL_BASE_CONTEXT,
         selected_date=selected_date_raw,
         selected_visibility="public",
         entry=current_entry,
         timeline_entries=timeline_entries,
-        entry_errors=[],
-        just_saved=False,
-        journal_visibility_options=JOURNAL_VISIBILITY_OPTIONS,
         today=today_iso,
         today_display=format_journal_date(today_iso),
         is_admin_view=True,
@@ -1377,6 +1103,7 @@ def journaling_admin():
         viewer_user=viewer_user,
         selected_date_display=format_journal_date(selected_date_raw),
     )
+    return render_template('journaling.html', **context)
 
 
 @bp.route('/journaling/delete', methods=['POST'])
@@ -1395,25 +1122,19 @@ def delete_journal_entry():
     visibility = normalize_journal_visibility(request.form.get("visibility"), default="private")
 
     if not entry_date:
-        entry_date = datetime.now().strftime("%Y-%m-%d")
+        entry_date = date.today().isoformat()
 
     if entry_id is None or PlayerDB is None:
         flash("Unable to delete journal entry.", "error")
         return redirect(url_for("pages.journaling", date=entry_date, visibility=visibility))
 
     success = False
-    db = None
     try:
-        db = PlayerDB()
+        db = get_request_db()
         success = db.delete_journal_entry(entry_id, viewer_user["id"])
     except Exception as exc:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"Warning: failed to delete journal entry {entry_id}: {exc}")
         success = False
-    finally:
-        if db:
-            db.close()
 
     if success:
         flash("Journal entry deleted.", "success")
@@ -1432,18 +1153,6 @@ def profile_settings():
         return redirect(url_for("pages.home"))
 
     viewer = g.user or {}
-    notification_prefs_raw = viewer.get("notification_preferences") or "{}"
-    if isinstance(notification_prefs_raw, str):
-        try:
-            notification_prefs = json.loads(notification_prefs_raw or "{}")
-            if not isinstance(notification_prefs, dict):
-                notification_prefs = {}
-        except Exception:
-            notification_prefs = {}
-    elif isinstance(notification_prefs_raw, dict):
-        notification_prefs = notification_prefs_raw
-    else:
-        notification_prefs = {}
 
     if request.method == "POST":
         if not validate_csrf(request.form.get("csrf_token")):
@@ -1451,26 +1160,17 @@ def profile_settings():
             return redirect(url_for("pages.profile_settings"))
 
         form_name = (request.form.get("form_name") or "basic-info").strip().lower()
-        db = None
         try:
-            db = PlayerDB()
+            db = get_request_db()
             if form_name == "basic-info":
+                # Trimmed values, with blank fields stored as NULL
                 updates = {
-                    "first_name": clean_str(request.form.get("first_name")),
-                    "last_name": clean_str(request.form.get("last_name")),
-                    "pronouns": clean_str(request.form.get("pronouns")),
-                    "job_title": clean_str(request.form.get("job_title")),
-                    "phone": clean_str(request.form.get("phone")),
-                    "timezone": clean_str(request.form.get("timezone")),
-                    "bio": (request.form.get("bio") or "").strip(),
+                    field: clean_str(request.form.get(field)) or None
+                    for field in PROFILE_TEXT_FIELDS
                 }
-                # Normalize optional fields
-                for key, value in list(updates.items()):
-                    if value is not None:
-                        value = value.strip()
-                        updates[key] = value or None
                 success = db.update_user_profile(viewer["id"], **updates)
                 if success:
+                    invalidate_admin_user_rows()
                     flash("Profile details updated.", "success")
                 else:
                     flash("No profile changes detected.", "info")
@@ -1502,14 +1202,14 @@ def profile_settings():
                 confirm_pw = request.form.get("confirm_password") or ""
                 stored_hash = viewer.get("password_hash") or ""
 
-                if not check_password_hash(stored_hash, current_pw):
+                if not verify_password(stored_hash, current_pw):
                     flash("Current password is incorrect.", "error")
                 elif new_pw != confirm_pw:
                     flash("New passwords do not match.", "error")
                 elif len(new_pw) < 12:
                     flash("Password must be at least 12 characters.", "error")
                 else:
-                    db.update_user_password(viewer["id"], generate_password_hash(new_pw))
+                    db.update_user_password(viewer["id"], hash_password(new_pw))
                     flash("Password updated.", "success")
 
             elif form_name == "avatar":
@@ -1518,82 +1218,86 @@ def profile_settings():
                     flash("Please select an image to upload.", "error")
                 else:
                     filename = secure_filename(file.filename)
-                    extension = Path(filename).suffix.lower()
+                    # secure_filename strips leading dots, so any dot starts the extension
+                    dot = filename.rfind(".")
+                    extension = filename[dot:].lower() if dot != -1 else ""
                     if extension not in Config.ALLOWED_PROFILE_EXTENSIONS:
                         flash("Unsupported image type.", "error")
                     else:
-                        data = file.read()
-                        if len(data) > Config.MAX_UPLOAD_SIZE:
-                            flash("Image exceeds 5 MB limit.", "error")
+                        # The magic header is enough to check the type; the rest is
+                        # streamed to disk rather than read into memory
+                        header = file.stream.read(32)
+                        detected_type = detect_image_type(header)
+                        if detected_type not in Config.ALLOWED_PROFILE_TYPES:
+                            flash("Uploaded file is not a valid image.", "error")
                         else:
-                            detected_type = detect_image_type(data)
-                            if detected_type not in Config.ALLOWED_PROFILE_TYPES:
-                                flash("Uploaded file is not a valid image.", "error")
+                            unique_name = f"user-{viewer['id']}-{uuid.uuid4().hex}{extension}"
+                            destination = Config.UPLOAD_DIR / unique_name
+                            size = len(header)
+                            with destination.open("wb") as fh:
+                                fh.write(header)
+                                while size <= Config.MAX_UPLOAD_SIZE:
+                                    chunk = file.stream.read(AVATAR_COPY_CHUNK_SIZE)
+                                    if not chunk:
+                                        break
+                                    fh.write(chunk)
+                                    size += len(chunk)
+
+                            if size > Config.MAX_UPLOAD_SIZE:
+                                destination.unlink()
+                                flash("Image exceeds 5 MB limit.", "error")
                             else:
-                                unique_name = f"user-{viewer['id']}-{uuid.uuid4().hex}{extension}"
-                                destination = Config.UPLOAD_DIR / unique_name
-                                with destination.open("wb") as fh:
-                                    fh.write(data)
-
-                                # Remove previous avatar if one exists
-                                previous = viewer.get("profile_image_path")
-                                if previous:
-                                    old_path = Config.ROOT_DIR / "static" / previous
-                                    try:
-                                        old_path.unlink()
-                                    except FileNotFoundError:
-                                        pass
                                 rel_path = f"uploads/profile_photos/{unique_name}"
                                 db.update_user_profile(viewer["id"], profile_image_path=rel_path)
+                                # Remove previous avatar once nothing points at it
+                                previous = viewer.get("profile_image_path")
+                                if previous:
+                                    _AVATAR_CLEANUP_POOL.submit(
+                                        _remove_old_avatar, Config.ROOT_DIR / "static" / previous
+                                    )
                                 flash("Profile photo updated.", "success")
             else:
                 flash("Unknown form submission.", "error")
         except Exception as exc:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Warning: unable to update profile: {exc}")
             flash(f"Unable to update profile: {exc}", "error")
-        finally:
-            if db:
-                db.close()
 
         return redirect(url_for("pages.profile_settings"))
 
-    common_timezones = [
-        "US/Pacific", "US/Mountain", "US/Central", "US/Eastern",
-        "US/Arizona", "US/Hawaii", "Canada/Eastern", "Europe/London",
-        "Europe/Paris", "Asia/Tokyo", "Australia/Sydney"
-    ]
+    # Only the GET render needs the stored preferences, so decode them here
+    notification_prefs = viewer.get("notification_preferences") or {}
+    if isinstance(notification_prefs, str):
+        try:
+            notification_prefs = json.loads(notification_prefs)
+        except ValueError:
+            notification_prefs = {}
+    if not isinstance(notification_prefs, dict):
+        notification_prefs = {}
 
     return render_template(
         "profile_settings.html",
         notification_prefs=notification_prefs,
-        timezones=common_timezones
+        timezones=COMMON_TIMEZONES
     )
 
 
 @bp.route('/terms-of-service')
 def terms_of_service():
     """Terms of Service page"""
-    from datetime import datetime
-    from app.config import Config
-    return render_template('terms_of_service.html', 
-                         current_date=datetime.now().strftime('%B %d, %Y'),
-                         contact_email=Config.CONTACT_EMAIL)
+    return _render_static('terms_of_service.html',
+                          current_date=datetime.now().strftime('%B %d, %Y'),
+                          contact_email=Config.CONTACT_EMAIL)
 
 
 @bp.route('/privacy-policy')
 def privacy_policy():
     """Privacy Policy page"""
-    from datetime import datetime
-    from app.config import Config
-    return render_template('privacy_policy.html',
-                         current_date=datetime.now().strftime('%B %d, %Y'),
-                         contact_email=Config.CONTACT_EMAIL)
+    return _render_static('privacy_policy.html',
+                          current_date=datetime.now().strftime('%B %d, %Y'),
+                          contact_email=Config.CONTACT_EMAIL)
 
 
 @bp.route('/contact-us')
 def contact_us():
     """Contact Us page"""
-    from app.config import Config
-    return render_template('contact_us.html', contact_email=Config.CONTACT_EMAIL)
+    return _render_static('contact_us.html', contact_email=Config.CONTACT_EMAIL)
@@ -1,10 +1,13 @@
 """
 Report routes
 """
+import heapq
 import os
-import threading
+import traceback
+import uuid
+import zipfile
 from pathlib import Path
-from flask import Blueprint, request, jsonify, send_file, redirect, url_for, flash
+from flask import Blueprint, Response, request, jsonify, send_file, redirect, url_for, flash
 from datetime import datetime
 from app.config import Config
 from app.utils.helpers import clean_str, parse_bool
@@ -16,11 +19,53 @@ from app.services.report_service import (
     parse_pitcher_entry,
     generate_batch_reports,
     generate_batch_pitcher_reports,
-    job_status
+    get_job_status,
+    set_job_status,
+    REPORT_EXECUTOR
 )
 
 bp = Blueprint('reports', __name__)
 
+# Batch ZIPs are streamed to the client in chunks of this size
+ZIP_COPY_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipOutput:
+    """Write-only sink for zipfile; the streamed bytes are drained between chunks."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_zip(files):
+    """Yield an uncompressed ZIP of (path, arcname) pairs, one chunk at a time."""
+    output = _ZipOutput()
+    # PDFs barely compress, so entries are stored as-is
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+        for path, arcname in files:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            with open(path, "rb") as src, archive.open(info, "w") as dest:
+                while True:
+                    chunk = src.read(ZIP_COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    yield output.drain()
+    # Central directory, written on close
+    yield output.drain()
+
 
 @bp.route('/generate', methods=['POST'])
 def generate():
@@ -48,7 +93,6 @@ def generate():
             return jsonify({"error": "Please enter at least one player name"}), 400
         
         # Generate a unique job ID
-        import uuid
         job_id = str(uuid.uuid4())
         
         # Get default parameters (used if not specified per-player)
@@ -66,7 +110,7 @@ def generate():
         
         if is_batch:
             # Initialize batch job status
-            job_status[job_id] = {
+            set_job_status(job_id, {
                 "status": "queued",
                 "message": f"Queued batch of {len(entries)} players...",
                 "total": len(entries),
@@ -74,13 +118,10 @@ def generate():
                 "failed": 0,
                 "pdfs": [],
                 "errors": []
-            }
+            })
             
-            # Start background thread for batch processing
-            thread = threading.Thread(
-                target=generate_batch_reports,
-                args=(entries, default_team, season_start, use_next_series, default_opponent, job_id)
-            )
+            # Queue each entry on the report pool
+            generate_batch_reports(entries, default_team, season_start, use_next_series, default_opponent, job_id)
         else:
             # Single report (backward compatible)
             # Parse the entry in case it has team/opponent specified
@@ -91,24 +132,20 @@ def generate():
             player_team = team if team else default_team
             player_opponent = opponent if opponent else default_opponent
             
-            job_status[job_id] = {"status": "queued", "message": "Queued for processing..."}
+            set_job_status(job_id, {"status": "queued", "message": "Queued for processing..."})
             
-            # Start background thread
-            thread = threading.Thread(
-                target=generate_report_background,
-                args=(hitter_name, player_team, season_start, use_next_series, player_opponent, job_id)
+            # Queue on the report pool
+            REPORT_EXECUTOR.submit(
+                generate_report_background,
+                hitter_name, player_team, season_start, use_next_series, player_opponent, job_id
             )
         
-        thread.daemon = True
-        thread.start()
-        
         return jsonify({
             "job_id": job_id,
             "is_batch": is_batch,
             "total": len(entries) if is_batch else 1
         })
     except Exception as e:
-        import traceback
         error_msg = str(e)
         traceback.print_exc()
         return jsonify({"error": f"Server error: {error_msg}"}), 500
@@ -140,7 +177,6 @@ def generate_pitcher():
             return jsonify({"error": "Please enter at least one pitcher name"}), 400
         
         # Generate a unique job ID
-        import uuid
         job_id = str(uuid.uuid4())
         
         # Get default parameters (used if not specified per-player)
@@ -158,7 +194,7 @@ def generate_pitcher():
         
         if is_batch:
             # Initialize batch job status
-            job_status[job_id] = {
+            set_job_status(job_id, {
                 "status": "queued",
                 "message": f"Queued batch of {len(entries)} pitchers...",
                 "total": len(entries),
@@ -166,13 +202,10 @@ def generate_pitcher():
                 "failed": 0,
                 "pdfs": [],
                 "errors": []
-            }
+            })
             
-            # Start background thread for batch processing
-            thread = threading.Thread(
-                target=generate_batch_pitcher_reports,
-                args=(entries, default_team, season_start, use_next_series, default_opponent, job_id)
-            )
+            # Queue each entry on the report pool
+            generate_batch_pitcher_reports(entries, default_team, season_start, use_next_series, default_opponent, job_id)
         else:
             # Single report
             # Parse the entry in case it has team/opponent specified
@@ -183,24 +216,20 @@ def generate_pitcher():
             player_team = team if team else default_team
             player_opponent = opponent if opponent else default_opponent
             
-            job_status[job_id] = {"status": "queued", "message": "Queued for processing..."}
+            set_job_status(job_id, {"status": "queued", "message": "Queued for processing..."})
             
-            # Start background thread
-            thread = threading.Thread(
-                target=generate_pitcher_report_background,
-                args=(pitcher_name, player_team, season_start, use_next_series, player_opponent, job_id)
+            # Queue on the report pool
+            REPORT_EXECUTOR.submit(
+                generate_pitcher_report_background,
+                pitcher_name, player_team, season_start, use_next_series, player_opponent, job_id
             )
         
-        thread.daemon = True
-        thread.start()
-        
         return jsonify({
             "job_id": job_id,
             "is_batch": is_batch,
             "total": len(entries) if is_batch else 1
         })
     except Exception as e:
-        import traceback
         error_msg = str(e)
         traceback.print_exc()
         return jsonify({"error": f"Error generating pitcher report: {error_msg}"}), 500
@@ -209,31 +238,20 @@ def generate_pitcher():
 @bp.route('/status/<job_id>')
 def status(job_id):
     """Check the status of a job"""
-    if job_id not in job_status:
+    status_info = get_job_status(job_id)
+    if status_info["status"] == "not_found":
         return jsonify({"error": "Job not found"}), 404
     
-    status_info = job_status[job_id].copy()
-    
-    # Clean up old completed/error jobs (keep last 10)
-    if status_info.get("status") in ["completed", "error"]:
-        completed_jobs = [jid for jid, info in job_status.items() 
-                         if info.get("status") in ["completed", "error"]]
-        if len(completed_jobs) > 10:
-            oldest = completed_jobs[0]
-            if oldest != job_id:
-                del job_status[oldest]
-    
     return jsonify(status_info)
 
 
 @bp.route('/download/<job_id>')
 def download(job_id):
     """Download the generated PDF (for single reports)"""
-    if job_id not in job_status:
+    status_info = get_job_status(job_id)
+    if status_info["status"] == "not_found":
         return jsonify({"error": "Job not found"}), 404
     
-    status_info = job_status[job_id]
-    
     if status_info.get("status") != "completed":
         return jsonify({"error": "Report not ready yet"}), 400
     
@@ -251,11 +269,10 @@ def download(job_id):
 @bp.route('/download/<job_id>/<int:pdf_index>')
 def download_batch_pdf(job_id, pdf_index):
     """Download a specific PDF from a batch"""
-    if job_id not in job_status:
+    status_info = get_job_status(job_id)
+    if status_info["status"] == "not_found":
         return jsonify({"error": "Job not found"}), 404
     
-    status_info = job_status[job_id]
-    
     if status_info.get("status") != "completed":
         return jsonify({"error": "Batch not ready yet"}), 400
     
@@ -276,6 +293,32 @@ def download_batch_pdf(job_id, pdf_index):
     )
 
 
+@bp.route('/download/<job_id>/all.zip')
+def download_batch_zip(job_id):
+    """Download every PDF from a batch as one ZIP"""
+    status_info = get_job_status(job_id)
+    if status_info["status"] == "not_found":
+        return jsonify({"error": "Job not found"}), 404
+    
+    if status_info.get("status") not in ("completed", "partial"):
+        return jsonify({"error": "Batch not ready yet"}), 400
+    
+    files = {}
+    for pdf_info in status_info.get("pdfs", []):
+        pdf_path = pdf_info.get("pdf_path")
+        if pdf_path and Path(pdf_path).is_file():
+            # Entries for the same report share a filename; archive it once
+            files.setdefault(pdf_info.get("pdf_filename") or Path(pdf_path).name, pdf_path)
+    if not files:
+        return jsonify({"error": "PDF files not found"}), 404
+    
+    return Response(
+        _stream_zip((path, arcname) for arcname, path in files.items()),
+        mimetype="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="reports.zip"'}
+    )
+
+
 @bp.route('/reports/files/<path:filename>')
 @login_required
 def download_report_file(filename):
@@ -292,13 +335,25 @@ def download_report_file(filename):
 @bp.route('/reports')
 def list_reports():
     """List all available reports"""
-    pdf_files = sorted(Config.PDF_OUTPUT_DIR.glob("*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True)
+    # One stat per file; DirEntry avoids building Path objects
+    try:
+        with os.scandir(Config.PDF_OUTPUT_DIR) as it:
+            pdf_stats = [(entry.name, entry.stat()) for entry in it if entry.name.endswith(".pdf")]
+    except FileNotFoundError:
+        pdf_stats = []
     reports = [
         {
-            "name": pdf.name,
-            "size": pdf.stat().st_size,
-            "created": datetime.fromtimestamp(pdf.stat().st_mtime).isoformat()
+            "name": name,
+            "size": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_mtime).isoformat()
         }
-        for pdf in pdf_files[:20]  # Last 20 reports
+        for name, stat in heapq.nlargest(20, pdf_stats, key=lambda item: item[1].st_mtime)  # Last 20 reports
     ]
-    return jsonify({"reports": reports})
+    response = jsonify({"reports": reports})
+    # Reports are regenerated in place under the same name, which leaves the
+    # directory mtime unchanged, so the ETag comes from the listing itself
+    response.add_etag()
+    # Login-only listing: browser cache only, never a shared proxy
+    response.cache_control.private = True
+    response.cache_control.max_age = 30
+    return response.make_conditional(request)
@@ -3,17 +3,76 @@ Analytics service for league leaders, standings, and team metadata
 """
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import statsapi
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 
 from app.config import Config
-from app.constants import TEAM_ABBR_TO_ID, DIVISION_OPTIONS, LEAGUE_OPTIONS, LEADER_CATEGORY_ABBR
+from app.constants import (
+    TEAM_ABBR_TO_ID, DIVISION_OPTIONS, LEAGUE_OPTIONS, LEADER_CATEGORY_ABBR,
+    LEADER_CATEGORY_RESPONSE_NAMES,
+)
 from app.services.cache_service import cache_service, CACHE_LEAGUE_LEADERS, CACHE_STANDINGS, CACHE_TEAM_METADATA
 
 logger = logging.getLogger(__name__)
 
+# Columns in statsapi.league_leaders text output are separated by 2+ spaces
+LEADER_COLUMN_SPLIT = re.compile(r"\s{2,}")
+
+# Keep-alive session for direct stats API calls; the pool covers the concurrent leader fetches
+_STATS_API_SESSION = requests.Session()
+_STATS_API_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2))
+)
+_STATS_API_SESSION.headers.update({"Accept": "application/json", "User-Agent": "SequenceBioLab/1.0"})
+
+# Background refreshes in flight, keyed by (cache name, key)
+_REFRESHING = set()
+_REFRESHING_LOCK = threading.Lock()
+_refresh_state = threading.local()
+
+
+def _refresh_in_background(refresh_key: tuple, loader, *args) -> None:
+    """Run loader(*args) on a daemon thread unless that key is already refreshing."""
+    with _REFRESHING_LOCK:
+        if refresh_key in _REFRESHING:
+            return
+        _REFRESHING.add(refresh_key)
+
+    def run():
+        _refresh_state.active = True
+        try:
+            loader(*args)
+        except Exception as exc:
+            logger.warning(f"Background refresh of {refresh_key[0]} failed: {exc}")
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING.discard(refresh_key)
+
+    threading.Thread(target=run, daemon=True, name=f"refresh-{refresh_key[0]}").start()
+
+
+def _cached_or_stale(cache_name: str, key: Any, loader, *args) -> Any:
+    """Fresh cached value, else the expired one while loader(*args) reloads it.
+
+    Keeps slow MLB API calls off the request thread once a value has been
+    loaded. Returns None (caller loads synchronously) when nothing was ever
+    cached, or when called from the refresh thread itself.
+    """
+    cached = cache_service.get(cache_name, key)
+    if cached is not None or getattr(_refresh_state, "active", False):
+        return cached
+    stale = cache_service.get_stale(cache_name, key)
+    if stale is not None:
+        _refresh_in_background((cache_name, key), loader, *args)
+    return stale
+
 
 def get_team_metadata(team_abbr: Optional[str]) -> Dict[str, Any]:
     """Fetch MLB metadata for a given team abbreviation."""
@@ -21,7 +80,7 @@ def get_team_metadata(team_abbr: Optional[str]) -> Dict[str, Any]:
     if not team_id:
         return {}
     cache_key = (team_abbr or "").upper()
-    cached = cache_service.get(CACHE_TEAM_METADATA, cache_key)
+    cached = _cached_or_stale(CACHE_TEAM_METADATA, cache_key, get_team_metadata, team_abbr)
     if cached is not None:
         return cached
     try:
@@ -41,7 +100,8 @@ def get_team_metadata(team_abbr: Optional[str]) -> Dict[str, Any]:
         return payload
     except Exception as exc:
         logger.warning(f"Warning fetching team metadata: {exc}")
-        payload = {"team_id": team_id}
+        # Keep serving the last full payload rather than degrading to the id only
+        payload = cache_service.get_stale(CACHE_TEAM_METADATA, cache_key) or {"team_id": team_id}
         cache_service.set(CACHE_TEAM_METADATA, cache_key, payload, ttl_seconds=900)
         return payload
 
@@ -53,9 +113,11 @@ def parse_leader_lines(raw_text: str, max_entries: int = 5) -> List[Dict[str, An
         return entries
 
     for line in raw_text.splitlines():
-        if line.startswith("Rank") or not line.strip():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("Rank"):
             continue
-        parts = re.split(r"\s{2,}", line.strip())
+        # Only the first four columns are used
+        parts = LEADER_COLUMN_SPLIT.split(stripped, maxsplit=4)
         if len(parts) < 4:
             continue
         rank, name, team, value = parts[:4]
@@ -87,10 +149,10 @@ def filter_leader_entries(entries: List[Dict[str, Any]], include_pitchers: bool
     return filtered[:5]
 
 
-def fetch_leader_entries(category: str, stat_group: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Fetch structured leader data directly from the MLB stats API."""
+def _request_leaders(categories: str, stat_group: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+    """leagueLeaders blocks for comma-separated categories, or None if the request failed."""
     params = {
-        "leaderCategories": category,
+        "leaderCategories": categories,
         "season": datetime.now().year,
         "sportId": 1,
         "statGroup": stat_group,
@@ -99,7 +161,7 @@ def fetch_leader_entries(category: str, stat_group: str, limit: int = 5) -> List
         "limit": max(limit, 5),
     }
     try:
-        resp = requests.get(
+        resp = _STATS_API_SESSION.get(
             "https://statsapi.mlb.com/api/v1/stats/leaders",
             params=params,
             timeout=6
@@ -107,15 +169,16 @@ def fetch_leader_entries(category: str, stat_group: str, limit: int = 5) -> List
         resp.raise_for_status()
         payload = resp.json()
     except requests.RequestException as exc:
-        logger.warning(f"Warning fetching leaders {category}/{stat_group}: {exc}")
-        return []
+        logger.warning(f"Warning fetching leaders {categories}/{stat_group}: {exc}")
+        return None
+
+    return payload.get("leagueLeaders") or []
 
-    leaders_block = (payload.get("leagueLeaders") or [])
-    if not leaders_block:
-        return []
 
+def _leader_rows(leaders_block: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """Structured rows from one leagueLeaders block."""
     leaders = []
-    for entry in leaders_block[0].get("leaders", [])[:limit]:
+    for entry in leaders_block.get("leaders", [])[:limit]:
         person = entry.get("person") or {}
         team = entry.get("team") or {}
         leaders.append({
@@ -129,9 +192,32 @@ def fetch_leader_entries(category: str, stat_group: str, limit: int = 5) -> List
     return leaders
 
 
+def fetch_leader_entries(category: str, stat_group: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Fetch structured leader data directly from the MLB stats API."""
+    leaders_block = _request_leaders(category, stat_group, limit)
+    if not leaders_block:
+        return []
+    return _leader_rows(leaders_block[0], limit)
+
+
+def fetch_leader_boards(categories: List[str], stat_group: str, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+    """Leader rows for several categories of one stat group from a single request."""
+    blocks = _request_leaders(",".join(categories), stat_group, limit)
+    if blocks is None:
+        return {category: [] for category in categories}
+
+    by_category = {block.get("leaderCategory"): block for block in blocks}
+    boards = {}
+    for category in categories:
+        block = by_category.get(LEADER_CATEGORY_RESPONSE_NAMES.get(category, category))
+        # A category the response doesn't name is fetched on its own
+        boards[category] = _leader_rows(block, limit) if block is not None else fetch_leader_entries(category, stat_group, limit)
+    return boards
+
+
 def collect_league_leaders() -> List[Dict[str, Any]]:
     """Get curated hitting and pitching leaderboards."""
-    cached = cache_service.get(CACHE_LEAGUE_LEADERS, "default")
+    cached = _cached_or_stale(CACHE_LEAGUE_LEADERS, "default", collect_league_leaders)
     if cached is not None:
         return cached
 
@@ -148,12 +234,17 @@ def collect_league_leaders() -> List[Dict[str, Any]]:
         ])
     ]
 
+    # One request per stat group, both in flight at once
+    stat_groups = ["hitting" if group_label.startswith("Hitting") else "pitching" for group_label, _ in groups]
+    category_codes = [[stat_code for stat_code, _ in categories] for _, categories in groups]
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        group_boards = list(executor.map(fetch_leader_boards, category_codes, stat_groups))
+
     result = []
-    for group_label, categories in groups:
+    for (group_label, categories), boards in zip(groups, group_boards):
         category_entries = []
         for stat_code, label in categories:
-            stat_group = "hitting" if group_label.startswith("Hitting") else "pitching"
-            entries = fetch_leader_entries(stat_code, stat_group)
+            entries = boards[stat_code]
             if group_label.startswith("Hitting"):
                 entries = filter_leader_entries(entries, include_pitchers=False)
             else:
@@ -174,6 +265,25 @@ def collect_league_leaders() -> List[Dict[str, Any]]:
     return result
 
 
+def _games_back(value: Any) -> Any:
+    """Games back as shown in the table; blank or "-" (the leader) becomes "0"."""
+    return "0" if value in (None, "-", "") else value
+
+
+def _standings_rows(team_records: List[Dict[str, Any]], games_back_field: str, team_id: Optional[int]) -> List[Dict[str, Any]]:
+    """Table rows for standings team records, in the given order."""
+    return [
+        {
+            "team": entry.get("team", {}).get("name"),
+            "wins": entry.get("wins"),
+            "losses": entry.get("losses"),
+            "games_back": _games_back(entry.get(games_back_field)),
+            "is_user_team": entry.get("team", {}).get("id") == team_id
+        }
+        for entry in team_records
+    ]
+
+
 def collect_standings_data(
     view: str,
     team_metadata: Dict[str, Any],
@@ -188,7 +298,7 @@ def collect_standings_data(
     if view == "wildcard":
         league_id = int(league_id or default_league_id or 104)
         cache_key = ("wildcard", team_id, None, league_id)
-        cached = cache_service.get(CACHE_STANDINGS, cache_key)
+        cached = _cached_or_stale(CACHE_STANDINGS, cache_key, collect_standings_data, view, team_metadata, division_id, league_id)
         if cached is not None:
             return cached
         try:
@@ -210,29 +320,15 @@ def collect_standings_data(
             return None
 
         def rank_key(entry):
-            try:
-                return int(entry.get("wildCardRank", 999))
-            except (TypeError, ValueError):
-                return 999
+            # Ranks arrive as digit strings; missing or "-" sorts last
+            rank = str(entry.get("wildCardRank", "")).strip()
+            return int(rank) if rank.isdecimal() else 999
 
         team_records.sort(key=rank_key)
 
-        rows = []
-        for entry in team_records:
-            gb = entry.get("wildCardGamesBack")
-            if gb in (None, "-", ""):
-                gb = "0"
-            rows.append({
-                "team": entry.get("team", {}).get("name"),
-                "wins": entry.get("wins"),
-                "losses": entry.get("losses"),
-                "games_back": gb,
-                "is_user_team": entry.get("team", {}).get("id") == team_id
-            })
-
         payload = {
             "title": f"{next((l['name'] for l in LEAGUE_OPTIONS if l['id'] == league_id), 'League')} Wild Card",
-            "rows": rows,
+            "rows": _standings_rows(team_records, "wildCardGamesBack", team_id),
             "view": "wildcard",
             "division_id": None,
             "league_id": league_id
@@ -254,7 +350,7 @@ def collect_standings_data(
 
     league_id = int(league_id)
     cache_key = ("division", team_id, division_id, league_id)
-    cached = cache_service.get(CACHE_STANDINGS, cache_key)
+    cached = _cached_or_stale(CACHE_STANDINGS, cache_key, collect_standings_data, view, team_metadata, division_id, league_id)
     if cached is not None:
         return cached
 
@@ -276,22 +372,9 @@ def collect_standings_data(
     if not division_record:
         return None
 
-    rows = []
-    for entry in division_record.get("teamRecords", []):
-        gb = entry.get("gamesBack")
-        if gb in (None, "-", ""):
-            gb = "0"
-        rows.append({
-            "team": entry.get("team", {}).get("name"),
-            "wins": entry.get("wins"),
-            "losses": entry.get("losses"),
-            "games_back": gb,
-            "is_user_team": entry.get("team", {}).get("id") == team_id
-        })
-
     payload = {
         "title": division_record.get("division", {}).get("name", "Division"),
-        "rows": rows,
+        "rows": _standings_rows(division_record.get("teamRecords", []), "gamesBack", team_id),
         "view": "division",
         "division_id": division_id,
         "league_id": league_id
@@ -23,10 +23,14 @@ class CacheService:
         if expires_at and expires_at > datetime.utcnow():
             return value
         
-        # Expired, remove it
-        cache.pop(key, None)
+        # Expired; the entry stays until overwritten so get_stale can serve it
         return None
     
+    def get_stale(self, cache_name: str, key: Any) -> Any:
+        """Get a value from cache even if it has expired."""
+        entry = self._caches.get(cache_name, {}).get(key)
+        return entry[0] if entry else None
+    
     def set(self, cache_name: str, key: Any, value: Any, ttl_seconds: int) -> None:
         """Set a value in cache with TTL."""
         cache = self._caches[cache_name]
@@ -50,4 +54,6 @@ CACHE_LEAGUE_LEADERS = "league_leaders"
 CACHE_STANDINGS = "standings"
 CACHE_TEAM_METADATA = "team_metadata"
 CACHE_PLAYER_NEWS = "player_news"
+CACHE_SEASON_MONTHS = "season_months"
+CACHE_ADMIN_USERS = "admin_users"
 
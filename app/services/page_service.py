@@ -5,7 +5,7 @@ import os
 import re
 import textwrap
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Set, Tuple
 from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
 from flask import current_app, url_for
@@ -15,10 +15,10 @@ import requests
 import statsapi
 
 from app.config import Config
-from app.utils.formatters import coerce_utc_datetime
+from app.utils.formatters import coerce_utc_datetime, format_timestamp_human
 from app.services.player_service import determine_user_team
 from app.services.schedule_service import collect_series_for_team, team_abbr_from_id
-from app.services.cache_service import cache_service, CACHE_UPCOMING_GAMES, CACHE_PLAYER_NEWS
+from app.services.cache_service import cache_service, CACHE_UPCOMING_GAMES, CACHE_PLAYER_NEWS, CACHE_SEASON_MONTHS
 
 # Import PlayerDB and next_games if available
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
@@ -72,7 +72,7 @@ def _format_staff_note(note: Dict[str, Any]) -> Dict[str, Any]:
         if not ts:
             return None
         try:
-            return datetime.fromtimestamp(ts).strftime("%b %d, %Y %I:%M %p")
+            return format_timestamp_human(ts)
         except Exception:
             return None
 
@@ -350,6 +350,32 @@ def load_full_season_schedule(user: Dict[str, Any], start_date: Optional[str] =
         return []
 
 
+def load_season_months(user: Dict[str, Any]) -> Set[Tuple[int, int]]:
+    """(year, month) pairs with games in the user's full-season schedule.
+
+    Cached per team for 5 minutes so month-to-month navigation on the
+    schedule page does not reload the whole season on every click.
+    """
+    cache_key = (determine_user_team(user), _get_use_mock_schedule(), datetime.now().year)
+    cached = cache_service.get(CACHE_SEASON_MONTHS, cache_key)
+    if cached is not None:
+        return set(cached)
+
+    months = set()
+    for game in load_full_season_schedule(user):
+        game_date = game.get("game_date")
+        if game_date:
+            try:
+                dt = date.fromisoformat(str(game_date)[:10])
+                months.add((dt.year, dt.month))
+            except Exception:
+                continue
+
+    # An empty result usually means the schedule API failed; retry sooner
+    cache_service.set(CACHE_SEASON_MONTHS, cache_key, frozenset(months), ttl_seconds=300 if months else 60)
+    return months
+
+
 def format_player_document(doc: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize player document metadata."""
     uploaded_ts = doc.get("uploaded_at")
@@ -361,7 +387,7 @@ def format_player_document(doc: Dict[str, Any]) -> Dict[str, Any]:
         if not ts:
             return None
         try:
-            return datetime.fromtimestamp(ts).strftime("%b %d, %Y %I:%M %p")
+            return format_timestamp_human(ts)
         except Exception:
             return None
 
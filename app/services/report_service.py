@@ -5,8 +5,11 @@ import os
 import subprocess
 import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 from datetime import datetime, timezone
 from app.config import Config
 from app.utils.helpers import sanitize_filename_component
@@ -14,14 +17,36 @@ from app.utils.file_utils import report_exists_for_player
 from app.constants import REPORT_LEAD_DAYS
 from app.utils.formatters import extract_game_datetime
 
-# Global job status (replace with Redis in production)
-job_status: Dict[str, Any] = {}
+# Recent job statuses, least recently used first (replace with Redis in production)
+job_status: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_job_status_lock = threading.Lock()
+MAX_TRACKED_JOBS = 50
+# Only jobs in these states are dropped to stay under MAX_TRACKED_JOBS
+_FINISHED_JOB_STATES = frozenset({"completed", "partial", "error"})
+
+# Shared pool for report jobs; bounds how many report subprocesses run at once
+REPORT_EXECUTOR = ThreadPoolExecutor(max_workers=Config.REPORT_WORKERS, thread_name_prefix="report")
 
 # Pending report keys (for preventing duplicate reports)
 _pending_report_keys: set = set()
 _pending_report_lock = threading.Lock()
 
 
+def set_job_status(job_id: str, info: Dict[str, Any]) -> None:
+    """Record a job's status, dropping the least recently used finished jobs past MAX_TRACKED_JOBS.
+
+    Queued and running jobs are never dropped, so their /status polls keep working.
+    """
+    with _job_status_lock:
+        job_status[job_id] = info
+        job_status.move_to_end(job_id)
+        excess = len(job_status) - MAX_TRACKED_JOBS
+        if excess > 0:
+            finished = [key for key, entry in job_status.items() if entry.get("status") in _FINISHED_JOB_STATES]
+            for key in finished[:excess]:
+                del job_status[key]
+
+
 def generate_single_report(
     hitter_name: str,
     team: str = "AUTO",
@@ -203,20 +228,21 @@ def generate_report_background(
     if job_id is None:
         job_id = str(uuid.uuid4())
     
+    set_job_status(job_id, {"status": "running", "message": "Generating report..."})
     result = generate_single_report(hitter_name, team, season_start, use_next_series, opponent_team)
     
     if result["success"]:
-        job_status[job_id] = {
+        set_job_status(job_id, {
             "status": "completed",
             "message": "Report generated successfully!",
             "pdf_path": result["pdf_path"],
             "pdf_filename": result["pdf_filename"]
-        }
+        })
     else:
-        job_status[job_id] = {
+        set_job_status(job_id, {
             "status": "error",
             "message": result.get("error", "Unknown error")
-        }
+        })
 
 
 def parse_player_entry(entry: str) -> tuple:
@@ -233,71 +259,106 @@ def parse_player_entry(entry: str) -> tuple:
     return player_name, team, opponent
 
 
-def generate_batch_reports(
-    player_entries: List[str],
+def _run_batch(
+    entries: List[str],
+    parse_entry: Callable[[str], tuple],
+    generate_one: Callable[..., Dict[str, Any]],
+    name_key: str,
+    noun: str,
     default_team: str,
     season_start: str,
     use_next_series: bool,
     default_opponent: Optional[str],
     job_id: str
 ) -> None:
-    """Generate reports for multiple players with individual settings"""
-    total = len(player_entries)
-    completed = 0
-    failed = 0
-    pdfs = []
-    errors = []
-    
-    for i, entry in enumerate(player_entries):
-        # Parse player entry
-        hitter_name, team, opponent = parse_player_entry(entry)
-        
-        if not hitter_name:
-            failed += 1
-            errors.append(f"Entry {i+1}: Invalid player name")
+    """Queue one REPORT_EXECUTOR job per batch entry and track them in job_status.
+
+    Returns once the entries are queued. Each finished report updates the
+    batch's progress, and the last one writes the final status with pdfs and
+    errors in entry order.
+    """
+    total = len(entries)
+    # (name, result) per entry, filled in as reports finish
+    outcomes: List[Optional[tuple]] = [None] * total
+    queued = []
+    for i, entry in enumerate(entries):
+        name, team, opponent = parse_entry(entry)
+        if not name:
+            outcomes[i] = (None, {"success": False, "error": f"Entry {i+1}: Invalid {noun} name"})
             continue
-        
-        # Use entry-specific settings or defaults
-        player_team = team if team else default_team
-        player_opponent = opponent if opponent else default_opponent
-        
-        # Update job status
-        status_msg = f"Generating report {i+1} of {total}: {hitter_name}"
-        job_status[job_id] = {
-            "status": "processing",
-            "message": status_msg,
+        queued.append((i, name, team if team else default_team, opponent if opponent else default_opponent))
+
+    lock = threading.Lock()
+    remaining = len(queued)
+
+    def update_status() -> None:
+        done = [outcome for outcome in outcomes if outcome is not None]
+        completed = sum(1 for _, result in done if result["success"])
+        failed = len(done) - completed
+        if remaining:
+            set_job_status(job_id, {
+                "status": "processing",
+                "message": f"Processed {len(done)} of {total} reports",
+                "total": total,
+                "completed": completed,
+                "failed": failed
+            })
+            return
+        pdfs = []
+        errors = []
+        for name, result in done:
+            if result["success"]:
+                pdfs.append({
+                    name_key: name,
+                    "pdf_path": result["pdf_path"],
+                    "pdf_filename": result["pdf_filename"]
+                })
+            elif name is None:
+                errors.append(result["error"])
+            else:
+                errors.append(f"{name}: {result.get('error', 'Unknown error')}")
+        set_job_status(job_id, {
+            "status": "completed" if failed == 0 else "partial",
+            "message": f"Completed {completed} of {total} reports" + (f" ({failed} failed)" if failed > 0 else ""),
             "total": total,
             "completed": completed,
             "failed": failed,
-            "current": i + 1
-        }
-        
-        # Generate single report
-        result = generate_single_report(
-            hitter_name, player_team, season_start, use_next_series, player_opponent
-        )
-        
-        if result["success"]:
-            completed += 1
-            pdfs.append({
-                "player": hitter_name,
-                "pdf_path": result["pdf_path"],
-                "pdf_filename": result["pdf_filename"]
-            })
-        else:
-            failed += 1
-            errors.append(f"{hitter_name}: {result.get('error', 'Unknown error')}")
-    
-    # Final status
-    job_status[job_id] = {
-        "status": "completed" if failed == 0 else "partial",
-        "message": f"Completed {completed} of {total} reports" + (f" ({failed} failed)" if failed > 0 else ""),
-        "total": total,
-        "completed": completed,
-        "failed": failed,
-        "pdfs": pdfs,
-        "errors": errors
-    }
+            "pdfs": pdfs,
+            "errors": errors
+        })
+
+    def record(index: int, name: str, future) -> None:
+        nonlocal remaining
+        try:
+            result = future.result()
+        except Exception as exc:
+            result = {"success": False, "error": f"Error: {exc}"}
+        with lock:
+            outcomes[index] = (name, result)
+            remaining -= 1
+            update_status()
+
+    if not queued:
+        update_status()
+        return
+    for index, name, team, opponent in queued:
+        future = REPORT_EXECUTOR.submit(generate_one, name, team, season_start, use_next_series, opponent)
+        future.add_done_callback(partial(record, index, name))
+
+
+def generate_batch_reports(
+    player_entries: List[str],
+    default_team: str,
+    season_start: str,
+    use_next_series: bool,
+    default_opponent: Optional[str],
+    job_id: str
+) -> None:
+    """Generate reports for multiple players with individual settings"""
+    _run_batch(
+        player_entries, parse_player_entry, generate_single_report, "player", "player",
+        default_team, season_start, use_next_series, default_opponent, job_id
+    )
 
 
 def generate_single_pitcher_report(
@@ -409,20 +470,21 @@ def generate_pitcher_report_background(
     if job_id is None:
         job_id = str(uuid.uuid4())
     
+    set_job_status(job_id, {"status": "running", "message": "Generating report..."})
     result = generate_single_pitcher_report(pitcher_name, team, season_start, use_next_series, opponent_team)
     
     if result["success"]:
-        job_status[job_id] = {
+        set_job_status(job_id, {
             "status": "completed",
             "message": "Report generated successfully!",
             "pdf_path": result["pdf_path"],
             "pdf_filename": result["pdf_filename"]
-        }
+        })
     else:
-        job_status[job_id] = {
+        set_job_status(job_id, {
             "status": "error",
             "message": result.get("error", "Unknown error")
-        }
+        })
 
 
 def parse_pitcher_entry(entry: str) -> tuple:
@@ -443,57 +505,10 @@ def generate_batch_pitcher_reports(
     job_id: str
 ) -> None:
     """Generate pitcher reports for multiple players with individual settings"""
-    total = len(pitcher_entries)
-    completed = 0
-    failed = 0
-    pdfs = []
-    errors = []
-    
-    for i, entry in enumerate(pitcher_entries):
-        pitcher_name, team, opponent = parse_pitcher_entry(entry)
-        
-        if not pitcher_name:
-            failed += 1
-            errors.append(f"Entry {i+1}: Invalid pitcher name")
-            continue
-        
-        player_team = team if team else default_team
-        player_opponent = opponent if opponent else default_opponent
-        
-        status_msg = f"Generating report {i+1} of {total}: {pitcher_name}"
-        job_status[job_id] = {
-            "status": "processing",
-            "message": status_msg,
-            "total": total,
-            "completed": completed,
-            "failed": failed,
-            "current": i + 1
-        }
-        
-        result = generate_single_pitcher_report(
-            pitcher_name, player_team, season_start, use_next_series, player_opponent
-        )
-        
-        if result["success"]:
-            completed += 1
-            pdfs.append({
-                "pitcher": pitcher_name,
-                "pdf_path": result["pdf_path"],
-                "pdf_filename": result["pdf_filename"]
-            })
-        else:
-            failed += 1
-            errors.append(f"{pitcher_name}: {result.get('error', 'Unknown error')}")
-    
-    job_status[job_id] = {
-        "status": "completed" if failed == 0 else "partial",
-        "message": f"Completed {completed} of {total} reports" + (f" ({failed} failed)" if failed > 0 else ""),
-        "total": total,
-        "completed": completed,
-        "failed": failed,
-        "pdfs": pdfs,
-        "errors": errors
-    }
+    _run_batch(
+        pitcher_entries, parse_pitcher_entry, generate_single_pitcher_report, "pitcher", "pitcher",
+        default_team, season_start, use_next_series, default_opponent, job_id
+    )
 
 
 def maybe_trigger_report(
@@ -550,13 +565,15 @@ def maybe_trigger_report(
             with _pending_report_lock:
                 _pending_report_keys.discard(key)
     
-    thread = threading.Thread(target=_worker, name=f"report-auto-{opponent_abbr}-{game.get('game_pk')}", daemon=True)
-    thread.start()
+    REPORT_EXECUTOR.submit(_worker)
 
 
 def get_job_status(job_id: str) -> Dict[str, Any]:
-    """Get job status by ID"""
-    if job_id not in job_status:
-        return {"status": "not_found"}
-    return job_status[job_id].copy()
+    """Get job status by ID, marking the job as recently used"""
+    with _job_status_lock:
+        info = job_status.get(job_id)
+        if info is None:
+            return {"status": "not_found"}
+        job_status.move_to_end(job_id)
+        return info.copy()
 
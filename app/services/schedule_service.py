@@ -38,8 +38,9 @@ def _team_directory() -> Dict[int, Dict[str, str]]:
     return directory
 
 
+@lru_cache(maxsize=128)
 def team_abbr_from_id(team_id: Optional[int]) -> Optional[str]:
-    """Get team abbreviation from team ID."""
+    """Get team abbreviation from team ID (memoized; the directory is fixed per process)."""
     if not team_id:
         return None
     return (_team_directory().get(int(team_id)) or {}).get("abbr")
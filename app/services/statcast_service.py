@@ -0,0 +1,57 @@
+"""
+Background Statcast downloads for the visual routes
+"""
+import logging
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+from app.config import Config
+from app.services.report_service import set_job_status
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+try:
+    from scrape_savant import fetch_batter_statcast
+except ImportError:
+    fetch_batter_statcast = None
+
+logger = logging.getLogger(__name__)
+
+# Savant downloads run here instead of on a gunicorn worker thread
+STATCAST_EXECUTOR = ThreadPoolExecutor(max_workers=Config.STATCAST_WORKERS, thread_name_prefix="statcast")
+
+# (batter_id, start, end) -> job_id of the download in flight, so concurrent
+# requests for the same range share one job
+_pending_fetches: Dict[Tuple[int, str, str], str] = {}
+_pending_fetch_lock = threading.Lock()
+
+
+def submit_batter_statcast_fetch(batter_id: int, start: str, end: str) -> str:
+    """Queue a batter range download and return the job_id to poll at /status/<job_id>."""
+    key = (batter_id, start, end)
+    with _pending_fetch_lock:
+        job_id = _pending_fetches.get(key)
+        if job_id is not None:
+            return job_id
+        job_id = str(uuid.uuid4())
+        _pending_fetches[key] = job_id
+        set_job_status(job_id, {"status": "queued", "message": "Queued Statcast download..."})
+    STATCAST_EXECUTOR.submit(_fetch_batter_statcast_job, key, job_id)
+    return job_id
+
+
+def _fetch_batter_statcast_job(key: Tuple[int, str, str], job_id: str) -> None:
+    """Download a batter range into the Statcast cache and record the outcome."""
+    set_job_status(job_id, {"status": "running", "message": "Downloading Statcast data..."})
+    try:
+        # Only the cache fill matters here; the route reads it back on its retry
+        fetch_batter_statcast(*key, columns=[])
+        set_job_status(job_id, {"status": "completed", "message": "Statcast data ready"})
+    except Exception as exc:
+        logger.warning(f"Statcast download failed for batter {key[0]} {key[1]}..{key[2]}: {exc}")
+        set_job_status(job_id, {"status": "error", "message": "Statcast download failed", "error": str(exc)})
+    finally:
+        with _pending_fetch_lock:
+            _pending_fetches.pop(key, None)
@@ -7,6 +7,8 @@ from collections import defaultdict
 from app.constants import JOURNAL_VISIBILITY_OPTIONS, MAX_JOURNAL_TIMELINE_ENTRIES
 from app.utils.helpers import clean_str
 
+_MONTH_ABBRS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 def normalize_journal_visibility(value: Optional[str], default: str = "private") -> str:
     """Normalize journal visibility value."""
@@ -43,7 +45,7 @@ def prepare_journal_timeline(entries: List[Dict[str, Any]]) -> List[Dict[str, An
         updated_at_human = None
         if updated_at_ts:
             try:
-                updated_at_human = datetime.fromtimestamp(updated_at_ts).strftime("%b %d, %Y %I:%M %p")
+                updated_at_human = format_timestamp_human(updated_at_ts)
             except (ValueError, OSError):
                 updated_at_human = None
         
@@ -81,7 +83,7 @@ def augment_journal_entry(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str,
     updated_at_ts = enriched.get("updated_at")
     if updated_at_ts:
         try:
-            enriched["updated_at_human"] = datetime.fromtimestamp(updated_at_ts).strftime("%b %d, %Y %I:%M %p")
+            enriched["updated_at_human"] = format_timestamp_human(updated_at_ts)
         except (ValueError, OSError):
             enriched["updated_at_human"] = None
     else:
@@ -91,6 +93,21 @@ def augment_journal_entry(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str,
     return enriched
 
 
+def find_timeline_entry(timeline: List[Dict[str, Any]], entry_date: Optional[str],
+                        visibility: str) -> Optional[Dict[str, Any]]:
+    """Return the entry for a date and visibility from prepare_journal_timeline output.
+
+    Timeline entries already carry the augment_journal_entry fields.
+    """
+    for day in timeline:
+        if day["date"] == entry_date:
+            for entry in day["entries"]:
+                if entry["visibility"] == visibility:
+                    return entry
+            return None
+    return None
+
+
 def format_journal_date(date_str: Optional[str]) -> Optional[str]:
     """Format a journal date string."""
     if not date_str:
@@ -101,6 +118,19 @@ def format_journal_date(date_str: Optional[str]) -> Optional[str]:
         return date_str
 
 
+def format_timestamp_human(ts: float) -> str:
+    """Local time for a Unix timestamp, e.g. "Mar 05, 2025 07:10 PM".
+
+    Same output as strftime("%b %d, %Y %I:%M %p") in the C locale, built
+    with an f-string since this runs once per row in several listings.
+    """
+    dt = datetime.fromtimestamp(ts)
+    return (
+        f"{_MONTH_ABBRS[dt.month - 1]} {dt.day:02}, {dt.year} "
+        f"{(dt.hour - 1) % 12 + 1:02}:{dt.minute:02} {'AM' if dt.hour < 12 else 'PM'}"
+    )
+
+
 def coerce_utc_datetime(value) -> Optional[datetime]:
     """Coerce a value into a UTC datetime."""
     if not value:
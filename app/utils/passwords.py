@@ -0,0 +1,50 @@
+"""
+Password hashing utilities
+
+New hashes use argon2id (argon2-cffi) when it is installed and fall back to
+werkzeug's default otherwise. Existing werkzeug hashes keep verifying and
+are upgraded on the next successful login (see needs_rehash).
+"""
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHash, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+# RFC 9106 low-memory profile (19 MiB, 2 passes): roughly 50 ms per hash
+_PASSWORD_HASHER = (
+    PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1) if PasswordHasher else None
+)
+_ARGON2_PREFIX = "$argon2"
+
+
+def hash_password(password: str) -> str:
+    """Hash a password for storage."""
+    if _PASSWORD_HASHER is not None:
+        return _PASSWORD_HASHER.hash(password)
+    return generate_password_hash(password)
+
+
+def verify_password(stored_hash: str, password: str) -> bool:
+    """Check a password against an argon2 or werkzeug hash."""
+    if not stored_hash:
+        return False
+    if stored_hash.startswith(_ARGON2_PREFIX):
+        if _PASSWORD_HASHER is None:
+            return False
+        try:
+            return _PASSWORD_HASHER.verify(stored_hash, password)
+        except (VerificationError, InvalidHash):
+            return False
+    return check_password_hash(stored_hash, password)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True if a verified hash should be replaced with a current argon2 hash."""
+    if _PASSWORD_HASHER is None or not stored_hash:
+        return False
+    if not stored_hash.startswith(_ARGON2_PREFIX):
+        return True
+    return _PASSWORD_HASHER.check_needs_rehash(stored_hash)
@@ -0,0 +1,45 @@
+"""
+Admin user rows cached on flask.g for the request and in cache_service
+for ADMIN_USERS_TTL_SECONDS across requests
+"""
+from typing import List, Dict, Any
+from flask import g
+
+from app.middleware.auth import get_request_db
+from app.services.cache_service import cache_service, CACHE_ADMIN_USERS
+
+# Bounds staleness in other workers; user changes in this worker invalidate directly
+ADMIN_USERS_TTL_SECONDS = 30
+
+
+def get_admin_user_rows() -> List[Dict[str, Any]]:
+    """All users for the admin user selectors, queried at most once per request.
+
+    Rows are also kept in the process cache for ADMIN_USERS_TTL_SECONDS and
+    shared between requests, so callers must not mutate them. Uses the
+    request's shared PlayerDB, which the auth middleware closes on teardown.
+    Errors propagate and are not cached.
+    """
+    rows = g.get("_admin_user_rows")
+    if rows is None:
+        rows = cache_service.get(CACHE_ADMIN_USERS, "all")
+        if rows is None:
+            rows = get_request_db().list_users()
+            cache_service.set(CACHE_ADMIN_USERS, "all", rows, ttl_seconds=ADMIN_USERS_TTL_SECONDS)
+        g._admin_user_rows = rows
+    return rows
+
+
+def get_admin_users_by_id() -> Dict[int, Dict[str, Any]]:
+    """get_admin_user_rows() keyed by user id, built once per request."""
+    users_by_id = g.get("_admin_users_by_id")
+    if users_by_id is None:
+        users_by_id = g._admin_users_by_id = {row["id"]: row for row in get_admin_user_rows()}
+    return users_by_id
+
+
+def invalidate_admin_user_rows() -> None:
+    """Forget the cached user list after a user is created, changed or deleted."""
+    cache_service.clear(CACHE_ADMIN_USERS)
+    g.pop("_admin_user_rows", None)
+    g.pop("_admin_users_by_id", None)
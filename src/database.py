@@ -8,7 +8,8 @@ import json
 import threading
 import socket
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
+from contextlib import contextmanager
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -151,6 +152,7 @@ class PlayerDB:
         self.db_path = Path(db_path)
         self._from_pool = False  # Track if connection came from pool
         self._semaphore_acquired = False  # Track if we acquired semaphore
+        self._transaction_depth = 0  # Open transaction() blocks; commits are deferred while > 0
         
         if self.is_postgres:
             # Get connection from pool (reuses existing connections)
@@ -332,6 +334,35 @@ class PlayerDB:
                     logger.error(f"Failed to get fresh connection from pool after {max_retries} attempts: {pool_err}")
                     raise
     
+    def _commit(self):
+        """Commit, unless inside transaction() (which commits once when it exits)"""
+        if not self._transaction_depth:
+            self.conn.commit()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run several writes as a single transaction.
+        
+        Method-level commits are deferred until the block exits; the whole
+        block is rolled back if it raises. SQLite takes the write lock up
+        front (BEGIN IMMEDIATE) so check-then-write sequences are atomic.
+        Nested blocks join the outer transaction.
+        """
+        if self._transaction_depth == 0 and not self.is_postgres and not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.conn.commit()
+    
     def _execute(self, cursor, query: str, params: tuple = None):
         """Execute query with proper parameter style and handle connection errors"""
         if self.is_postgres:
@@ -648,7 +679,7 @@ class PlayerDB:
         self._execute(cursor, f"CREATE INDEX IF NOT EXISTS idx_staff_notes_team ON staff_notes(team_abbr)")
         self._execute(cursor, f"CREATE INDEX IF NOT EXISTS idx_staff_notes_pinned ON staff_notes(pinned)")
         
-        self.conn.commit()
+        self._commit()
     
     def _ensure_columns_exist(self, table_name: str, columns: Dict[str, str]):
         """Ensure columns exist in table (for migrations)"""
@@ -665,7 +696,7 @@ class PlayerDB:
                         default = "DEFAULT 0"  # New accounts need email verification
                     self._execute(self.conn.cursor(), 
                         f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type} {default}")
-                    self.conn.commit()
+                    self._commit()
                 except Exception:
                     pass  # Column might already exist
     
@@ -716,7 +747,7 @@ class PlayerDB:
                 (team_id, abbreviation, name, city, league, division, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, params)
-        self.conn.commit()
+        self._commit()
     
     def upsert_player(self, player_data: Dict[str, Any]):
         """Insert or update player"""
@@ -783,7 +814,7 @@ class PlayerDB:
                  height, weight, birth_date, birth_place, debut_date, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, params)
-        self.conn.commit()
+        self._commit()
     
     def upsert_player_season(self, player_id: str, season: str, stats: Dict[str, Any]):
         """Insert or update player season stats"""
@@ -842,7 +873,7 @@ class PlayerDB:
                  avg, obp, slg, ops, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, params)
-        self.conn.commit()
+        self._commit()
     
     def search_players(self, search: Optional[str] = None, team: Optional[str] = None,
                       position: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
@@ -1002,7 +1033,7 @@ class PlayerDB:
             """, params)
             user_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return user_id
 
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
@@ -1050,7 +1081,7 @@ class PlayerDB:
             "UPDATE users SET is_admin = ?, updated_at = ? WHERE id = ?",
             (1 if is_admin else 0, datetime.now().timestamp(), user_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def set_user_active(self, user_id: int, is_active: bool) -> None:
         """Set user active/inactive status."""
@@ -1059,7 +1090,7 @@ class PlayerDB:
             "UPDATE users SET is_active = ?, updated_at = ? WHERE id = ?",
             (1 if is_active else 0, datetime.now().timestamp(), user_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def delete_user(self, user_id: int) -> bool:
         """Delete a user account. Returns True if deleted, False if not found."""
@@ -1092,7 +1123,7 @@ class PlayerDB:
         
         # Finally delete the user
         self._execute(cursor, "DELETE FROM users WHERE id = ?", (user_id,))
-        self.conn.commit()
+        self._commit()
         return True
 
     def update_user_password(self, user_id: int, password_hash: str) -> None:
@@ -1102,7 +1133,7 @@ class PlayerDB:
             "UPDATE users SET password_hash = ?, updated_at = ? WHERE id = ?",
             (password_hash, datetime.now().timestamp(), user_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def create_verification_token(self, user_id: int, token: str, expires_in_hours: int = 24) -> int:
         """Create an email verification token"""
@@ -1124,7 +1155,7 @@ class PlayerDB:
             """, params)
             token_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return token_id
 
     def get_verification_token(self, token: str) -> Optional[Dict[str, Any]]:
@@ -1145,7 +1176,7 @@ class PlayerDB:
             SET used_at = ? 
             WHERE id = ?
         """, (datetime.now().timestamp(), token_id))
-        self.conn.commit()
+        self._commit()
 
     def mark_email_verified(self, user_id: int) -> None:
         """Mark user's email as verified"""
@@ -1155,7 +1186,7 @@ class PlayerDB:
             SET email_verified = 1, updated_at = ? 
             WHERE id = ?
         """, (datetime.now().timestamp(), user_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_expired_tokens(self) -> None:
         """Clean up expired verification tokens"""
@@ -1164,7 +1195,7 @@ class PlayerDB:
             DELETE FROM email_verification_tokens 
             WHERE expires_at < ? OR used_at IS NOT NULL
         """, (datetime.now().timestamp(),))
-        self.conn.commit()
+        self._commit()
 
     def create_invite_code(self, code: str, created_by: Optional[int] = None) -> int:
         """Create a new invite code and return its ID."""
@@ -1190,7 +1221,7 @@ class PlayerDB:
             """, params)
             invite_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return invite_id
 
     def get_invite_code(self, code: str) -> Optional[Dict[str, Any]]:
@@ -1207,18 +1238,18 @@ class PlayerDB:
 
     def use_invite_code(self, code: str, used_by: int) -> bool:
         """Mark an invite code as used. Returns True if successful."""
-        cursor = self.conn.cursor()
-        invite = self.get_invite_code(code)
-        if not invite or not invite.get("is_active") or invite.get("used_at"):
+        if not code:
             return False
-        
+        cursor = self.conn.cursor()
+        # The unused/active check is part of the UPDATE, so of two concurrent
+        # redemptions only one matches the row, even at READ COMMITTED
         self._execute(cursor, """
             UPDATE invite_codes 
             SET used_at = ?, used_by = ?, is_active = 0
-            WHERE code = ?
+            WHERE code = ? AND used_at IS NULL AND is_active = 1
         """, (datetime.now().timestamp(), used_by, code.upper().strip()))
-        self.conn.commit()
-        return True
+        self._commit()
+        return cursor.rowcount > 0
 
     def list_invite_codes(self, include_used: bool = False, limit: int = 100) -> List[Dict[str, Any]]:
         """List invite codes, optionally including used ones."""
@@ -1269,7 +1300,7 @@ class PlayerDB:
         """Delete an invite code by ID."""
         cursor = self.conn.cursor()
         self._execute(cursor, "DELETE FROM invite_codes WHERE id = ?", (code_id,))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def update_user_profile(self, user_id: int, **fields) -> bool:
@@ -1303,7 +1334,7 @@ class PlayerDB:
         cursor = self.conn.cursor()
         query = f"UPDATE users SET {', '.join(assignments)} WHERE id = ?"
         self._execute(cursor, query, tuple(params))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     # ---------------------------
@@ -1342,7 +1373,7 @@ class PlayerDB:
             """, params)
             note_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return note_id
 
     def update_staff_note(self, note_id: int, **fields) -> bool:
@@ -1382,14 +1413,14 @@ class PlayerDB:
             WHERE id = ?
         """
         self._execute(cursor, query, tuple(params))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def delete_staff_note(self, note_id: int) -> bool:
         """Remove a staff note."""
         cursor = self.conn.cursor()
         self._execute(cursor, "DELETE FROM staff_notes WHERE id = ?", (note_id,))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def get_staff_note(self, note_id: int) -> Optional[Dict[str, Any]]:
@@ -1466,7 +1497,7 @@ class PlayerDB:
             """, params)
             doc_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return doc_id
 
     def delete_player_document(self, doc_id: int) -> Optional[Dict[str, Any]]:
@@ -1482,7 +1513,7 @@ class PlayerDB:
         if not row:
             return None
         self._execute(cursor, "DELETE FROM player_documents WHERE id = ?", (doc_id,))
-        self.conn.commit()
+        self._commit()
         return dict(row)
 
     def list_player_documents(self, player_id: int,
@@ -1594,7 +1625,7 @@ class PlayerDB:
             """, params)
             log_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return log_id
 
     def list_player_document_events(self, player_id: Optional[int] = None, limit: int = 200) -> List[Dict[str, Any]]:
@@ -1614,6 +1645,13 @@ class PlayerDB:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
+    def get_user_doc_bundle(self, player_id: int,
+                            event_limit: int = 20) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (documents, recent document events) for a player on this connection."""
+        documents = self.list_player_documents(player_id)
+        events = self.list_player_document_events(player_id=player_id, limit=event_limit)
+        return documents, events
+
     # ---------------------------
     # Journal entry helpers
     # ---------------------------
@@ -1666,7 +1704,7 @@ class PlayerDB:
             """, params)
             entry_id = cursor.lastrowid
         
-        self.conn.commit()
+        self._commit()
         return entry_id
 
     def get_journal_entry(self, user_id: int, entry_date: str,
@@ -1724,5 +1762,5 @@ class PlayerDB:
             DELETE FROM journal_entries
             WHERE id = ? AND user_id = ?
         """, (int(entry_id), int(user_id)))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
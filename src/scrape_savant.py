@@ -1,17 +1,82 @@
 from __future__ import annotations
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import hashlib
+import threading
+import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pybaseball import statcast_pitcher, statcast_batter, playerid_lookup
 import statsapi
 
 CACHE_DIR = Path("build/cache/savant")
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Recently fetched batter tables, shared by the visual routes so opening
+# several views of the same batter back to back skips the parquet decode.
+RECENT_TTL_SECONDS = 120
+RECENT_MAX_ENTRIES = 32
+_RECENT: OrderedDict = OrderedDict()
+_RECENT_LOCK = threading.Lock()
+
+# Names lookup_batter_id could not resolve, name -> (monotonic time, message).
+# Kept short so an API outage does not hide real players for long.
+FAILED_LOOKUP_TTL_SECONDS = 60
+FAILED_LOOKUP_MAX_ENTRIES = 1024
+_FAILED_LOOKUPS: dict[str, tuple[float, str]] = {}
+_FAILED_LOOKUPS_LOCK = threading.Lock()
+
+# Multi-season batter ranges are downloaded one calendar year per request,
+# several at a time, instead of as one long Savant query.
+SHARD_FETCH_WORKERS = 4
+_SHARD_POOL = ThreadPoolExecutor(max_workers=SHARD_FETCH_WORKERS, thread_name_prefix="savant-shard")
+
 def _hash_key(*parts) -> Path:
     h = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
     return CACHE_DIR / f"{h}.parquet"
 
+def _parse_game_dates(df: pd.DataFrame) -> pd.DataFrame:
+    if "game_date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["game_date"]):
+        df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
+    return df
+
+def _recent_get(key: tuple) -> pa.Table | None:
+    now = time.monotonic()
+    with _RECENT_LOCK:
+        entry = _RECENT.get(key)
+        if entry is None:
+            return None
+        stored_at, table = entry
+        if now - stored_at > RECENT_TTL_SECONDS:
+            del _RECENT[key]
+            return None
+        _RECENT.move_to_end(key)
+        return table
+
+def _recent_put(key: tuple, table: pa.Table) -> None:
+    now = time.monotonic()
+    with _RECENT_LOCK:
+        _RECENT[key] = (now, table)
+        _RECENT.move_to_end(key)
+        while _RECENT:
+            oldest_key, (stored_at, _) = next(iter(_RECENT.items()))
+            if len(_RECENT) <= RECENT_MAX_ENTRIES and now - stored_at <= RECENT_TTL_SECONDS:
+                break
+            del _RECENT[oldest_key]
+
+def _table_to_frame(table: pa.Table, columns: list[str] | None) -> pd.DataFrame:
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table.to_pandas()
+
+def _project(df: pd.DataFrame, columns: list[str] | None) -> pd.DataFrame:
+    if columns is None:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
 def fetch_pitcher_statcast(pitcher_id: int, start: str, end: str) -> pd.DataFrame:
     key = _hash_key("pitcher", pitcher_id, start, end)
     if key.exists():
@@ -22,11 +87,30 @@ def fetch_pitcher_statcast(pitcher_id: int, start: str, end: str) -> pd.DataFram
     df.to_parquet(key, index=False)
     return df
 
+@lru_cache(maxsize=4096)
 def lookup_batter_id(name: str) -> int:
     """
     Look up MLBAM ID for a batter by name.
     Tries multiple strategies to find the player.
+    Results are memoized per process. Failed lookups are remembered for
+    FAILED_LOOKUP_TTL_SECONDS so a bad name does not re-run every API
+    fallback on each request.
     """
+    now = time.monotonic()
+    with _FAILED_LOOKUPS_LOCK:
+        failed = _FAILED_LOOKUPS.get(name)
+    if failed is not None and now - failed[0] <= FAILED_LOOKUP_TTL_SECONDS:
+        raise ValueError(failed[1])
+    try:
+        return _lookup_batter_id(name)
+    except ValueError as e:
+        with _FAILED_LOOKUPS_LOCK:
+            if len(_FAILED_LOOKUPS) >= FAILED_LOOKUP_MAX_ENTRIES:
+                _FAILED_LOOKUPS.clear()
+            _FAILED_LOOKUPS[name] = (now, str(e))
+        raise
+
+def _lookup_batter_id(name: str) -> int:
     # Clean the name
     name = name.strip()
     
@@ -177,12 +261,116 @@ def lookup_batter_id(name: str) -> int:
     # Return the first result
     return int(people[0]["id"])
 
-def fetch_batter_statcast(batter_id: int, start: str, end: str) -> pd.DataFrame:
-    key = _hash_key("batter", batter_id, start, end)
-    if key.exists():
-        return pd.read_parquet(key)
+def fetch_batter_statcast(batter_id: int, start: str, end: str,
+                          columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Fetch Statcast pitches for a batter.
+
+    If ``columns`` is given only those columns are read back. The cache always
+    holds the full Savant schema so callers needing other columns still hit it.
+    ``game_date`` is parsed once before caching and comes back as datetime64.
+    The decoded Arrow table is also kept in memory for RECENT_TTL_SECONDS so
+    the other visual routes for the same batter reuse it. Ranges spanning
+    several years are downloaded per year in parallel on _SHARD_POOL; only
+    the yearly files are cached on disk and the range is rebuilt from them.
+    """
+    recent_key = (batter_id, start, end)
+    table = _recent_get(recent_key)
+    if table is not None:
+        return _parse_game_dates(_table_to_frame(table, columns))
+    shards = _year_shards(start, end)
+    if len(shards) == 1:
+        key = _hash_key("batter", batter_id, start, end)
+        if key.exists():
+            table = pq.read_table(key)
+            _recent_put(recent_key, table)
+            # Files cached before dates were parsed at write time still hold strings
+            return _parse_game_dates(_table_to_frame(table, columns))
+        df = _download_batter(batter_id, start, end)
+        df.to_parquet(key, index=False)
+    else:
+        # Savant returns each year newest-first, so joining the years newest
+        # first keeps the row order of a single full-range query
+        shards.reverse()
+        frames = list(_SHARD_POOL.map(lambda shard: _fetch_batter_shard(batter_id, *shard), shards))
+        frames = [f for f in frames if not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    _recent_put(recent_key, pa.Table.from_pandas(df, preserve_index=False))
+    return _project(df, columns)
+
+def batter_statcast_cached(batter_id: int, start: str, end: str) -> bool:
+    """True if fetch_batter_statcast can answer for this range without downloading."""
+    if _recent_get((batter_id, start, end)) is not None:
+        return True
+    return all(_hash_key("batter", batter_id, *shard).exists() for shard in _year_shards(start, end))
+
+def _year_shards(start: str, end: str) -> list[tuple[str, str]]:
+    """Split an inclusive YYYY-MM-DD range at calendar-year boundaries."""
+    first, last = int(start[:4]), int(end[:4])
+    return [
+        (start if year == first else f"{year}-01-01", end if year == last else f"{year}-12-31")
+        for year in range(first, last + 1)
+    ]
+
+def _download_batter(batter_id: int, start: str, end: str) -> pd.DataFrame:
     df = statcast_batter(start, end, batter_id)
     if df is None:
         df = pd.DataFrame()
+    return _parse_game_dates(df)
+
+def _fetch_batter_shard(batter_id: int, start: str, end: str) -> pd.DataFrame:
+    """
+    One year of a multi-season fetch, cached under that year's dates.
+
+    Interior years span Jan 1 - Dec 31, so another multi-season range covering
+    the same year reuses the file; single-season requests key on their own
+    dates and do not.
+    """
+    key = _hash_key("batter", batter_id, start, end)
+    if key.exists():
+        return _parse_game_dates(pd.read_parquet(key))
+    df = _download_batter(batter_id, start, end)
     df.to_parquet(key, index=False)
     return df
+
+def _batter_shard_path(batter_id: int, start: str, end: str) -> Path:
+    """Parquet cache path for one year of a batter range, downloading it if missing."""
+    key = _hash_key("batter", batter_id, start, end)
+    if not key.exists():
+        _download_batter(batter_id, start, end).to_parquet(key, index=False)
+    return key
+
+def fetch_batter_statcast_iter(batter_id: int, start: str, end: str,
+                               columns: list[str] | None = None,
+                               chunksize: int = 500_000):
+    """
+    Iterate a batter's Statcast pitches as DataFrames of at most ``chunksize`` rows.
+
+    Record batches come straight from the in-memory table or the parquet
+    cache. Each calendar year is cached as its own parquet file and read back
+    one file at a time, newest season first, so on a miss the full range is
+    never built as one frame or kept in the in-memory cache. The fetch (if
+    any) happens before this returns.
+    """
+    table = _recent_get((batter_id, start, end))
+    if table is not None:
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return _batches_to_frames(table.to_batches(max_chunksize=chunksize))
+    # A single-year range shards to itself, so its file is the range key
+    shards = _year_shards(start, end)[::-1]
+    paths = list(_SHARD_POOL.map(lambda shard: _batter_shard_path(batter_id, *shard), shards))
+    return _parquet_frames(paths, columns, chunksize)
+
+def _parquet_frames(paths: list[Path], columns: list[str] | None, chunksize: int):
+    for path in paths:
+        parquet = pq.ParquetFile(path)
+        if parquet.metadata.num_rows == 0:
+            continue
+        names = parquet.schema_arrow.names
+        selected = None if columns is None else [c for c in columns if c in names]
+        yield from _batches_to_frames(parquet.iter_batches(batch_size=chunksize, columns=selected))
+
+def _batches_to_frames(batches):
+    for batch in batches:
+        yield _parse_game_dates(batch.to_pandas())
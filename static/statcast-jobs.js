@@ -0,0 +1,51 @@
+/**
+ * Statcast download jobs
+ * Visual endpoints answer 202 with a job while a batter's Statcast range is
+ * downloaded in the background; fetchStatcast polls the job and repeats the
+ * request once the data is cached.
+ */
+(function() {
+    'use strict';
+
+    const POLL_INTERVAL_MS = 1500;
+    const MAX_POLL_MS = 10 * 60 * 1000;
+    const MAX_ATTEMPTS = 3;
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function waitForJob(statusUrl) {
+        const deadline = Date.now() + MAX_POLL_MS;
+        while (Date.now() < deadline) {
+            await sleep(POLL_INTERVAL_MS);
+            const response = await fetch(statusUrl);
+            if (response.status === 404) {
+                // Finished and evicted from the job table; the retry will tell
+                return;
+            }
+            const job = await response.json();
+            if (job.status === 'completed') {
+                return;
+            }
+            if (job.status === 'error') {
+                throw new Error(job.error || job.message || 'Statcast download failed');
+            }
+        }
+        throw new Error('Timed out waiting for Statcast data');
+    }
+
+    /**
+     * fetch() for visual endpoints that may start a Statcast download job.
+     * Resolves with the final (non-202) response.
+     */
+    window.fetchStatcast = async function(url, options) {
+        let response = await fetch(url, options);
+        for (let attempt = 1; response.status === 202 && attempt <= MAX_ATTEMPTS; attempt++) {
+            const job = await response.json();
+            await waitForJob(job.status_url);
+            response = await fetch(url, options);
+        }
+        return response;
+    };
+})();
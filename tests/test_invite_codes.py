@@ -0,0 +1,63 @@
+import pytest
+
+import src.database
+from src.database import PlayerDB
+
+
+@pytest.fixture()
+def temp_player_db(tmp_path, monkeypatch):
+    # Schema setup runs once per process; each temp file needs its own
+    monkeypatch.setattr(src.database, "_schema_initialized", False)
+    db_path = tmp_path / "players.db"
+    db = PlayerDB(db_path=str(db_path))
+    try:
+        yield db
+    finally:
+        db.close()
+        if db_path.exists():
+            db_path.unlink()
+
+
+def _create_user(db: PlayerDB, email: str) -> int:
+    return db.create_user(
+        email=email,
+        password_hash="hash",
+        first_name="Test",
+        last_name="User",
+        is_admin=False,
+    )
+
+
+def test_invite_code_cannot_be_redeemed_twice(temp_player_db: PlayerDB):
+    temp_player_db.create_invite_code("abc123")
+    first_user = _create_user(temp_player_db, "first@example.com")
+    second_user = _create_user(temp_player_db, "second@example.com")
+
+    with temp_player_db.transaction():
+        assert temp_player_db.use_invite_code("ABC123", first_user) is True
+        assert temp_player_db.use_invite_code("ABC123", second_user) is False
+
+    invite = temp_player_db.get_invite_code("ABC123")
+    assert invite["used_by"] == first_user
+    assert not invite["is_active"]
+
+
+def test_failed_redemption_rolls_back_transaction(temp_player_db: PlayerDB):
+    temp_player_db.create_invite_code("XYZ789")
+    first_user = _create_user(temp_player_db, "first@example.com")
+    temp_player_db.use_invite_code("XYZ789", first_user)
+
+    with pytest.raises(RuntimeError):
+        with temp_player_db.transaction():
+            user_id = _create_user(temp_player_db, "late@example.com")
+            if not temp_player_db.use_invite_code("XYZ789", user_id):
+                raise RuntimeError("invite already used")
+
+    assert temp_player_db.get_user_by_email("late@example.com") is None
+    assert temp_player_db.get_invite_code("XYZ789")["used_by"] == first_user
+
+
+def test_unknown_invite_code_is_not_redeemed(temp_player_db: PlayerDB):
+    user_id = _create_user(temp_player_db, "first@example.com")
+    assert temp_player_db.use_invite_code("MISSING", user_id) is False
+    assert temp_player_db.use_invite_code("", user_id) is False
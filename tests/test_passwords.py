@@ -0,0 +1,55 @@
+import importlib
+import sys
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.utils import passwords
+
+
+@pytest.fixture()
+def passwords_without_argon2(monkeypatch):
+    # A None entry in sys.modules makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "argon2", None)
+    monkeypatch.setitem(sys.modules, "argon2.exceptions", None)
+    try:
+        yield importlib.reload(passwords)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(passwords)
+
+
+def test_hash_and_verify_round_trip():
+    pytest.importorskip("argon2")
+    stored = passwords.hash_password("correct horse")
+
+    assert stored.startswith("$argon2id")
+    assert passwords.verify_password(stored, "correct horse")
+    assert not passwords.verify_password(stored, "wrong horse")
+    assert not passwords.needs_rehash(stored)
+
+
+def test_legacy_werkzeug_hash_verifies_and_needs_rehash():
+    pytest.importorskip("argon2")
+    stored = generate_password_hash("correct horse")
+
+    assert passwords.verify_password(stored, "correct horse")
+    assert not passwords.verify_password(stored, "wrong horse")
+    assert passwords.needs_rehash(stored)
+
+
+def test_empty_hash_never_verifies():
+    assert not passwords.verify_password("", "anything")
+    assert not passwords.needs_rehash("")
+
+
+def test_falls_back_to_werkzeug_without_argon2(passwords_without_argon2):
+    fallback = passwords_without_argon2
+    stored = fallback.hash_password("correct horse")
+
+    assert not stored.startswith("$argon2")
+    assert fallback.verify_password(stored, "correct horse")
+    assert not fallback.verify_password(stored, "wrong horse")
+    assert not fallback.needs_rehash(stored)
+    # argon2 hashes can't be checked without the library, so they fail closed
+    assert not fallback.verify_password("$argon2id$v=19$m=19456,t=2,p=1$abc$def", "correct horse")
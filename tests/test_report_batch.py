@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import report_service
+
+
+@pytest.fixture()
+def batch_executor(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(report_service, "REPORT_EXECUTOR", executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _run(entries, generate_one, executor, job_id):
+    report_service._run_batch(
+        entries, report_service.parse_player_entry, generate_one, "player", "player",
+        "NYY", "2025-03-20", False, None, job_id
+    )
+    # Done callbacks run on the worker threads, so shutting down waits for them too
+    executor.shutdown(wait=True)
+    return report_service.get_job_status(job_id)
+
+
+def test_batch_reports_outcomes_in_entry_order(batch_executor):
+    first_may_finish = threading.Event()
+    calls = []
+
+    def generate_one(name, team, season_start, use_next_series, opponent):
+        calls.append((name, team, opponent))
+        if name == "Slow Success":
+            # Finish after every other entry so completion order differs from entry order
+            first_may_finish.wait(timeout=5)
+            return {"success": True, "pdf_path": "/tmp/slow.pdf", "pdf_filename": "slow.pdf"}
+        try:
+            if name == "Returned Failure":
+                return {"success": False, "error": "no data"}
+            if name == "Raises":
+                raise RuntimeError("boom")
+            return {"success": True, "pdf_path": f"/tmp/{name}.pdf", "pdf_filename": f"{name}.pdf"}
+        finally:
+            if len(calls) == 4:
+                first_may_finish.set()
+
+    entries = ["Slow Success", "Returned Failure | BOS | TOR", " | LAD", "Raises", "Fast Success"]
+    status = _run(entries, generate_one, batch_executor, "batch-mixed")
+
+    assert status["status"] == "partial"
+    assert status["total"] == 5
+    assert status["completed"] == 2
+    assert status["failed"] == 3
+    assert status["pdfs"] == [
+        {"player": "Slow Success", "pdf_path": "/tmp/slow.pdf", "pdf_filename": "slow.pdf"},
+        {"player": "Fast Success", "pdf_path": "/tmp/Fast Success.pdf", "pdf_filename": "Fast Success.pdf"},
+    ]
+    assert status["errors"] == [
+        "Returned Failure: no data",
+        "Entry 3: Invalid player name",
+        "Raises: Error: boom",
+    ]
+    assert ("Returned Failure", "BOS", "TOR") in calls
+    assert ("Fast Success", "NYY", None) in calls
+
+
+def test_batch_of_only_invalid_entries_completes_without_queueing(batch_executor):
+    def generate_one(*args):
+        raise AssertionError("invalid entries must not be queued")
+
+    status = _run(["", " | BOS"], generate_one, batch_executor, "batch-invalid")
+
+    assert status["status"] == "partial"
+    assert status["completed"] == 0
+    assert status["failed"] == 2
+    assert status["pdfs"] == []
+    assert status["errors"] == ["Entry 1: Invalid player name", "Entry 2: Invalid player name"]
+
+
+def test_batch_all_successful_is_completed(batch_executor):
+    def generate_one(name, *args):
+        return {"success": True, "pdf_path": f"/tmp/{name}.pdf", "pdf_filename": f"{name}.pdf"}
+
+    status = _run(["A", "B"], generate_one, batch_executor, "batch-ok")
+
+    assert status["status"] == "completed"
+    assert status["message"] == "Completed 2 of 2 reports"
+    assert [pdf["player"] for pdf in status["pdfs"]] == ["A", "B"]
+    assert status["errors"] == []
+
+
+def test_job_status_eviction_keeps_unfinished_jobs(monkeypatch):
+    monkeypatch.setattr(report_service, "job_status", report_service.OrderedDict())
+    monkeypatch.setattr(report_service, "MAX_TRACKED_JOBS", 3)
+
+    report_service.set_job_status("queued", {"status": "queued"})
+    report_service.set_job_status("done-1", {"status": "completed"})
+    report_service.set_job_status("running", {"status": "running"})
+    report_service.set_job_status("done-2", {"status": "error"})
+    report_service.set_job_status("done-3", {"status": "partial"})
+
+    assert list(report_service.job_status) == ["queued", "running", "done-3"]
+    assert report_service.get_job_status("done-1") == {"status": "not_found"}
+    assert report_service.get_job_status("queued") == {"status": "queued"}
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from app.routes.api.visuals import _filter_to_season
+
+
+DATES = ["2025-04-02", "2024-09-30", "2024-06-15", "2024-03-28", "2023-10-01", "2023-04-01"]
+
+
+def _mask_filter(df, season):
+    dates = df["game_date"]
+    return df[(dates >= pd.Timestamp(f"{season}-03-01")) & (dates <= pd.Timestamp(f"{season}-11-30"))]
+
+
+@pytest.mark.parametrize("order", ["descending", "ascending", "unsorted"])
+@pytest.mark.parametrize("season", [2023, 2024, 2025, 2022])
+def test_filter_by_game_date(order, season):
+    dates = pd.to_datetime(DATES)
+    if order == "ascending":
+        dates = dates[::-1]
+    elif order == "unsorted":
+        dates = dates[[2, 0, 5, 1, 4, 3]]
+    df = pd.DataFrame({"game_date": dates, "pitch": range(len(dates))})
+
+    result = _filter_to_season(df, season)
+
+    pd.testing.assert_frame_equal(result, _mask_filter(df, season))
+
+
+def test_filter_by_game_year_descending():
+    df = pd.DataFrame({"game_year": [2025, 2024, 2024, 2023], "pitch": [0, 1, 2, 3]})
+
+    result = _filter_to_season(df, "2024")
+
+    assert result["pitch"].tolist() == [1, 2]
+
+
+def test_filter_keeps_frame_without_season_columns():
+    df = pd.DataFrame({"pitch": [1, 2]})
+
+    assert _filter_to_season(df, 2024) is df